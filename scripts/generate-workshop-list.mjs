@@ -32,7 +32,8 @@ async function generateWorkshopData() {
     const workshopDirs = await fs.readdir(workshopsBaseDir, { withFileTypes: true });
 
     for (const dirEntry of workshopDirs) {
-      if (dirEntry.isDirectory()) {
+      // Hidden directories hold workshop-builder bookkeeping (allocation ledger, staging), not workshops
+      if (dirEntry.isDirectory() && !dirEntry.name.startsWith('.')) {
         const workshopId = dirEntry.name;
         const workshopDirPath = path.join(workshopsBaseDir, workshopId);
         
@@ -4,9 +4,15 @@
 from .research_agent import ResearchAgent, ResearchAgentError
 from .compiler_agent import CompilerAgent, CompilerAgentError
 from .git_agent import GitAgent, GitAgentError
+from .llm_backends import LLMBackend, LLMBackendError, OpenAIBackend, GeminiBackend, StubBackend, create_backend
+from .retry_policy import RetryPolicy
+from .git_backends import GitBackendError, GitPythonBackend, SubprocessGitBackend, create_git_backend
 
 __all__ = [
     "ResearchAgent", "ResearchAgentError",
     "CompilerAgent", "CompilerAgentError",
-    "GitAgent", "GitAgentError"
+    "GitAgent", "GitAgentError",
+    "LLMBackend", "LLMBackendError", "OpenAIBackend", "GeminiBackend", "StubBackend", "create_backend",
+    "RetryPolicy",
+    "GitBackendError", "GitPythonBackend", "SubprocessGitBackend", "create_git_backend"
 ]
\ No newline at end of file
@@ -1,39 +1,82 @@
 import logging
 import os
+import itertools
 import json
+import re
 import shutil
 import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
 from pathlib import Path
-from typing import List, Dict, Any
-
-import openai
+from typing import List, Dict, Any, Optional
 
 # Handle both relative and absolute imports for flexibility
 try:
     from ..orchestrator.config import AppConfig
+    from .workshop_allocator import WorkshopNumberAllocator, WorkshopAllocatorError
+    from .workshop_index import WorkshopIndex, WorkshopIndexError, MODULE_NAME_PATTERN, TITLE_PREFIX_PATTERN
+    from .topic_similarity import TopicSimilarityIndex, TopicSimilarityError
+    from .module_writer import StagedModule, ModuleWriterError, remove_stale_staging
+    from .template_renderer import (get_template_renderer, TemplateRendererError, module_sections,
+                                    markdown_title, first_paragraph, list_under_heading)
+    from .streaming_json import StreamingFilesParser
+    from .context_packer import ResearchContextPacker
+    from .completion_cache import CompletionCache
+    from .llm_backends import create_backend, LLMBackendError
+    from .retry_policy import RetryPolicy
+    from ..orchestrator.rate_limiter import get_rate_limiter
+    from ..orchestrator.tracing import get_tracer, text_bytes
 except ImportError:
     import sys
     import os
     sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
     from orchestrator.config import AppConfig
+    from agents.workshop_allocator import WorkshopNumberAllocator, WorkshopAllocatorError
+    from agents.workshop_index import WorkshopIndex, WorkshopIndexError, MODULE_NAME_PATTERN, TITLE_PREFIX_PATTERN
+    from agents.topic_similarity import TopicSimilarityIndex, TopicSimilarityError
+    from agents.module_writer import StagedModule, ModuleWriterError, remove_stale_staging
+    from agents.template_renderer import (get_template_renderer, TemplateRendererError, module_sections,
+                                          markdown_title, first_paragraph, list_under_heading)
+    from agents.streaming_json import StreamingFilesParser
+    from agents.context_packer import ResearchContextPacker
+    from agents.completion_cache import CompletionCache
+    from agents.llm_backends import create_backend, LLMBackendError
+    from agents.retry_policy import RetryPolicy
+    from orchestrator.rate_limiter import get_rate_limiter
+    from orchestrator.tracing import get_tracer, text_bytes
 
 class CompilerAgentError(Exception):
     """Custom exception for CompilerAgent errors."""
     pass
 
+# Markdown files of a module that are not sections
+NON_SECTION_FILES = ("README.md", "AGENTS.MD")
+# Module files rendered from templates/ rather than generated by the model
+RENDERED_FILES = ("manifest.json", "README.md")
+SECTION_FILENAME_PATTERN = re.compile(r"^[\w-]+\.md$")
+MARKDOWN_HEADING_PATTERN = re.compile(r"^(#{1,3})\s+(.+?)\s*#*$", re.MULTILINE)
+CODE_FENCE_PATTERN = re.compile(r"^```.*?^```", re.MULTILINE | re.DOTALL)
+# Headings listed per section when other sections are given as context for an update
+UPDATE_CONTEXT_HEADINGS = 12
+
 class CompilerAgent:
     def __init__(self, config: AppConfig):
         self.config = config
         self.logger = config.get_logger(__name__)
         self.logger.info("CompilerAgent initialized.")
 
-        if not self.config.openai_api_key:
-            self.logger.error("OpenAI API key is not configured.")
-            raise CompilerAgentError("OpenAI API key missing.")
-        
-        # Initialize OpenAI client
-        self.openai_client = openai.OpenAI(api_key=self.config.openai_api_key)
-        
+        # Model backend (OpenAI by default); API clients are created on first use
+        try:
+            self.backend = create_backend(self.config.compiler_backend, self.config, logger=self.logger)
+        except LLMBackendError as e:
+            self.logger.error(f"Compiler backend could not be configured: {e}")
+            raise CompilerAgentError(str(e))
+        self.logger.info(f"Compiler backend: {self.backend.name} ({self.backend.model_name})")
+        self.retry_policy = RetryPolicy.from_config(self.config, logger=self.logger)
+        self.rate_limiter = get_rate_limiter(self.backend.name, self.config, logger=self.logger)
+
         # Resolve compiler_agent_prompt_path to be absolute
         if not os.path.isabs(self.config.compiler_agent_prompt_path):
             script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -45,19 +88,43 @@ class CompilerAgent:
             raise CompilerAgentError(f"Compiler agent prompt file not found: {self.config.compiler_agent_prompt_path}")
         
         self.logger.debug(f"Compiler agent prompt path: {self.config.compiler_agent_prompt_path}")
-        
-        # Verify OpenAI API connectivity
-        self._verify_openai_api()
 
-    def _verify_openai_api(self):
-        """Verify that the OpenAI API is accessible."""
-        try:
-            # Test API connectivity with a simple models list call
-            models = self.openai_client.models.list()
-            self.logger.info("OpenAI API connectivity verified successfully")
-        except Exception as e:
-            self.logger.warning(f"OpenAI API verification failed: {e}")
-            # Don't raise error here - we'll handle this gracefully in compile_workshop
+        # Templates for manifest.json and README.md, relative to the workshop-builder directory
+        if not os.path.isabs(self.config.module_templates_dir):
+            self.config.module_templates_dir = os.path.normpath(
+                os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', self.config.module_templates_dir)
+            )
+
+        # Local cache of completion responses, keyed by messages and model parameters
+        self.completion_cache = None
+        if self.config.completion_cache_enabled:
+            cache_config = self.config.get_completion_cache_config()
+            self.completion_cache = CompletionCache(cache_config["path"], cache_config["max_bytes"], logger=self.logger)
+            self.logger.debug(f"Completion cache enabled at {cache_config['path']} (refresh={cache_config['refresh']})")
+        # Completion cache hit/miss counts by topic, so a run can report its own share
+        self._topic_cache_stats: Dict[str, Dict[str, int]] = {}
+        self._cache_stats_lock = threading.Lock()
+
+        # Persistent index of the workshops directory, opened on first use
+        self._index = None
+        self._index_lock = threading.Lock()
+        # Workshop number allocator for the workshops directory, created on first use
+        self._allocator = None
+        # Vector index of module descriptions for duplicate-topic checks, built on first use
+        self._similarity_index = None
+        # Staged modules being written, by staging path (see _staged_module)
+        self._staged_modules: Dict[str, StagedModule] = {}
+        self._staged_lock = threading.Lock()
+        self._stale_staging_removed = False
+
+    @property
+    def openai_client(self):
+        """The OpenAI client of the OpenAI backend (None for other backends)."""
+        return getattr(self.backend, "client", None)
+
+    @openai_client.setter
+    def openai_client(self, client):
+        self.backend.client = client
 
     def _create_agents_md(self, module_path: str, topic: str) -> str:
         """Create an AGENTS.MD file for the workshop module following Codex best practices."""
@@ -99,20 +166,32 @@ This is a workshop module for: **{topic}**
 - Review content for accuracy and completeness before finalizing
 """
         
-        with open(agents_md_path, 'w', encoding='utf-8') as f:
-            f.write(agents_md_content)
+        self._write_module_file(module_path, "AGENTS.MD", agents_md_content)
         
         self.logger.info(f"Created AGENTS.MD file: {agents_md_path}")
         return agents_md_path
 
-    def _prepare_workshop_messages(self, topic: str, research_data_paths: List[str], module_path: str) -> List[Dict[str, str]]:
-        """Prepare messages for OpenAI Chat Completions API."""
-        
-        # Read the base prompt template
+    def _read_base_prompt(self) -> str:
+        """Read the base compiler prompt template."""
         with open(self.config.compiler_agent_prompt_path, 'r', encoding='utf-8') as f:
-            base_prompt = f.read()
-        
-        # Read research data content
+            return f.read()
+
+    def _read_research_content(self, research_data_paths: List[str]) -> str:
+        """Build the research context block, packed to the input token budget unless packing is disabled."""
+        if self.config.research_context_packing:
+            packer = ResearchContextPacker(
+                self.config.research_context_token_budget,
+                self.config.openai_model,
+                logger=self.logger
+            )
+            packed = packer.pack(research_data_paths)
+            self.logger.info(
+                f"Research context: {packed['tokens']} tokens sent "
+                f"(from {packed['source_tokens']} tokens in {len(packed['files_used'])} files; "
+                f"{packed['duplicate_paragraphs']} duplicate and {packed['trimmed_paragraphs']} over-budget paragraphs dropped)"
+            )
+            return packed['text']
+
         research_content = ""
         for data_path in research_data_paths:
             try:
@@ -122,6 +201,16 @@ This is a workshop module for: **{topic}**
                     research_content += "\n--- End of file ---\n"
             except Exception as e:
                 self.logger.warning(f"Could not read research file {data_path}: {e}")
+        return research_content
+
+    def _prepare_workshop_messages(self, topic: str, research_data_paths: List[str], module_path: str) -> List[Dict[str, str]]:
+        """Prepare messages for OpenAI Chat Completions API."""
+        
+        # Read the base prompt template
+        base_prompt = self._read_base_prompt()
+        
+        # Read research data content
+        research_content = self._read_research_content(research_data_paths)
         
         # Create structured messages for chat completions
         system_message = f"""You are an expert educational content creator specializing in technical workshops. Your task is to create comprehensive, well-structured workshop modules based on research data.
@@ -131,8 +220,6 @@ This is a workshop module for: **{topic}**
 You must respond with a JSON object containing the workshop files. The JSON structure should be:
 {{
     "files": {{
-        "manifest.json": "content of manifest.json",
-        "README.md": "content of README.md",
         "00_introduction.md": "content of introduction",
         "01_core_concepts.md": "content of core concepts",
         "02_practical_examples.md": "content of practical examples",
@@ -141,6 +228,7 @@ You must respond with a JSON object containing the workshop files. The JSON stru
     }}
 }}
 
+Do not include manifest.json or README.md: they are generated from the section files.
 Ensure all content is educational, accurate, and follows markdown best practices."""
 
         user_message = f"""Create a comprehensive workshop module for: "{topic}"
@@ -151,8 +239,8 @@ RESEARCH DATA:
 Requirements:
 1. Analyze the research data thoroughly
 2. Create a logical sequence of markdown files (00_introduction.md, 01_core_concepts.md, etc.)
-3. Generate manifest.json with the correct file listing and metadata
-4. Create a comprehensive README.md with navigation
+3. Start every file with a single H1 title followed by a short paragraph summarizing it
+4. In 00_introduction.md, follow the summary with "## Learning Objectives" and "## Prerequisites" bullet lists
 5. Ensure all content is educational, accurate, and well-structured
 6. Include practical examples and exercises where applicable
 7. Use proper markdown formatting throughout
@@ -164,22 +252,100 @@ The workshop should be suitable for learners wanting to understand {topic} and f
             {"role": "user", "content": user_message}
         ]
 
-    def _execute_openai_api(self, messages: List[Dict[str, str]], module_path: str) -> bool:
+    def _write_module_file(self, module_path: str, filename: str, file_content: str) -> str:
+        """Write one generated file into the module directory, through its StagedModule when it is being staged."""
+        staged = self._staged_modules.get(module_path)
+        if staged is not None:
+            return staged.write(filename, file_content)
+        # Generated names are used as plain file names; never let them escape the module directory
+        file_path = os.path.join(module_path, os.path.basename(filename))
+        with open(file_path, 'w', encoding='utf-8') as f:
+            f.write(file_content)
+        return file_path
+
+    def cache_stats(self, topic: Optional[str] = None) -> dict:
+        """
+        Completion cache hit/miss counts for this agent, or only for requests made for
+        `topic` (zeros when the cache is disabled). Counts accumulate over the agent's
+        lifetime; a run reports the difference between two snapshots.
+        """
+        if not self.completion_cache:
+            return {"hits": 0, "misses": 0}
+        if topic is None:
+            return self.completion_cache.stats()
+        with self._cache_stats_lock:
+            return dict(self._topic_cache_stats.get(topic, {"hits": 0, "misses": 0}))
+
+    def _completion_cache_key(self, messages: List[Dict[str, str]], max_tokens: int, json_mode: bool) -> Optional[str]:
+        if not self.completion_cache:
+            return None
+        return CompletionCache.make_key(messages, self.backend.model_name, max_tokens, self.config.openai_temperature, json_mode)
+
+    def _cached_completion(self, cache_key: Optional[str], topic: Optional[str] = None) -> Optional[str]:
+        """Look up a cached completion unless the cache is disabled or being refreshed."""
+        if not cache_key or self.config.completion_cache_refresh:
+            return None
+        content = self.completion_cache.get(cache_key)
+        if content is not None:
+            self.logger.info(f"Completion cache hit ({len(content)} characters)")
+        if topic is not None:
+            with self._cache_stats_lock:
+                counts = self._topic_cache_stats.setdefault(topic, {"hits": 0, "misses": 0})
+                counts["hits" if content is not None else "misses"] += 1
+        return content
+
+    def _span_attributes(self, messages: List[Dict[str, str]], max_tokens: int, json_mode: bool) -> dict:
+        """Trace attributes for a completion request."""
+        return {
+            "provider": self.backend.name,
+            "model": self.backend.model_name,
+            "json_mode": json_mode,
+            "max_tokens": max_tokens,
+            "bytes_in": sum(text_bytes(message["content"]) for message in messages),
+            "retries": 0
+        }
+
+    def _acquire_rate_limit(self, span, messages: List[Dict[str, str]], max_tokens: int, topic: Optional[str]):
+        """Wait for rate-limit quota for one request attempt; `topic` keeps ordering fair across concurrent runs."""
+        request_tokens = self.backend.rate_limit_tokens("".join(message["content"] for message in messages), max_tokens)
+        span.add("rate_limit_wait_s", self.rate_limiter.acquire(request_tokens, key=topic))
+
+    def _request_completion(self, messages: List[Dict[str, str]], max_tokens: int, json_mode: bool = False,
+                            topic: Optional[str] = None) -> str:
+        """Make a (non-streaming) chat completion request and return the message content."""
+        cache_key = self._completion_cache_key(messages, max_tokens, json_mode)
+        cached = self._cached_completion(cache_key, topic)
+        if cached is not None:
+            return cached
+
+        with get_tracer().span("llm.chat_completion", **self._span_attributes(messages, max_tokens, json_mode)) as span:
+            def complete():
+                self._acquire_rate_limit(span, messages, max_tokens, topic)
+                return self.backend.chat_completion(messages, max_tokens, self.config.openai_temperature, json_mode=json_mode)
+
+            content = self.retry_policy.call(complete, "Completion request")
+            span.set(bytes_out=text_bytes(content))
+
+        # Only cache usable responses: non-empty and, in JSON mode, parseable
+        if cache_key and content.strip():
+            try:
+                if json_mode:
+                    json.loads(content)
+                self.completion_cache.put(cache_key, content)
+            except json.JSONDecodeError:
+                self.logger.debug("Not caching unparseable JSON completion")
+        return content
+
+    def _execute_openai_api(self, messages: List[Dict[str, str]], module_path: str, topic: Optional[str] = None) -> bool:
         """Execute OpenAI API call to generate workshop content."""
+        if self.config.openai_stream_compilation:
+            return self._execute_openai_api_streaming(messages, module_path, topic)
+
         try:
             self.logger.info("Calling OpenAI API for workshop compilation...")
             
             # Make API call using chat completions
-            response = self.openai_client.chat.completions.create(
-                model=self.config.openai_model,
-                messages=messages,
-                max_tokens=self.config.openai_max_tokens,
-                temperature=self.config.openai_temperature,
-                response_format={"type": "json_object"}  # Ensure JSON response
-            )
-            
-            # Extract the generated content
-            content = response.choices[0].message.content
+            content = self._request_completion(messages, self.config.openai_max_tokens, json_mode=True, topic=topic)
             self.logger.debug(f"OpenAI API response received: {len(content)} characters")
             
             # Parse the JSON response
@@ -191,14 +357,21 @@ The workshop should be suitable for learners wanting to understand {topic} and f
                     self.logger.error("No files data found in OpenAI response")
                     return False
                 
-                # Write all files to the module directory
+                # Write the section files; manifest.json and README.md are rendered afterwards
+                written = 0
                 for filename, file_content in files_data.items():
-                    file_path = os.path.join(module_path, filename)
-                    with open(file_path, 'w', encoding='utf-8') as f:
-                        f.write(file_content)
+                    if filename in RENDERED_FILES:
+                        self.logger.debug(f"Ignoring generated {filename}; it is rendered from the section files")
+                        continue
+                    self._write_module_file(module_path, filename, file_content)
+                    written += 1
                     self.logger.info(f"Created file: {filename}")
+
+                if not written:
+                    self.logger.error("No section files found in OpenAI response")
+                    return False
                 
-                self.logger.info(f"OpenAI API execution completed successfully. Created {len(files_data)} files.")
+                self.logger.info(f"OpenAI API execution completed successfully. Created {written} files.")
                 return True
                 
             except json.JSONDecodeError as e:
@@ -210,6 +383,307 @@ The workshop should be suitable for learners wanting to understand {topic} and f
             self.logger.error(f"Error executing OpenAI API call: {e}", exc_info=True)
             return False
 
+    def _execute_openai_api_streaming(self, messages: List[Dict[str, str]], module_path: str, topic: Optional[str] = None) -> bool:
+        """
+        Execute a streaming OpenAI API call, writing each workshop file as soon as it is complete.
+        If the stream is cut short, the files finished so far are kept on disk.
+        """
+        parser = StreamingFilesParser()
+        written = 0
+        chars_received = 0
+        finish_reason = None
+        cache_key = self._completion_cache_key(messages, self.config.openai_max_tokens, json_mode=True)
+        # The full text is only accumulated when it will be cached
+        received_parts = [] if cache_key else None
+
+        try:
+            cached = self._cached_completion(cache_key, topic)
+            if cached is not None:
+                stream = [cached]
+            else:
+                self.logger.info("Calling OpenAI API for workshop compilation (streaming)...")
+                stream = self._stream_deltas(messages, topic)
+
+            for delta in stream:
+                if delta is None:
+                    continue
+                if isinstance(delta, tuple):
+                    # (None, finish_reason) marker from the live stream
+                    finish_reason = delta[1]
+                    continue
+                chars_received += len(delta)
+                if received_parts is not None and cached is None:
+                    received_parts.append(delta)
+
+                for filename, file_content in parser.feed(delta):
+                    if filename in RENDERED_FILES:
+                        self.logger.debug(f"Ignoring generated {filename}; it is rendered from the section files")
+                        continue
+                    self._write_module_file(module_path, filename, file_content)
+                    written += 1
+                    self.logger.info(
+                        f"Streamed file {written}: {filename} "
+                        f"({len(file_content)} chars, {chars_received} chars received so far)"
+                    )
+
+        except Exception as e:
+            self.logger.error(f"Error during streaming OpenAI API call: {e}", exc_info=True)
+
+        if parser.complete and received_parts:
+            self.completion_cache.put(cache_key, "".join(received_parts))
+
+        if not parser.complete:
+            self.logger.warning(
+                f"Streaming response ended early (finish_reason={finish_reason}) after {chars_received} chars; "
+                f"keeping {written} completed files"
+            )
+
+        if written == 0:
+            self.logger.error("No files were received from the streaming OpenAI response")
+            return False
+
+        self.logger.info(f"Streaming OpenAI API execution completed. Created {written} files.")
+        return True
+
+    def _prepare_outline_messages(self, topic: str, base_prompt: str, research_content: str) -> List[Dict[str, str]]:
+        """Prepare messages for the outline stage of sectioned compilation."""
+        system_message = f"""You are an expert curriculum designer specializing in technical workshops. Your task is to plan the structure of a workshop module based on research data.
+
+{base_prompt}
+
+For this request, do not write the workshop content. Respond only with a JSON object describing the workshop plan:
+{{
+    "title": "workshop title",
+    "description": "one or two sentence description",
+    "difficulty": "beginner|intermediate|advanced",
+    "duration": "estimated completion time",
+    "prerequisites": ["prerequisite"],
+    "learning_objectives": ["objective"],
+    "tags": ["tag"],
+    "sections": [
+        {{
+            "filename": "00_introduction.md",
+            "title": "section title",
+            "summary": "what the section covers",
+            "key_points": ["point to cover"]
+        }}
+    ]
+}}"""
+
+        user_message = f"""Plan a comprehensive workshop module for: "{topic}"
+
+RESEARCH DATA:
+{research_content}
+
+Requirements:
+1. Plan between 4 and 8 sections in a logical sequence from basic to advanced
+2. Name section files with the XX_descriptive_name.md convention, starting at 00_introduction.md
+3. Give each section a clear summary and the key points it must cover, so it can be written independently
+4. Include practical, hands-on sections where applicable"""
+
+        return [
+            {"role": "system", "content": system_message},
+            {"role": "user", "content": user_message}
+        ]
+
+    def _prepare_section_messages(self, topic: str, base_prompt: str, research_content: str,
+                                  outline: Dict[str, Any], section: Dict[str, Any]) -> List[Dict[str, str]]:
+        """Prepare messages for generating a single section of a sectioned compilation."""
+        section_list = "\n".join(
+            f"- {s['filename']}: {s['title']}" + ("  <-- this section" if s['filename'] == section['filename'] else "")
+            for s in outline['sections']
+        )
+        key_points = "\n".join(f"- {point}" for point in section.get('key_points', [])) or "- (use the summary)"
+
+        system_message = f"""You are an expert educational content creator specializing in technical workshops. You are writing one section of a larger workshop module; other sections are written separately.
+
+{base_prompt}
+
+For this request, do not return JSON. Respond only with the complete markdown content of the requested section file, starting with its H1 heading."""
+
+        user_message = f"""Workshop: "{outline.get('title') or topic}"
+
+WORKSHOP SECTIONS:
+{section_list}
+
+Write the section file `{section['filename']}` titled "{section['title']}".
+
+Summary: {section.get('summary', '')}
+
+Key points to cover:
+{key_points}
+
+RESEARCH DATA:
+{research_content}
+
+Requirements:
+1. Cover only this section's scope; refer to other sections by title instead of repeating them
+2. Include practical examples, code blocks with language specifiers and exercises where applicable
+3. Use proper markdown formatting throughout"""
+
+        return [
+            {"role": "system", "content": system_message},
+            {"role": "user", "content": user_message}
+        ]
+
+    def _normalize_outline_sections(self, outline: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Validate the outline's section list and enforce the XX_name.md file naming convention."""
+        sections = []
+        seen = set()
+        for index, section in enumerate(outline.get("sections") or []):
+            if not isinstance(section, dict):
+                continue
+            title = str(section.get("title") or f"Section {index}")
+            filename = os.path.basename(str(section.get("filename") or ""))
+            if not re.fullmatch(r'\d{2}_[\w-]+\.md', filename):
+                filename = f"{index:02d}_{self._slugify_topic(title).replace('-', '_') or 'section'}.md"
+            if filename in seen:
+                continue
+            seen.add(filename)
+            sections.append(dict(section, filename=filename, title=title))
+        return sections
+
+    def _generate_section(self, topic: str, base_prompt: str, research_content: str,
+                          outline: Dict[str, Any], section: Dict[str, Any]) -> str:
+        """Generate the markdown content of one section."""
+        messages = self._prepare_section_messages(topic, base_prompt, research_content, outline, section)
+        content = self._request_completion(messages, self.config.openai_section_max_tokens, topic=topic)
+        if not content.strip():
+            raise CompilerAgentError(f"Empty content returned for section {section['filename']}")
+        return content
+
+    def _execute_sectioned_compilation(self, topic: str, research_data_paths: List[str], module_path: str) -> bool:
+        """
+        Two-stage compilation: a fast outline call plans the sections and manifest, then each
+        section is generated by its own concurrent completion with its own token budget.
+        """
+        base_prompt = self._read_base_prompt()
+        research_content = self._read_research_content(research_data_paths)
+
+        try:
+            self.logger.info("Calling OpenAI API for workshop outline...")
+            outline_start = time.time()
+            outline_content = self._request_completion(
+                self._prepare_outline_messages(topic, base_prompt, research_content),
+                self.config.openai_outline_max_tokens,
+                json_mode=True,
+                topic=topic
+            )
+            outline = json.loads(outline_content)
+        except Exception as e:
+            self.logger.error(f"Failed to generate workshop outline: {e}", exc_info=True)
+            return False
+
+        sections = self._normalize_outline_sections(outline)
+        if not sections:
+            self.logger.error("Workshop outline contained no usable sections")
+            return False
+        outline["sections"] = sections
+        self.logger.info(f"Outline received in {time.time() - outline_start:.1f}s: {len(sections)} sections")
+
+        written = set()
+        max_workers = min(self.config.section_concurrency, len(sections))
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="section") as executor:
+            futures = {
+                executor.submit(get_tracer().bind(self._generate_section), topic, base_prompt, research_content, outline, section): section
+                for section in sections
+            }
+            for future in as_completed(futures):
+                section = futures[future]
+                try:
+                    content = future.result()
+                except Exception as e:
+                    self.logger.error(f"Failed to generate section {section['filename']}: {e}")
+                    continue
+                self._write_module_file(module_path, section['filename'], content)
+                written.add(section['filename'])
+                self.logger.info(f"Created section {len(written)}/{len(sections)}: {section['filename']} ({len(content)} chars)")
+
+        generated_sections = [s for s in sections if s['filename'] in written]
+        if not generated_sections:
+            self.logger.error("No sections could be generated")
+            return False
+
+        self._render_module_files(module_path, topic, outline)
+        self.logger.info(f"Sectioned compilation completed. Created {len(generated_sections)} of {len(sections)} sections.")
+        return True
+
+    def _template_renderer(self):
+        try:
+            return get_template_renderer(self.config.module_templates_dir, logger=self.logger)
+        except TemplateRendererError as e:
+            raise CompilerAgentError(str(e))
+
+    def _module_template_context(self, module_path: str, topic: str, outline: Optional[Dict[str, Any]] = None,
+                                 note: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Context for rendering a module's manifest.json and README.md. The section list
+        is always the section files in `module_path`; the workshop metadata comes from
+        the outline when there is one, otherwise from the introduction (its first
+        paragraph and its "Learning Objectives" and "Prerequisites" lists).
+        """
+        outline = outline or {}
+        filenames = sorted(name for name in os.listdir(module_path)
+                           if name.endswith(".md") and name not in NON_SECTION_FILES)
+        contents = {}
+        for filename in filenames:
+            with open(os.path.join(module_path, filename), "r", encoding="utf-8") as f:
+                contents[filename] = f.read()
+        summaries = {section.get("filename"): section.get("summary") for section in outline.get("sections", [])}
+        introduction = contents[filenames[0]] if filenames else None
+        return {
+            "module_id": os.path.basename(module_path),
+            "title": outline.get("title") or topic,
+            "description": outline.get("description") or first_paragraph(introduction, 300) or f"A workshop on {topic}.",
+            "difficulty": outline.get("difficulty"),
+            "duration": outline.get("duration"),
+            "prerequisites": outline.get("prerequisites") or list_under_heading(introduction, ("prerequisite",)),
+            "learning_objectives": outline.get("learning_objectives") or list_under_heading(introduction, ("objective", "will learn")),
+            "tags": outline.get("tags") or [],
+            "created_date": time.strftime("%Y-%m-%d"),
+            "sections": module_sections(filenames, contents, summaries),
+            "note": note
+        }
+
+    def _render_module_files(self, module_path: str, topic: str, outline: Optional[Dict[str, Any]] = None,
+                             note: Optional[str] = None):
+        """Render manifest.json and README.md from the templates and the module's section files."""
+        context = self._module_template_context(module_path, topic, outline, note)
+        renderer = self._template_renderer()
+        try:
+            manifest = renderer.render_manifest(context)
+            readme = renderer.render_readme(context)
+        except TemplateRendererError as e:
+            raise CompilerAgentError(f"Could not render the files of {context['module_id']}: {e}")
+        self._write_module_file(module_path, "manifest.json", manifest)
+        self._write_module_file(module_path, "README.md", readme)
+        self.logger.info(f"Rendered manifest.json and README.md for {len(context['sections'])} sections")
+
+    def _stream_deltas(self, messages: List[Dict[str, str]], topic: Optional[str] = None):
+        """Yield content deltas from a streaming completion, then a (None, finish_reason) marker."""
+        attributes = self._span_attributes(messages, self.config.openai_max_tokens, json_mode=True)
+
+        def open_stream():
+            # The request is sent when the first item is pulled, so a failure to connect or a
+            # rate limit surfaces here and can be retried; failures mid-stream are not retried
+            # because files may already have been written from the partial response
+            self._acquire_rate_limit(span, messages, self.config.openai_max_tokens, topic)
+            items = iter(self.backend.stream_chat_completion(
+                messages,
+                self.config.openai_max_tokens,
+                self.config.openai_temperature,
+                json_mode=True
+            ))
+            return itertools.chain([next(items)], items)
+
+        with get_tracer().span("llm.stream_chat_completion", bytes_out=0, **attributes) as span:
+            for item in self.retry_policy.call(open_stream, "Streaming completion request"):
+                if isinstance(item, str):
+                    span.add("bytes_out", text_bytes(item))
+                else:
+                    span.set(finish_reason=item[1])
+                yield item
+
     def _fallback_generation(self, topic: str, research_data_paths: List[str], module_path: str):
         """Fallback content generation when Codex CLI is not available."""
         self.logger.warning("Using fallback content generation (Codex CLI not available)")
@@ -256,49 +730,95 @@ This section covers the fundamental concepts you need to understand {topic}.
 """
 
         # Write basic files
-        with open(os.path.join(module_path, "00_introduction.md"), "w", encoding="utf-8") as f:
-            f.write(intro_content)
-        
-        with open(os.path.join(module_path, "01_core_concepts.md"), "w", encoding="utf-8") as f:
-            f.write(concepts_content)
-        
-        # Create manifest.json
-        manifest_data = {
-            "id": f"workshop-{self._determine_next_workshop_number()}-{self._slugify_topic(topic)}",
-            "title": f"Workshop: {topic}",
-            "files": ["00_introduction.md", "01_core_concepts.md"]
-        }
-        
-        with open(os.path.join(module_path, "manifest.json"), "w", encoding="utf-8") as f:
-            json.dump(manifest_data, f, indent=2)
+        self._write_module_file(module_path, "00_introduction.md", intro_content)
+        self._write_module_file(module_path, "01_core_concepts.md", concepts_content)
         
-        # Create README.md
-        readme_content = f"""# Workshop: {topic}
-
-Welcome to the workshop on {topic}.
-
-## Sections
+        self._render_module_files(
+            module_path, topic,
+            note="This workshop was generated using fallback content generation.\n"
+                 "For optimal results, ensure the OpenAI API is properly configured."
+        )
 
-- [00 Introduction](./00_introduction.md)
-- [01 Core Concepts](./01_core_concepts.md)
 
-## Note
-
-This workshop was generated using fallback content generation.
-For optimal results, ensure the OpenAI Codex CLI is properly installed and configured.
-"""
-        
-        with open(os.path.join(module_path, "README.md"), "w", encoding="utf-8") as f:
-            f.write(readme_content)
+    def _workshops_dir(self) -> str:
+        """Directory that workshop modules are created in."""
+        # Use workshops_output_dir if available, otherwise workshops_base_dir
+        if hasattr(self.config, 'workshops_output_dir') and self.config.workshops_output_dir:
+            return self.config.workshops_output_dir
+        return self.config.workshops_base_dir
 
+    def _workshop_index(self) -> Optional[WorkshopIndex]:
+        """
+        The persistent index of the workshops directory, or None when it is disabled or
+        cannot be opened. Offline dry runs only read an existing, up-to-date index and
+        otherwise scan the directory, so they never create or update it.
+        """
+        if not self.config.workshop_index_enabled:
+            return None
+        base_dir = self._workshops_dir()
+        if self.config.offline:
+            return self._read_only_workshop_index(base_dir)
+        with self._index_lock:
+            if self._index is None or self._index.workshops_base_dir != base_dir:
+                db_path = os.path.join(base_dir, WorkshopNumberAllocator.LEDGER_DIR_NAME, "index.sqlite3")
+                try:
+                    self._index = WorkshopIndex(base_dir, db_path, logger=self.logger)
+                except WorkshopIndexError as e:
+                    self.logger.warning(f"Workshop index unavailable, scanning {base_dir} instead: {e}")
+                    return None
+            return self._index
+
+    def _read_only_workshop_index(self, base_dir: str) -> Optional[WorkshopIndex]:
+        with self._index_lock:
+            if self._index is not None and self._index.workshops_base_dir == base_dir:
+                return self._index
+            db_path = os.path.join(base_dir, WorkshopNumberAllocator.LEDGER_DIR_NAME, "index.sqlite3")
+            try:
+                index = WorkshopIndex(base_dir, db_path, read_only=True, logger=self.logger)
+            except WorkshopIndexError as e:
+                self.logger.debug(f"{e}; scanning {base_dir} instead")
+                return None
+            try:
+                index.refresh()
+            except WorkshopIndexError as e:
+                self.logger.debug(f"{e}; scanning {base_dir} instead")
+                index.close()
+                return None
+            self._index = index
+            return index
+
+    def _scanned_module_entries(self) -> List[Dict[str, Any]]:
+        """Module directories of the workshops directory as index-like entries, for when there is no index."""
+        base_dir = self._workshops_dir()
+        try:
+            names = sorted(name for name in os.listdir(base_dir) if MODULE_NAME_PATTERN.match(name)
+                           and os.path.isdir(os.path.join(base_dir, name)))
+        except FileNotFoundError:
+            return []
+        entries = []
+        for name in names:
+            try:
+                manifest_key = str(os.stat(os.path.join(base_dir, name, "manifest.json")).st_mtime_ns)
+            except OSError:
+                manifest_key = None
+            entries.append({"name": name, "manifest_sha256": manifest_key})
+        return entries
 
     def _determine_next_workshop_number(self) -> int:
-        """Determine the next workshop number based on existing workshops."""
-        # Use workshops_output_dir if available, otherwise workshops_base_dir
-        if hasattr(self.config, 'workshops_output_dir') and self.config.workshops_output_dir:
-            base_dir = self.config.workshops_output_dir
-        else:
-            base_dir = self.config.workshops_base_dir
+        """
+        Determine the next workshop number from the workshop index, or by scanning
+        existing workshops when the index is disabled or unavailable.
+        Only used to seed the allocator; new modules get their number from _reserve_module_directory.
+        """
+        index = self._workshop_index()
+        if index is not None:
+            try:
+                index.refresh()
+                return index.highest_number() + 1
+            except WorkshopIndexError as e:
+                self.logger.warning(f"{e}; scanning the workshops directory instead")
+
+        base_dir = self._workshops_dir()
             
         if not os.path.exists(base_dir):
             return 1
@@ -325,9 +845,25 @@ For optimal results, ensure the OpenAI Codex CLI is properly installed and confi
         
         return max(numbers) + 1 if numbers else 1
 
+    def find_existing_modules(self, topic: str) -> List[Dict[str, Any]]:
+        """
+        Indexed workshop modules with the same slug or topic as `topic` (empty when
+        there are none or the index is disabled).
+        """
+        index = self._workshop_index()
+        if index is None:
+            return []
+        try:
+            index.refresh()
+        except WorkshopIndexError as e:
+            self.logger.warning(str(e))
+            return []
+        matches = {entry["name"]: entry for entry in index.find_by_slug(self._slugify_topic(topic))}
+        matches.update((entry["name"], entry) for entry in index.find_by_topic(topic))
+        return sorted(matches.values(), key=lambda entry: (entry["number"], entry["name"]))
+
     def _slugify_topic(self, topic: str) -> str:
         """Convert topic to a URL-friendly slug."""
-        import re
         # Convert to lowercase and replace spaces/special chars with hyphens
         slug = re.sub(r'[^\w\s-]', '', topic.lower())
         slug = re.sub(r'[-\s]+', '-', slug)
@@ -347,55 +883,457 @@ For optimal results, ensure the OpenAI Codex CLI is properly installed and confi
         """
         self.logger.info(f"Starting workshop compilation for topic: {topic}")
         
-        # Create module directory
-        module_path = self._create_module_directory(topic)
+        # Reserve the module directory; its files are staged and moved into place together
+        module_path = self._reserve_module_directory(topic)
         
-        # Create AGENTS.MD file for proper Codex guidance
-        self._create_agents_md(module_path, topic)
-        
-        # Prepare messages for OpenAI API
-        messages = self._prepare_workshop_messages(topic, research_data_paths, module_path)
-        
-        # Try to execute OpenAI API call
-        success = self._execute_openai_api(messages, module_path)
-        
-        if not success:
-            self.logger.warning("Codex CLI execution failed, using fallback generation")
-            self._fallback_generation(topic, research_data_paths, module_path)
-        
-        # Validate the generated workshop
-        self._validate_workshop_structure(module_path)
+        with self._staged_module(module_path) as staged:
+            # Create AGENTS.MD file for proper Codex guidance
+            self._create_agents_md(staged.path, topic)
+            
+            if self.config.compilation_mode == "sectioned":
+                # Outline first, then one concurrent completion per section
+                success = self._execute_sectioned_compilation(topic, research_data_paths, staged.path)
+            else:
+                # Prepare messages for OpenAI API
+                messages = self._prepare_workshop_messages(topic, research_data_paths, staged.path)
+                
+                # Try to execute OpenAI API call; the model writes the sections only
+                success = self._execute_openai_api(messages, staged.path, topic)
+                if success:
+                    self._render_module_files(staged.path, topic)
+            
+            if not success:
+                self.logger.warning("Codex CLI execution failed, using fallback generation")
+                self._fallback_generation(topic, research_data_paths, staged.path)
+            
+            # Validate the generated workshop
+            self._validate_workshop_structure(staged.path)
+            index = self._workshop_index()
+            mtime_ns = index.mtime_ns() if index is not None else None
+            self._publish_staged_module(staged)
+
+        if index is not None:
+            try:
+                index.add(module_path, topic, expected_mtime_ns=mtime_ns)
+                index.update_manifest(module_path)
+            except WorkshopIndexError as e:
+                self.logger.warning(str(e))
         
         self.logger.info(f"Workshop compilation completed. Module created at: {module_path}")
         return module_path
 
-    def _create_module_directory(self, topic: str) -> str:
-        """Create the workshop module directory."""
-        # Determine the next workshop number
-        workshop_number = self._determine_next_workshop_number()
-        
-        # Create module directory name
-        topic_slug = self._slugify_topic(topic)
-        module_name = f"workshop-{workshop_number}-{topic_slug}"
-        
-        # Create full path - use workshops_output_dir if available, otherwise workshops_base_dir
-        if hasattr(self.config, 'workshops_output_dir') and self.config.workshops_output_dir:
-            module_path = os.path.join(self.config.workshops_output_dir, module_name)
+    def update_workshop(self, module: str, sections: List[str], instructions: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Regenerate some sections of an existing workshop module in place.
+
+        Only the requested section files are sent to the model, each with its current
+        content and the headings of the other sections as context, so the cost follows
+        the number of sections changed rather than the size of the module. No research
+        is done. manifest.json and README.md are rewritten only when a section is new
+        or its H1 title changed.
+
+        Args:
+            module (str): Module directory name in the workshops directory, or its path
+            sections (list): Section file names to regenerate (e.g. "02_hands_on.md")
+            instructions (str): Optional guidance for the revision
+
+        Returns:
+            dict: module_path, topic, updated, unchanged and failed section file names,
+            whether manifest.json and README.md were rewritten, and this update's
+            completion cache hits and misses
+        """
+        module_path = self._resolve_module_path(module)
+        filenames = self._normalize_update_sections(sections)
+        manifest = self._read_module_manifest(module_path)
+        topic = self._module_topic(module_path, manifest)
+        cache_before = self.cache_stats(topic)
+        outline = self._module_outline(module_path, manifest, filenames)
+        self.logger.info(f"Updating {len(filenames)} of {len(outline['sections'])} sections in {module_path}: {', '.join(filenames)}")
+
+        base_prompt = self._read_base_prompt()
+        by_filename = {section['filename']: section for section in outline['sections']}
+        generated = {}
+        failed = []
+        max_workers = min(self.config.section_concurrency, len(filenames))
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="section") as executor:
+            futures = {
+                executor.submit(get_tracer().bind(self._regenerate_section), topic, base_prompt, outline,
+                                by_filename[filename], instructions): filename
+                for filename in filenames
+            }
+            for future in as_completed(futures):
+                filename = futures[future]
+                try:
+                    generated[filename] = future.result()
+                except Exception as e:
+                    self.logger.error(f"Failed to regenerate section {filename}: {e}")
+                    failed.append(filename)
+        if not generated:
+            raise CompilerAgentError(f"None of the requested sections could be regenerated in {module_path}")
+
+        updated, unchanged, renamed = [], [], {}
+        with self._staged_module(module_path, update=True) as staged:
+            for filename in filenames:
+                if filename not in generated:
+                    continue
+                section = by_filename[filename]
+                if generated[filename] == section['content']:
+                    unchanged.append(filename)
+                    continue
+                self._write_module_file(staged.path, filename, generated[filename])
+                updated.append(filename)
+                new_title = self._section_title(filename, generated[filename])
+                if section['content'] is None or new_title != section['title']:
+                    renamed[filename] = (None if section['content'] is None else section['title'], new_title)
+                self.logger.info(f"Updated section {filename} ({len(generated[filename])} chars)")
+
+            manifest_updated = self._update_manifest_sections(staged.path, manifest, renamed)
+            readme_updated = self._update_readme_sections(module_path, staged.path, renamed)
+            self._publish_staged_module(staged)
+        if manifest_updated:
+            index = self._workshop_index()
+            if index is not None:
+                try:
+                    index.update_manifest(module_path)
+                except WorkshopIndexError as e:
+                    self.logger.warning(str(e))
+
+        self.logger.info(
+            f"Workshop update completed: {len(updated)} sections rewritten, {len(unchanged)} unchanged, "
+            f"{len(failed)} failed; manifest.json {'rewritten' if manifest_updated else 'unchanged'}, "
+            f"README.md {'rewritten' if readme_updated else 'unchanged'}"
+        )
+        return {
+            "module_path": module_path,
+            "topic": topic,
+            "updated": updated,
+            "unchanged": unchanged,
+            "failed": sorted(failed),
+            "manifest_updated": manifest_updated,
+            "readme_updated": readme_updated,
+            "compilation_cache": {key: count - cache_before[key] for key, count in self.cache_stats(topic).items()}
+        }
+
+    def _resolve_module_path(self, module: str) -> str:
+        """Path of an existing module given its directory name or path."""
+        module_path = module if os.path.isdir(module) else os.path.join(self._workshops_dir(), os.path.basename(os.path.normpath(module)))
+        if not os.path.isfile(os.path.join(module_path, "manifest.json")):
+            raise CompilerAgentError(f"No workshop module with a manifest.json at {module_path}")
+        return os.path.abspath(module_path)
+
+    @staticmethod
+    def _normalize_update_sections(sections: List[str]) -> List[str]:
+        """Section file names to update, with ".md" added where missing; README.md and manifest.json are not sections."""
+        filenames = []
+        for section in sections:
+            filename = os.path.basename(section.strip())
+            if filename and not filename.endswith(".md"):
+                filename += ".md"
+            if not SECTION_FILENAME_PATTERN.match(filename) or filename in NON_SECTION_FILES:
+                raise CompilerAgentError(f"Not a section file name: {section!r}")
+            if filename not in filenames:
+                filenames.append(filename)
+        if not filenames:
+            raise CompilerAgentError("No sections to update were given")
+        return filenames
+
+    @staticmethod
+    def _read_module_manifest(module_path: str) -> Dict[str, Any]:
+        try:
+            with open(os.path.join(module_path, "manifest.json"), "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError) as e:
+            raise CompilerAgentError(f"Could not read manifest.json of {module_path}: {e}")
+        if not isinstance(manifest, dict):
+            raise CompilerAgentError(f"manifest.json of {module_path} is not a JSON object")
+        return manifest
+
+    @staticmethod
+    def _manifest_section_files(manifest: Dict[str, Any]) -> List[str]:
+        """Section files listed in a manifest, in order: generated modules list `files`, hand-written ones `pages`."""
+        if isinstance(manifest.get("files"), list):
+            names = [str(name) for name in manifest["files"]]
         else:
-            module_path = os.path.join(self.config.workshops_base_dir, module_name)
-        
-        # Create directory if it doesn't exist
-        if os.path.exists(module_path):
-            self.logger.warning(f"Module directory {module_path} already exists. Removing for fresh creation.")
-            shutil.rmtree(module_path)
-        
-        os.makedirs(module_path, exist_ok=True)
+            names = [str(page["slug"]) for page in manifest.get("pages") or [] if isinstance(page, dict) and page.get("slug")]
+        return [name for name in names if name.endswith(".md") and name not in NON_SECTION_FILES]
+
+    def _module_topic(self, module_path: str, manifest: Dict[str, Any]) -> str:
+        """The module's topic: its manifest title without the "Workshop:" prefix, or its slug."""
+        title = manifest.get("title")
+        if isinstance(title, str) and TITLE_PREFIX_PATTERN.sub("", title).strip():
+            return TITLE_PREFIX_PATTERN.sub("", title).strip()
+        return re.sub(r"^workshop-\d+-?", "", os.path.basename(module_path)).replace("-", " ")
+
+    @staticmethod
+    def _section_title(filename: str, content: Optional[str]) -> str:
+        """A section's H1 heading, or a title made from its file name."""
+        return markdown_title(filename, content)
+
+    def _module_outline(self, module_path: str, manifest: Dict[str, Any], filenames: List[str]) -> Dict[str, Any]:
+        """
+        Title, description and sections of an existing module. Every section has its
+        title and first headings; the sections in `filenames` also carry their current
+        content (None for sections that do not exist yet).
+        """
+        section_files = self._manifest_section_files(manifest)
+        if not section_files:
+            section_files = sorted(name for name in os.listdir(module_path)
+                                   if name.endswith(".md") and name not in NON_SECTION_FILES)
+        sections = []
+        for filename in section_files + [name for name in filenames if name not in section_files]:
+            try:
+                with open(os.path.join(module_path, filename), "r", encoding="utf-8") as f:
+                    content = f.read()
+            except FileNotFoundError:
+                content = None
+            except OSError as e:
+                raise CompilerAgentError(f"Could not read section {filename} of {module_path}: {e}")
+            headings = [f"{'  ' * (len(level) - 1)}{text}" for level, text in
+                        MARKDOWN_HEADING_PATTERN.findall(CODE_FENCE_PATTERN.sub("", content or ""))]
+            sections.append({
+                "filename": filename,
+                "title": self._section_title(filename, content),
+                "headings": headings[1:UPDATE_CONTEXT_HEADINGS + 1],
+                "content": content if filename in filenames else None
+            })
+        return {
+            "title": self._module_topic(module_path, manifest),
+            "description": manifest.get("description") if isinstance(manifest.get("description"), str) else "",
+            "sections": sections
+        }
+
+    def _prepare_update_messages(self, topic: str, base_prompt: str, outline: Dict[str, Any],
+                                 section: Dict[str, Any], instructions: Optional[str]) -> List[Dict[str, str]]:
+        """Prepare messages for regenerating one section of an existing module."""
+        section_list = "\n".join(
+            f"- {s['filename']}: {s['title']}" + ("  <-- this section" if s['filename'] == section['filename'] else "")
+            + "".join(f"\n    - {heading}" for heading in s['headings'] if s['filename'] != section['filename'])
+            for s in outline['sections']
+        )
+        current_content = section['content'] if section['content'] is not None else "(This section does not exist yet; write it from scratch.)"
+
+        system_message = f"""You are an expert educational content creator specializing in technical workshops. You are revising one section of an existing workshop module; the other sections are not changing.
+
+{base_prompt}
+
+For this request, do not return JSON. Respond only with the complete markdown content of the revised section file, starting with its H1 heading."""
+
+        user_message = f"""Workshop: "{outline.get('title') or topic}"
+{outline.get('description', '')}
+
+WORKSHOP SECTIONS (with the headings of the other sections):
+{section_list}
+
+Rewrite the section file `{section['filename']}` titled "{section['title']}".
+
+CURRENT CONTENT:
+{current_content}
+
+REVISION INSTRUCTIONS:
+{instructions or "Replace placeholders and thin passages with complete, accurate teaching content."}
+
+Requirements:
+1. Cover only this section's scope; refer to other sections by title instead of repeating them
+2. Keep what is correct and useful in the current content
+3. Include practical examples, code blocks with language specifiers and exercises where applicable
+4. Use proper markdown formatting throughout"""
+
+        return [
+            {"role": "system", "content": system_message},
+            {"role": "user", "content": user_message}
+        ]
+
+    def _regenerate_section(self, topic: str, base_prompt: str, outline: Dict[str, Any],
+                            section: Dict[str, Any], instructions: Optional[str]) -> str:
+        """Generate the new markdown content of one section of an existing module."""
+        messages = self._prepare_update_messages(topic, base_prompt, outline, section, instructions)
+        content = self._request_completion(messages, self.config.openai_section_max_tokens, topic=topic)
+        if not content.strip():
+            raise CompilerAgentError(f"Empty content returned for section {section['filename']}")
+        return content
+
+    def _update_manifest_sections(self, staging_path: str, manifest: Dict[str, Any], renamed: Dict[str, tuple]) -> bool:
+        """
+        Add new sections to the manifest's file or page list and follow title changes
+        in its page titles. `renamed` maps file names to (old title or None if new,
+        new title). Returns True if manifest.json was rewritten.
+        """
+        changed = False
+        pages = manifest.get("pages") if isinstance(manifest.get("pages"), list) and not isinstance(manifest.get("files"), list) else None
+        listed = self._manifest_section_files(manifest)
+        for filename, (old_title, new_title) in renamed.items():
+            if filename not in listed:
+                entries = pages if pages is not None else manifest.setdefault("files", [])
+                names = [entry.get("slug") if isinstance(entry, dict) else entry for entry in entries]
+                position = next((i for i, name in enumerate(names)
+                                 if isinstance(name, str) and re.match(r"\d{2}_", name) and name > filename), len(entries))
+                entries.insert(position, {"slug": filename, "title": new_title} if pages is not None else filename)
+                listed.append(filename)
+                changed = True
+            elif pages is not None and old_title is not None:
+                for page in pages:
+                    if isinstance(page, dict) and page.get("slug") == filename and page.get("title") == old_title:
+                        page["title"] = new_title
+                        changed = True
+        if changed:
+            self._write_module_file(staging_path, "manifest.json", json.dumps(manifest, indent=2, ensure_ascii=False))
+        return changed
+
+    def _update_readme_sections(self, module_path: str, staging_path: str, renamed: Dict[str, tuple]) -> bool:
+        """
+        Add navigation links for new sections to the module's README.md and follow title
+        changes in links whose text was the old title, writing the result to `staging_path`.
+        Returns True if README.md was rewritten.
+        """
+        readme_path = os.path.join(module_path, "README.md")
+        try:
+            with open(readme_path, "r", encoding="utf-8") as f:
+                readme = f.read()
+        except FileNotFoundError:
+            return False
+        original = readme
+        for filename, (old_title, new_title) in renamed.items():
+            link_target = rf"\((?:\./)?{re.escape(filename)}\)"
+            if old_title is not None:
+                readme = re.sub(rf"\[{re.escape(old_title)}\](?={link_target})", lambda _: f"[{new_title}]", readme)
+            elif not re.search(link_target, readme):
+                link = f"- [{new_title}](./{filename})"
+                links = list(re.finditer(r"^\s*[-*] \[[^\]]*\]\((?:\./)?[\w-]+\.md\).*$", readme, re.MULTILINE))
+                if links:
+                    readme = readme[:links[-1].end()] + "\n" + link + readme[links[-1].end():]
+                else:
+                    readme = readme.rstrip("\n") + f"\n\n## Sections\n\n{link}\n"
+        if readme == original:
+            return False
+        self._write_module_file(staging_path, "README.md", readme)
+        return True
+
+    def _workshop_allocator(self) -> WorkshopNumberAllocator:
+        """
+        The allocator for the workshops directory, kept between calls so its directory
+        listing is reused; numbers in use are looked up in the workshop index when it is enabled.
+        """
+        base_dir = self._workshops_dir()
+        index = self._workshop_index()
+        with self._index_lock:
+            allocator = self._allocator
+            if allocator is None or allocator.workshops_base_dir != base_dir or allocator.index is not index:
+                allocator = WorkshopNumberAllocator(
+                    base_dir,
+                    scan_highest_number=lambda: self._determine_next_workshop_number() - 1,
+                    index=index,
+                    logger=self.logger
+                )
+                self._allocator = allocator
+            return allocator
+
+    def preview_module_directory(self, topic: str) -> tuple:
+        """
+        Return the (workshop_number, module_path) the next compilation of `topic` would
+        most likely get, without reserving the number or creating anything.
+        """
+        number = self._workshop_allocator().peek()
+        return number, os.path.join(self._workshops_dir(), f"workshop-{number}-{self._slugify_topic(topic)}")
+
+    def find_similar_modules(self, topic: str, threshold: float, limit: int = 3) -> List[Dict[str, Any]]:
+        """
+        Existing workshop modules that probably cover `topic` already: exact slug or
+        topic matches from the workshop index (score 1.0), then modules whose title
+        and slug are at least `threshold` similar (DUPLICATE_TOPIC_* settings). Without
+        an index, the module directories are found by listing the workshops directory.
+
+        Returns:
+            list: dicts with `name`, `score`, `description` and `missing_terms` (words of
+            `topic` the module's title and slug lack; none for exact matches), best first
+        """
+        matches = {entry["name"]: {"name": entry["name"], "score": 1.0, "description": entry["topic"] or entry["slug"],
+                                   "missing_terms": []}
+                   for entry in self.find_existing_modules(topic)}
+        index = self._workshop_index()
+        entries = index.entries() if index is not None else self._scanned_module_entries()
+        duplicate_config = self.config.get_duplicate_topic_config()
+        try:
+            with self._index_lock:
+                if self._similarity_index is None:
+                    self._similarity_index = TopicSimilarityIndex(duplicate_config["embedding_model"], logger=self.logger)
+            self._similarity_index.update(self._workshops_dir(), entries)
+            similar = self._similarity_index.search(topic, limit)
+        except TopicSimilarityError as e:
+            self.logger.warning(f"Similarity check unavailable: {e}")
+            similar = []
+        for match in similar:
+            if match["score"] >= threshold and match["name"] not in matches:
+                matches[match["name"]] = match
+        return sorted(matches.values(), key=lambda match: match["score"], reverse=True)[:limit]
+
+    def _reserve_module_directory(self, topic: str) -> str:
+        """
+        Reserve a new workshop number and module directory name for `topic`. The
+        directory is created when the staged module is published (see _staged_module).
+        Safe to call from concurrent runs: each call gets a distinct number and an
+        existing module directory is never reused or removed.
+        """
+        os.makedirs(self._workshops_dir(), exist_ok=True)
+        existing = self.find_existing_modules(topic)
+        if existing:
+            self.logger.warning(f"'{topic}' already has workshop module(s): {', '.join(entry['name'] for entry in existing)}")
+
+        try:
+            workshop_number, module_path = self._workshop_allocator().allocate(self._slugify_topic(topic), create_directory=False)
+        except (WorkshopAllocatorError, OSError) as e:
+            raise CompilerAgentError(f"Could not reserve a module directory for '{topic}': {e}")
         
-        self.logger.info(f"Created module directory: {module_path}")
+        self.logger.info(f"Reserved module directory for workshop {workshop_number}: {module_path}")
         return module_path
 
+    @contextmanager
+    def _staged_module(self, module_path: str, update: bool = False):
+        """
+        Stage the files written for `module_path` (see StagedModule): generation writes
+        into `staged.path`, a hidden copy of the module directory, and the caller
+        publishes it with _publish_staged_module. Files that were not published are
+        discarded, so a failed or interrupted compilation never touches the module.
+        Only with `update` may the files be published into an existing module.
+        """
+        with self._staged_lock:
+            if not self._stale_staging_removed:
+                self._stale_staging_removed = True
+                removed = remove_stale_staging(os.path.dirname(os.path.abspath(module_path)))
+                if removed:
+                    self.logger.info(f"Removed {removed} stale staging directories")
+        try:
+            staged = StagedModule(module_path, fsync=self.config.module_write_fsync, update=update, logger=self.logger)
+        except ModuleWriterError as e:
+            raise CompilerAgentError(str(e))
+        with self._staged_lock:
+            self._staged_modules[staged.path] = staged
+        try:
+            yield staged
+        finally:
+            with self._staged_lock:
+                del self._staged_modules[staged.path]
+            if not staged.published:
+                staged.discard()
+
+    def _publish_staged_module(self, staged: StagedModule) -> List[str]:
+        """Move a staged module into place; returns the names of the files that changed."""
+        try:
+            changed = staged.publish()
+        except ModuleWriterError as e:
+            raise CompilerAgentError(str(e))
+        self.logger.info(f"Wrote {len(changed)} files to {staged.module_path}")
+        return changed
+
     def _validate_workshop_structure(self, module_path: str):
         """Validate that the workshop has the required structure."""
+        # Check for at least one content file
+        content_files = [f for f in os.listdir(module_path)
+                        if f.endswith('.md') and f not in NON_SECTION_FILES]
+        
+        if not content_files:
+            self.logger.warning("No content files found, creating minimal structure")
+            self._create_minimal_content(module_path)
+
         required_files = ['manifest.json', 'README.md']
         
         for required_file in required_files:
@@ -407,53 +1345,33 @@ For optimal results, ensure the OpenAI Codex CLI is properly installed and confi
                     self._create_minimal_manifest(module_path)
                 elif required_file == 'README.md':
                     self._create_minimal_readme(module_path)
-        
-        # Check for at least one content file
-        content_files = [f for f in os.listdir(module_path)
-                        if f.endswith('.md') and f != 'README.md' and f != 'AGENTS.MD']
-        
-        if not content_files:
-            self.logger.warning("No content files found, creating minimal structure")
-            self._create_minimal_content(module_path)
 
     def _create_minimal_manifest(self, module_path: str):
         """Create a minimal manifest.json file."""
         topic = os.path.basename(module_path).replace('workshop-', '').replace('-', ' ').title()
+        context = self._module_template_context(module_path, topic)
+        try:
+            manifest_content = self._template_renderer().render_manifest(context)
+        except TemplateRendererError as e:
+            raise CompilerAgentError(f"Could not render manifest.json for {module_path}: {e}")
         
-        # Find all markdown files except README.md and AGENTS.MD
-        md_files = sorted([f for f in os.listdir(module_path)
-                          if f.endswith('.md') and f not in ['README.md', 'AGENTS.MD']])
-        
-        manifest_data = {
-            "id": os.path.basename(module_path),
-            "title": f"Workshop: {topic}",
-            "files": md_files if md_files else ["00_introduction.md"]
-        }
-        
-        manifest_path = os.path.join(module_path, "manifest.json")
-        with open(manifest_path, "w", encoding="utf-8") as f:
-            json.dump(manifest_data, f, indent=2)
+        manifest_path = self._write_module_file(module_path, "manifest.json", manifest_content)
         
         self.logger.info(f"Created minimal manifest.json: {manifest_path}")
 
     def _create_minimal_readme(self, module_path: str):
         """Create a minimal README.md file."""
         topic = os.path.basename(module_path).replace('workshop-', '').replace('-', ' ').title()
+        context = self._module_template_context(
+            module_path, topic,
+            note="This workshop was generated automatically. Please refer to the individual sections for detailed content."
+        )
+        try:
+            readme_content = self._template_renderer().render_readme(context)
+        except TemplateRendererError as e:
+            raise CompilerAgentError(f"Could not render README.md for {module_path}: {e}")
         
-        readme_content = f"""# Workshop: {topic}
-
-Welcome to the workshop on {topic}.
-
-This workshop was generated automatically. Please refer to the individual sections for detailed content.
-
-## Workshop Structure
-
-The workshop is organized into logical sections that build upon each other.
-"""
-        
-        readme_path = os.path.join(module_path, "README.md")
-        with open(readme_path, "w", encoding="utf-8") as f:
-            f.write(readme_content)
+        readme_path = self._write_module_file(module_path, "README.md", readme_content)
         
         self.logger.info(f"Created minimal README.md: {readme_path}")
 
@@ -474,9 +1392,7 @@ This section introduces the key concepts and objectives of this workshop.
 By completing this workshop, you will gain understanding of the fundamental aspects of {topic}.
 """
         
-        intro_path = os.path.join(module_path, "00_introduction.md")
-        with open(intro_path, "w", encoding="utf-8") as f:
-            f.write(intro_content)
+        intro_path = self._write_module_file(module_path, "00_introduction.md", intro_content)
         
         self.logger.info(f"Created minimal content file: {intro_path}")
 
@@ -0,0 +1,105 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Dict, List, Optional
+
+
+class CompletionCache:
+    """
+    Local cache of chat completion responses, stored as zlib-compressed blobs in SQLite.
+
+    Entries are keyed by a hash of the request messages and the model parameters that
+    affect the output (model, max_tokens, temperature, response format). When the
+    stored (compressed) size exceeds `max_bytes`, the least recently used entries are
+    evicted. Hit and miss counts are kept for the lifetime of the cache object.
+    """
+
+    def __init__(self, db_path: str, max_bytes: int, logger: Optional[logging.Logger] = None):
+        self.db_path = db_path
+        self.max_bytes = max_bytes
+        self.logger = logger or logging.getLogger(__name__)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        db_dir = os.path.dirname(self.db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS completions ("
+                " key TEXT PRIMARY KEY,"
+                " content BLOB NOT NULL,"
+                " size INTEGER NOT NULL,"
+                " created_at REAL NOT NULL,"
+                " last_access REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS completions_last_access ON completions (last_access)")
+
+    @staticmethod
+    def make_key(messages: List[Dict[str, str]], model: str, max_tokens: int, temperature: float, json_mode: bool) -> str:
+        """Build the cache key for a completion request."""
+        payload = json.dumps(
+            {
+                "messages": messages,
+                "model": model,
+                "max_tokens": max_tokens,
+                "temperature": temperature,
+                "json_mode": json_mode
+            },
+            sort_keys=True,
+            ensure_ascii=False
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached completion for `key`, or None on a miss."""
+        with self._lock:
+            row = self._conn.execute("SELECT content FROM completions WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            with self._conn:
+                self._conn.execute("UPDATE completions SET last_access = ? WHERE key = ?", (time.time(), key))
+            self.hits += 1
+        try:
+            return zlib.decompress(row[0]).decode("utf-8")
+        except (zlib.error, UnicodeDecodeError) as e:
+            self.logger.warning(f"Discarding corrupt completion cache entry {key}: {e}")
+            with self._lock, self._conn:
+                self._conn.execute("DELETE FROM completions WHERE key = ?", (key,))
+            return None
+
+    def put(self, key: str, content: str) -> None:
+        """Store a completion and evict least recently used entries if the cache is over budget."""
+        blob = zlib.compress(content.encode("utf-8"))
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO completions (key, content, size, created_at, last_access) VALUES (?, ?, ?, ?, ?)",
+                (key, blob, len(blob), now, now)
+            )
+            if self.max_bytes:
+                self._evict()
+
+    def _evict(self) -> None:
+        total_size = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM completions").fetchone()[0]
+        if total_size <= self.max_bytes:
+            return
+        for key, size in self._conn.execute("SELECT key, size FROM completions ORDER BY last_access ASC").fetchall():
+            self._conn.execute("DELETE FROM completions WHERE key = ?", (key,))
+            total_size -= size
+            self.logger.debug(f"Evicted completion cache entry: {key}")
+            if total_size <= self.max_bytes:
+                break
+
+    def stats(self) -> dict:
+        """Return hit/miss counts for this cache."""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses}
@@ -0,0 +1,143 @@
+import hashlib
+import logging
+import os
+import re
+from typing import List, Optional
+
+# Optional exact tokenizer; falls back to a character-based estimate when unavailable
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    tiktoken = None
+    TIKTOKEN_AVAILABLE = False
+
+# Separator line written around the response body by ResearchAgent
+_SEPARATOR = "=" * 80
+# Paragraphs shorter than this (after normalisation) are never treated as duplicates,
+# so short headings and list labels keep the document structure intact
+_MIN_DEDUP_CHARS = 40
+
+
+class ResearchContextPacker:
+    """
+    Packs research files into a compact context block for the compiler prompt.
+
+    - Skips JSON side files such as the research summary
+    - Drops the boilerplate ResearchAgent writes around each response
+      (title line, repeated "Research Query" prompt, separators, footer)
+    - Removes paragraphs that repeat across the research files
+    - Adds paragraphs in focus-area priority order until the token budget is spent
+    """
+
+    # Research areas in the order they should survive trimming
+    PRIORITY = ["overview", "learning_structure", "practical_applications", "advanced_concepts"]
+
+    def __init__(self, token_budget: int, model_name: str, logger: Optional[logging.Logger] = None):
+        self.token_budget = token_budget
+        self.logger = logger or logging.getLogger(__name__)
+        self._encoding = self._load_encoding(model_name)
+
+    def _load_encoding(self, model_name: str):
+        if not TIKTOKEN_AVAILABLE:
+            self.logger.debug("tiktoken not installed; estimating research context tokens from character counts")
+            return None
+        try:
+            return tiktoken.encoding_for_model(model_name)
+        except KeyError:
+            return tiktoken.get_encoding("cl100k_base")
+
+    def count_tokens(self, text: str) -> int:
+        """Count tokens with the model's tokenizer, or estimate ~4 characters per token."""
+        if self._encoding is not None:
+            return len(self._encoding.encode(text, disallowed_special=()))
+        return (len(text) + 3) // 4
+
+    def _focus_area(self, path: str) -> str:
+        name = os.path.splitext(os.path.basename(path))[0]
+        for area in self.PRIORITY:
+            if name.endswith(area):
+                return area
+        return name
+
+    def _priority(self, path: str) -> int:
+        area = self._focus_area(path)
+        return self.PRIORITY.index(area) if area in self.PRIORITY else len(self.PRIORITY)
+
+    @staticmethod
+    def _strip_boilerplate(text: str) -> str:
+        """Return the response body between ResearchAgent's separator lines."""
+        first = text.find(_SEPARATOR)
+        last = text.rfind(_SEPARATOR)
+        if first != -1 and last > first:
+            return text[first + len(_SEPARATOR):last].strip()
+        return text.strip()
+
+    @staticmethod
+    def _paragraph_key(paragraph: str) -> str:
+        normalised = re.sub(r'[\W_]+', ' ', paragraph.lower()).strip()
+        if len(normalised) < _MIN_DEDUP_CHARS:
+            return ""
+        return hashlib.sha1(normalised.encode("utf-8")).hexdigest()
+
+    def pack(self, research_data_paths: List[str]) -> dict:
+        """
+        Read, clean, de-duplicate and trim the research files to the token budget.
+
+        Returns:
+            dict: text, tokens (sent), source_tokens, files_used, duplicate_paragraphs, trimmed_paragraphs
+        """
+        text_paths = [p for p in research_data_paths if not p.endswith(".json")]
+        seen = set()
+        packed_sections = []
+        tokens_used = 0
+        source_tokens = 0
+        duplicates = 0
+        trimmed = 0
+        files_used = []
+
+        for path in sorted(text_paths, key=self._priority):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    body = self._strip_boilerplate(f.read())
+            except Exception as e:
+                self.logger.warning(f"Could not read research file {path}: {e}")
+                continue
+
+            heading = f"## {self._focus_area(path).replace('_', ' ').title()}"
+            heading_tokens = self.count_tokens(heading) + 1
+            kept = []
+            for paragraph in re.split(r'\n\s*\n', body):
+                paragraph = paragraph.strip()
+                if not paragraph:
+                    continue
+                paragraph_tokens = self.count_tokens(paragraph) + 1
+                source_tokens += paragraph_tokens
+
+                key = self._paragraph_key(paragraph)
+                if key and key in seen:
+                    duplicates += 1
+                    continue
+
+                cost = paragraph_tokens + (heading_tokens if not kept else 0)
+                if self.token_budget and tokens_used + cost > self.token_budget:
+                    trimmed += 1
+                    continue
+
+                if key:
+                    seen.add(key)
+                kept.append(paragraph)
+                tokens_used += cost
+
+            if kept:
+                packed_sections.append(heading + "\n\n" + "\n\n".join(kept))
+                files_used.append(os.path.basename(path))
+
+        return {
+            "text": "\n\n".join(packed_sections),
+            "tokens": tokens_used,
+            "source_tokens": source_tokens,
+            "files_used": files_used,
+            "duplicate_paragraphs": duplicates,
+            "trimmed_paragraphs": trimmed
+        }
@@ -1,20 +1,19 @@
+import base64
+import importlib.util
 import logging
 import os
-import subprocess
+import posixpath
+import shutil
 import time
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional, Tuple
 
 from ..orchestrator.config import AppConfig
+from ..orchestrator.clients import get_github_session
+from .git_backends import GitBackendError, create_git_backend, run_git_command, temporary_worktree
 
-# Attempt to import github from PyGithub
-try:
-    from github import Github, GithubException
-    PYGITHUB_AVAILABLE = True
-except ImportError:
-    PYGITHUB_AVAILABLE = False
-    Github = None
-    GithubException = None
+# PyGithub is imported lazily by the client factory; only check that it is installed
+PYGITHUB_AVAILABLE = importlib.util.find_spec("github") is not None
 
 class GitAgentError(Exception):
     """Custom exception for GitAgent errors."""
@@ -39,6 +38,7 @@ class GitAgent:
             # raise GitAgentError("PyGithub library is required but not installed.")
 
         self.repo_full_name = f"{self.config.github_repo_owner}/{self.config.github_repo_name}"
+        self._git_backend = None
         
         # Find the actual git repository root
         self.project_root_dir = self._find_git_root()
@@ -62,6 +62,18 @@ class GitAgent:
         self.logger.warning(f"Git root not found, using fallback: {fallback_dir}")
         return fallback_dir
 
+    @property
+    def git_backend(self):
+        """Local git backend (GIT_BACKEND) for the current project root, created on first use."""
+        backend = self._git_backend
+        if backend is None or backend.repo_dir != self.project_root_dir or self.config.git_backend not in ("auto", backend.name):
+            try:
+                self._git_backend = create_git_backend(self.config.git_backend, self.project_root_dir, logger=self.logger)
+            except GitBackendError as e:
+                raise GitAgentError(str(e))
+            self.logger.debug(f"Using {self._git_backend.name} git backend for {self.project_root_dir}")
+        return self._git_backend
+
     def _verify_git_environment(self):
         """Verify that the git environment is properly set up."""
         if not os.path.exists(os.path.join(self.project_root_dir, '.git')):
@@ -69,14 +81,15 @@ class GitAgent:
             return
         
         # Check git status
-        success, output, error = self._run_git_command(['status', '--porcelain'])
-        if success:
-            if output.strip():
-                self.logger.info("Git repository has uncommitted changes")
-            else:
-                self.logger.info("Git repository is clean")
+        try:
+            output = self.git_backend.status()
+        except (GitAgentError, GitBackendError) as e:
+            self.logger.warning(f"Could not check git status: {e}")
+            return
+        if output.strip():
+            self.logger.info("Git repository has uncommitted changes")
         else:
-            self.logger.warning(f"Could not check git status: {error}")
+            self.logger.info("Git repository is clean")
 
     def _create_agents_md_for_pr(self, module_path: str, topic: str) -> str:
         """Create an AGENTS.MD file specifically for PR review guidance."""
@@ -124,25 +137,20 @@ This PR should be approved if:
 
     def _run_git_command(self, command_parts: list[str], cwd: str = None) -> tuple[bool, str, str]:
         """Helper to run git commands directly."""
-        try:
-            process = subprocess.run(["git"] + command_parts, capture_output=True, text=True, check=False, cwd=cwd or self.project_root_dir)
-            if process.returncode == 0:
-                self.logger.debug(f"Git command '{' '.join(command_parts)}' successful. Output: {process.stdout.strip()}")
-                return True, process.stdout.strip(), ""
-            else:
-                self.logger.error(f"Git command '{' '.join(command_parts)}' failed. Error: {process.stderr.strip()}")
-                return False, process.stdout.strip(), process.stderr.strip()
-        except FileNotFoundError:
-            self.logger.error("Git command not found. Is Git installed and in PATH?")
-            return False, "", "Git command not found."
-        except Exception as e:
-            self.logger.error(f"Exception running git command '{' '.join(command_parts)}': {e}", exc_info=True)
-            return False, "", str(e)
+        return run_git_command(command_parts, cwd or self.project_root_dir, self.logger)
 
     def _slugify_topic(self, topic: str) -> str:
         """Converts a topic string into a URL-friendly slug."""
         return topic.lower().replace(" ", "-").replace("_", "-").replace(":", "").replace("'", "")
 
+    @staticmethod
+    def _format_workshop_number(workshop_number) -> str:
+        """Zero-pad numeric workshop numbers (the orchestrator passes them as strings)."""
+        try:
+            return f"{int(workshop_number):02d}"
+        except (TypeError, ValueError):
+            return str(workshop_number)
+
     def publish_module(self, module_path: str, topic: str, workshop_number: str) -> str:
         """
         Publishes the generated workshop module to GitHub following Codex best practices.
@@ -159,29 +167,119 @@ This PR should be approved if:
         self._create_agents_md_for_pr(module_path, topic)
 
         topic_slug = self._slugify_topic(topic)
-        branch_name = f"workshop-{workshop_number:02d}-{topic_slug}"
-        commit_message = f"feat: Add workshop {workshop_number:02d} - {topic}\n\nGenerated by AI Workshop Builder using Codex framework"
+        number_label = self._format_workshop_number(workshop_number)
+        branch_name = f"workshop-{number_label}-{topic_slug}"
+        commit_message = f"feat: Add workshop {number_label} - {topic}\n\nGenerated by AI Workshop Builder using Codex framework"
         
         # Create comprehensive PR description
-        pr_title = f"🎓 Workshop {workshop_number:02d}: {topic}"
+        pr_title = f"🎓 Workshop {number_label}: {topic}"
         pr_body = self._create_pr_description(topic, workshop_number, module_path)
 
+        return self._publish([module_path], branch_name, commit_message, pr_title, pr_body)
+
+    def publish_module_update(self, module_path: str, topic: str, workshop_number: str, changed_files: List[str]) -> str:
+        """
+        Publishes changes to an existing workshop module (from `cli.py --update`) on a
+        new `<module>-update-<timestamp>` branch with one commit and pull request.
+        Returns the URL of the created pull request.
+        """
+        module_name = os.path.basename(os.path.normpath(module_path))
+        self.logger.info(f"Publishing update of '{module_name}': {', '.join(changed_files)}")
+
+        number_label = self._format_workshop_number(workshop_number)
+        branch_name = f"{module_name}-update-{time.strftime('%Y%m%d-%H%M%S')}"
+        file_lines = "\n".join(f"- `{filename}`" for filename in changed_files)
+        commit_message = (
+            f"docs: Update workshop {number_label} - {topic}\n\n{file_lines}\n\n"
+            "Regenerated by AI Workshop Builder"
+        )
+        pr_title = f"📝 Workshop {number_label}: update {', '.join(changed_files)}"
+        try:
+            relative_path = self._repository_module_path(module_path)
+        except GitAgentError:
+            relative_path = os.path.relpath(module_path, self.project_root_dir)
+        pr_body = f"""## 📝 Workshop Update: {topic}
+
+This pull request regenerates part of **Workshop {number_label}: {topic}** (`{relative_path}`). The other sections are unchanged.
+
+### Changed files
+{file_lines}
+
+### 🔍 Review Guidelines
+Please check that the regenerated sections are accurate and consistent with the rest of the module.
+
+---
+*Generated automatically by the AI Workshop Builder system.*"""
+
+        return self._publish([module_path], branch_name, commit_message, pr_title, pr_body)
+
+    def publish_modules(self, modules: List[Tuple[str, str, str]]) -> str:
+        """
+        Publishes several generated workshop modules together: one branch, one commit,
+        one push and one pull request whose description combines each module's
+        description. `modules` holds (module_path, topic, workshop_number) tuples.
+        Returns the URL of the created pull request.
+        """
+        if not modules:
+            raise GitAgentError("No modules to publish.")
+        if len(modules) == 1:
+            return self.publish_module(*modules[0])
+
+        self.logger.info(f"Publishing {len(modules)} modules in one pull request.")
+        for module_path, topic, _ in modules:
+            self._create_agents_md_for_pr(module_path, topic)
+
+        number_labels = [self._format_workshop_number(number) for _, _, number in modules]
+        branch_name = f"workshops-{number_labels[0]}-to-{number_labels[-1]}"
+        module_lines = "\n".join(f"- Workshop {label}: {topic}" for label, (_, topic, _) in zip(number_labels, modules))
+        commit_message = (
+            f"feat: Add workshops {', '.join(number_labels)}\n\n{module_lines}\n\n"
+            "Generated by AI Workshop Builder using Codex framework"
+        )
+        pr_title = f"🎓 Workshops {', '.join(number_labels)}: {len(modules)} new workshops"
+        descriptions = [
+            self._create_pr_description(topic, number, module_path) for module_path, topic, number in modules
+        ]
+        pr_body = (
+            f"## 📚 {len(modules)} Workshop Modules\n\nThis pull request adds:\n{module_lines}\n\n---\n\n"
+            + "\n\n---\n\n".join(descriptions)
+        )
+
+        return self._publish([module_path for module_path, _, _ in modules], branch_name, commit_message, pr_title, pr_body)
+
+    def _publish(self, module_paths: List[str], branch_name: str, commit_message: str, pr_title: str, pr_body: str) -> str:
         self.logger.info(f"Branch name: {branch_name}")
         self.logger.info(f"Commit message: {commit_message}")
         self.logger.info(f"PR Title: {pr_title}")
 
         if not PYGITHUB_AVAILABLE:
-            return self._simulate_github_operations(branch_name, commit_message, module_path)
+            return self._simulate_github_operations(branch_name, commit_message, module_paths)
 
         try:
-            return self._execute_github_operations(branch_name, commit_message, pr_title, pr_body, module_path)
+            return self._execute_github_operations(branch_name, commit_message, pr_title, pr_body, module_paths)
         except Exception as e:
             self.logger.error(f"GitHub operations failed: {e}", exc_info=True)
             raise GitAgentError(f"Failed to publish module: {e}")
 
+    def _repository_module_path(self, module_path: str) -> str:
+        """Path of the module inside the GitHub repository (GITHUB_WORKSHOPS_PATH or the local checkout)."""
+        workshops_path = self.config.get_git_publish_config()["workshops_path"]
+        if workshops_path:
+            return posixpath.join(workshops_path, os.path.basename(os.path.normpath(module_path)))
+        relative_path = os.path.relpath(module_path, self.project_root_dir)
+        if relative_path.startswith(os.pardir):
+            raise GitAgentError(
+                f"Module path {module_path} is outside the git repository {self.project_root_dir}; "
+                "set GITHUB_WORKSHOPS_PATH to its directory in the repository"
+            )
+        return relative_path.replace(os.sep, "/")
+
     def _create_pr_description(self, topic: str, workshop_number: str, module_path: str) -> str:
         """Create a comprehensive PR description following professional standards."""
-        relative_path = os.path.relpath(module_path, self.project_root_dir)
+        try:
+            relative_path = self._repository_module_path(module_path)
+        except GitAgentError:
+            relative_path = os.path.relpath(module_path, self.project_root_dir)
         
         # Get file list from the module
         files_list = []
@@ -195,7 +293,7 @@ This PR should be approved if:
         pr_body = f"""## 📚 Workshop Module: {topic}
 
 ### Overview
-This pull request introduces **Workshop {workshop_number:02d}: {topic}**, a comprehensive educational module generated by the AI Workshop Builder using the OpenAI Codex framework.
+This pull request introduces **Workshop {self._format_workshop_number(workshop_number)}: {topic}**, a comprehensive educational module generated by the AI Workshop Builder using the OpenAI Codex framework.
 
 ### 🎯 Learning Objectives
 This workshop provides structured learning content designed to help users understand and apply concepts related to {topic}.
@@ -235,32 +333,64 @@ This workshop will be automatically integrated into the website framework under
 
         return pr_body
 
-    def _simulate_github_operations(self, branch_name: str, commit_message: str, module_path: str) -> str:
+    def _simulate_github_operations(self, branch_name: str, commit_message: str, module_paths: List[str]) -> str:
         """Simulate GitHub operations when PyGithub is not available."""
         self.logger.warning("PyGithub not available. Simulating GitHub operations.")
         
-        # Perform local git operations
-        self._run_git_command(["checkout", "-b", branch_name])
-        relative_module_path = os.path.relpath(module_path, self.project_root_dir)
-        self._run_git_command(["add", relative_module_path])
-        self._run_git_command(["commit", "-m", commit_message])
-        self._run_git_command(["push", "origin", branch_name, "--set-upstream"])
+        if self.config.git_publish_mode != "checkout":
+            # Commit on top of the current HEAD; failures are logged and the simulation carries on
+            try:
+                self._publish_from_worktree(None, branch_name, commit_message, module_paths)
+            except GitAgentError as e:
+                self.logger.error(str(e))
+            simulated_pr_url = f"https://github.com/{self.repo_full_name}/pull/new/{branch_name}"
+            self.logger.info(f"Simulated PR creation. Please open manually: {simulated_pr_url}")
+            return simulated_pr_url
+
+        # Perform local git operations; failures are logged and the simulation carries on
+        relative_module_paths = [os.path.relpath(module_path, self.project_root_dir) for module_path in module_paths]
+        steps = [
+            lambda backend: backend.switch_branch(branch_name),
+            *[lambda backend, path=path: backend.add(path) for path in relative_module_paths],
+            lambda backend: backend.commit(commit_message),
+            lambda backend: backend.push("origin", branch_name, set_upstream=True),
+        ]
+        for step in steps:
+            try:
+                step(self.git_backend)
+            except GitBackendError as e:
+                self.logger.error(str(e))
         
         simulated_pr_url = f"https://github.com/{self.repo_full_name}/pull/new/{branch_name}"
         self.logger.info(f"Simulated PR creation. Please open manually: {simulated_pr_url}")
         return simulated_pr_url
 
-    def _execute_github_operations(self, branch_name: str, commit_message: str, pr_title: str, pr_body: str, module_path: str) -> str:
+    def _get_github_repo(self):
+        """The GitHub repository, cached by the process-wide GitHub session (its default branch comes with it)."""
+        repo = get_github_session(self.config).repository(self.repo_full_name)
+        self.logger.debug(f"Using repository: {self.repo_full_name}")
+        return repo
+
+    def _get_available_labels(self, repo) -> frozenset:
+        """Names of the repository's labels, cached by the process-wide GitHub session."""
+        return get_github_session(self.config).label_names(repo)
+
+    def _execute_github_operations(self, branch_name: str, commit_message: str, pr_title: str, pr_body: str, module_paths: List[str]) -> str:
         """Execute actual GitHub operations using PyGithub."""
-        g = Github(self.config.github_token)
-        repo = g.get_repo(self.repo_full_name)
-        self.logger.info(f"Successfully connected to repository: {self.repo_full_name}")
+        repo = self._get_github_repo()
 
-        # Create new branch from default branch
-        self._create_remote_branch(repo, branch_name)
-        
-        # Perform local git operations
-        self._perform_local_git_operations(repo, branch_name, commit_message, module_path)
+        if self.config.git_publish_mode == "api":
+            # Commit the files and point the branch at the commit, all through the API
+            self._publish_via_api(repo, branch_name, commit_message, module_paths)
+        else:
+            # Create new branch from default branch
+            self._create_remote_branch(repo, branch_name)
+
+            # Perform local git operations
+            if self.config.git_publish_mode == "worktree":
+                self._publish_from_worktree(repo.default_branch, branch_name, commit_message, module_paths)
+            else:
+                self._perform_local_git_operations(repo, branch_name, commit_message, module_paths)
         
         # Create Pull Request
         pr = repo.create_pull(
@@ -273,7 +403,7 @@ This workshop will be automatically integrated into the website framework under
         # Add labels if available
         try:
             labels = ['workshop', 'ai-generated', 'content']
-            available_labels = [label.name for label in repo.get_labels()]
+            available_labels = self._get_available_labels(repo)
             valid_labels = [label for label in labels if label in available_labels]
             if valid_labels:
                 pr.add_to_labels(*valid_labels)
@@ -282,13 +412,18 @@ This workshop will be automatically integrated into the website framework under
         
         self.logger.info(f"Successfully created Pull Request: {pr.html_url}")
         
-        # Switch back to default branch
-        self._run_git_command(["checkout", repo.default_branch])
+        # Switch back to default branch (worktree and API publishing never left it)
+        if self.config.git_publish_mode == "checkout":
+            try:
+                self.git_backend.checkout(repo.default_branch)
+            except GitBackendError as e:
+                self.logger.warning(f"Could not switch back to {repo.default_branch}: {e}")
         
         return pr.html_url
 
     def _create_remote_branch(self, repo, branch_name: str):
         """Create a new branch on the remote repository."""
+        from github import GithubException
         try:
             source_branch = repo.get_branch(repo.default_branch)
             self.logger.debug(f"Creating branch {branch_name} from {repo.default_branch}")
@@ -300,44 +435,136 @@ This workshop will be automatically integrated into the website framework under
             else:
                 raise GitAgentError(f"GitHub API error creating branch: {e.data.get('message', str(e))}")
 
-    def _perform_local_git_operations(self, repo, branch_name: str, commit_message: str, module_path: str):
+    def _perform_local_git_operations(self, repo, branch_name: str, commit_message: str, module_paths: List[str]):
         """Perform local git operations to stage, commit, and push changes."""
+        git = self.git_backend
+
         # Ensure we're on the default branch and up to date
-        success, _, err = self._run_git_command(["checkout", repo.default_branch])
-        if not success:
-            raise GitAgentError(f"Failed to checkout default branch: {err}")
-        
-        success, _, err = self._run_git_command(["pull", "origin", repo.default_branch])
-        if not success:
-            self.logger.warning(f"Failed to pull default branch: {err}")
-        
-        # Create or switch to the feature branch
-        success, _, err = self._run_git_command(["checkout", "-B", branch_name])
-        if not success:
-            raise GitAgentError(f"Failed to checkout/create local branch {branch_name}: {err}")
-        
-        # Add files
-        relative_module_path = os.path.relpath(module_path, self.project_root_dir)
-        self.logger.debug(f"Adding path to git: {relative_module_path}")
-        success, _, err = self._run_git_command(["add", relative_module_path])
-        if not success:
-            raise GitAgentError(f"Failed to git add {relative_module_path}: {err}")
-        
-        # Commit
-        success, _, err = self._run_git_command(["commit", "-m", commit_message])
-        if not success:
-            if "nothing to commit" in err.lower():
+        try:
+            git.checkout(repo.default_branch)
+        except GitBackendError as e:
+            raise GitAgentError(f"Failed to checkout default branch: {e}")
+        
+        try:
+            git.pull("origin", repo.default_branch)
+        except GitBackendError as e:
+            self.logger.warning(f"Failed to pull default branch: {e}")
+        
+        try:
+            # Create or switch to the feature branch
+            git.switch_branch(branch_name, reset=True)
+        
+            # Add files
+            for module_path in module_paths:
+                relative_module_path = os.path.relpath(module_path, self.project_root_dir)
+                self.logger.debug(f"Adding path to git: {relative_module_path}")
+                git.add(relative_module_path)
+        
+            # Commit
+            if not git.commit(commit_message):
                 self.logger.warning(f"No changes to commit for branch {branch_name}")
-            else:
-                raise GitAgentError(f"Failed to git commit: {err}")
         
-        # Push
-        success, _, err = self._run_git_command(["push", "origin", branch_name, "--force-with-lease"])
-        if not success:
-            raise GitAgentError(f"Failed to git push branch {branch_name}: {err}")
+            # Push
+            git.push("origin", branch_name, force_with_lease=True)
+        except GitBackendError as e:
+            raise GitAgentError(str(e))
         
         self.logger.info(f"Successfully pushed branch '{branch_name}' to remote.")
 
+    def _publish_from_worktree(self, default_branch: Optional[str], branch_name: str, commit_message: str, module_paths: List[str]):
+        """
+        Commit the modules in a temporary git worktree and push them to `branch_name`.
+
+        The worktree starts at the freshly fetched `origin/<default_branch>` (or at HEAD
+        when `default_branch` is None) and, with GIT_WORKTREE_SPARSE, checks out only the
+        modules' directories. The modules are copied in, committed on a detached HEAD and
+        pushed, so the main checkout's branch, index and working tree are left alone and
+        several publishes can run at the same time.
+        """
+        relative_module_paths = []
+        for module_path in module_paths:
+            relative_module_path = os.path.relpath(module_path, self.project_root_dir)
+            if relative_module_path.startswith(os.pardir):
+                raise GitAgentError(f"Module path {module_path} is outside the git repository {self.project_root_dir}")
+            relative_module_paths.append(relative_module_path)
+        described_paths = ", ".join(relative_module_paths)
+
+        git = self.git_backend
+        base = "HEAD"
+        if default_branch:
+            try:
+                git.fetch("origin", default_branch)
+            except GitBackendError as e:
+                self.logger.warning(f"Failed to fetch default branch: {e}")
+            remote_ref = f"refs/remotes/origin/{default_branch}"
+            base = remote_ref if git.has_commit(remote_ref) else default_branch
+
+        publish_config = self.config.get_git_publish_config()
+        sparse_paths = relative_module_paths if publish_config["worktree_sparse"] else None
+        try:
+            with temporary_worktree(git, base, sparse_paths, publish_config["worktree_dir"], logger=self.logger) as worktree:
+                self.logger.debug(f"Publishing {described_paths} from worktree {worktree.repo_dir} at {base}")
+                for module_path, relative_module_path in zip(module_paths, relative_module_paths):
+                    shutil.copytree(module_path, os.path.join(worktree.repo_dir, relative_module_path), dirs_exist_ok=True)
+                    worktree.add(relative_module_path)
+                if not worktree.commit(commit_message):
+                    self.logger.warning(f"No changes to commit for branch {branch_name}")
+                worktree.push("origin", branch_name, force_with_lease=True, source="HEAD")
+        except (GitBackendError, OSError) as e:
+            raise GitAgentError(f"Failed to publish {described_paths} from a worktree: {e}")
+
+        self.logger.info(f"Successfully pushed branch '{branch_name}' to remote.")
+
+    def _publish_via_api(self, repo, branch_name: str, commit_message: str, module_paths: List[str]):
+        """
+        Commit the files under `module_paths` on top of the default branch with the GitHub
+        Git Data API and point `branch_name` at the commit; no local clone is used.
+
+        UTF-8 files are sent inline in the tree request; other files are uploaded as
+        base64 blobs first. Like the local publish modes, an existing branch is reset to
+        the new commit.
+        """
+        from github import GithubException, InputGitTreeElement
+
+        base_sha = repo.get_branch(repo.default_branch).commit.sha
+        base_commit = repo.get_git_commit(base_sha)
+
+        elements = []
+        for module_path in module_paths:
+            repository_path = self._repository_module_path(module_path)
+            for root, dirs, files in os.walk(module_path):
+                dirs.sort()
+                for file_name in sorted(files):
+                    file_path = os.path.join(root, file_name)
+                    relative_file = os.path.relpath(file_path, module_path).replace(os.sep, "/")
+                    path = posixpath.join(repository_path, relative_file)
+                    mode = "100755" if os.access(file_path, os.X_OK) else "100644"
+                    with open(file_path, "rb") as f:
+                        data = f.read()
+                    try:
+                        elements.append(InputGitTreeElement(path, mode, "blob", content=data.decode("utf-8")))
+                    except UnicodeDecodeError:
+                        blob = repo.create_git_blob(base64.b64encode(data).decode("ascii"), "base64")
+                        elements.append(InputGitTreeElement(path, mode, "blob", sha=blob.sha))
+        if not elements:
+            raise GitAgentError(f"No files to publish in {', '.join(module_paths)}")
+
+        tree = repo.create_git_tree(elements, base_commit.tree)
+        if tree.sha == base_commit.tree.sha:
+            self.logger.warning(f"No changes to commit for branch {branch_name}")
+            commit_sha = base_sha
+        else:
+            commit_sha = repo.create_git_commit(commit_message, tree, [base_commit]).sha
+
+        try:
+            repo.create_git_ref(ref=f"refs/heads/{branch_name}", sha=commit_sha)
+        except GithubException as e:
+            if e.status != 422:  # 422: the branch already exists
+                raise GitAgentError(f"GitHub API error creating branch: {e.data.get('message', str(e))}")
+            self.logger.warning(f"Branch '{branch_name}' already exists on remote. Resetting it to the new commit.")
+            repo.get_git_ref(f"heads/{branch_name}").edit(commit_sha, force=True)
+
+        self.logger.info(f"Committed {len(elements)} files to branch '{branch_name}' through the GitHub API.")
 
 if __name__ == '__main__':
     print("Testing GitAgent (requires .env file in workshop-builder directory and a test repo setup)")
@@ -0,0 +1,232 @@
+import importlib.util
+import logging
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+from contextlib import contextmanager
+from typing import Iterator, List, Optional, Tuple
+
+from ..orchestrator.tracing import get_tracer, text_bytes
+
+# gitpython is imported lazily by GitPythonBackend; only check that it is installed
+GITPYTHON_AVAILABLE = importlib.util.find_spec("git") is not None
+
+# Fetches and worktree additions and removals update refs and worktree records shared by
+# the whole repository; concurrent publishes in one process take turns for these steps
+_repository_lock = threading.Lock()
+
+
+class GitBackendError(Exception):
+    """Custom exception for local git operation errors."""
+    pass
+
+
+def run_git_command(command_parts: list, cwd: str, logger: logging.Logger) -> Tuple[bool, str, str]:
+    """Run `git <command_parts>` in `cwd` and return (success, stdout, stderr)."""
+    try:
+        with get_tracer().span(f"git.{command_parts[0]}", args=" ".join(command_parts), retries=0) as span:
+            process = subprocess.run(["git"] + command_parts, capture_output=True, text=True, check=False, cwd=cwd)
+            span.set(returncode=process.returncode, bytes_out=text_bytes(process.stdout) + text_bytes(process.stderr))
+        if process.returncode == 0:
+            logger.debug(f"Git command '{' '.join(command_parts)}' successful. Output: {process.stdout.strip()}")
+            return True, process.stdout.strip(), ""
+        else:
+            logger.error(f"Git command '{' '.join(command_parts)}' failed. Error: {process.stderr.strip()}")
+            return False, process.stdout.strip(), process.stderr.strip()
+    except FileNotFoundError:
+        logger.error("Git command not found. Is Git installed and in PATH?")
+        return False, "", "Git command not found."
+    except Exception as e:
+        logger.error(f"Exception running git command '{' '.join(command_parts)}': {e}", exc_info=True)
+        return False, "", str(e)
+
+
+class SubprocessGitBackend:
+    """Local git operations through one `git` process per command."""
+
+    name = "subprocess"
+
+    def __init__(self, repo_dir: str, logger: Optional[logging.Logger] = None):
+        self.repo_dir = repo_dir
+        self.logger = logger or logging.getLogger(__name__)
+
+    def _run(self, command_parts: list, action: str) -> str:
+        success, output, error = run_git_command(command_parts, self.repo_dir, self.logger)
+        if not success:
+            raise GitBackendError(f"Failed to {action}: {error}")
+        return output
+
+    def status(self) -> str:
+        """Porcelain status of the working tree (empty when clean)."""
+        return self._run(["status", "--porcelain"], "check git status")
+
+    def checkout(self, branch: str):
+        self._run(["checkout", branch], f"checkout {branch}")
+
+    def pull(self, remote: str, branch: str):
+        self._run(["pull", remote, branch], f"pull {branch}")
+
+    def fetch(self, remote: str, branch: str):
+        with _repository_lock:
+            self._run(["fetch", remote, branch], f"fetch {branch}")
+
+    def has_commit(self, ref: str) -> bool:
+        success, _, _ = run_git_command(["rev-parse", "--verify", "--quiet", f"{ref}^{{commit}}"], self.repo_dir, self.logger)
+        return success
+
+    def switch_branch(self, branch: str, reset: bool = False):
+        """Create `branch` at HEAD and switch to it; with `reset`, an existing branch is moved to HEAD."""
+        self._run(["checkout", "-B" if reset else "-b", branch], f"create branch {branch}")
+
+    def add(self, path: str):
+        self._run(["add", path], f"git add {path}")
+
+    def commit(self, message: str) -> bool:
+        """Commit the index; returns False when there is nothing to commit."""
+        success, output, error = run_git_command(["commit", "-m", message], self.repo_dir, self.logger)
+        if success:
+            return True
+        if "nothing to commit" in (error + output).lower():
+            return False
+        raise GitBackendError(f"Failed to git commit: {error}")
+
+    def push(self, remote: str, branch: str, force_with_lease: bool = False, set_upstream: bool = False,
+             source: Optional[str] = None):
+        """Push `branch`, or the commit `source` (e.g. a detached HEAD) to the remote `branch`."""
+        command = ["push", remote, f"{source}:refs/heads/{branch}" if source else branch]
+        if force_with_lease:
+            command.append("--force-with-lease")
+        if set_upstream:
+            command.append("--set-upstream")
+        self._run(command, f"git push branch {branch}")
+
+    def add_worktree(self, path: str, commit: str, checkout: bool = True):
+        """Add a linked worktree at `path` with a detached HEAD at `commit`."""
+        command = ["worktree", "add", "--detach"] + ([] if checkout else ["--no-checkout"]) + [path, commit]
+        with _repository_lock:
+            self._run(command, f"add worktree at {path}")
+
+    def remove_worktree(self, path: str):
+        with _repository_lock:
+            success, _, _ = run_git_command(["worktree", "remove", "--force", path], self.repo_dir, self.logger)
+            if not success:
+                # Fall back to deleting the directory and pruning git's record of it
+                shutil.rmtree(path, ignore_errors=True)
+                run_git_command(["worktree", "prune"], self.repo_dir, self.logger)
+
+    def sparse_checkout(self, paths: List[str]):
+        """Restrict this (unpopulated) worktree to `paths` and check out HEAD."""
+        self._run(["sparse-checkout", "set", "--cone"] + list(paths), "set sparse checkout paths")
+        self._run(["checkout", "--quiet", "--detach"], "check out sparse worktree")
+
+
+class GitPythonBackend(SubprocessGitBackend):
+    """
+    Local git operations through one long-lived gitpython `Repo`.
+
+    Only branch handling runs in-process: the feature branch is created or reset by
+    writing its ref and pointing HEAD at it, and checkout is skipped when HEAD is
+    already on the requested branch, so neither spawns `git` or rescans the working
+    tree. Everything else is inherited from the subprocess backend and runs one `git`
+    process per call, exactly as there:
+
+    - `status`: gitpython's `is_dirty(untracked_files=True)` runs three git commands
+      itself, so it would cost more processes, not fewer.
+    - `add` and `commit`: gitpython's pure-Python index reads and tree writes cover
+      the whole repository, which made a publish about ten times slower than
+      `git add` + `git commit` with 1000 workshop modules. Git also applies
+      .gitignore rules, hooks and clean filters (such as Git LFS) that gitpython skips.
+    - `pull`, `fetch` and `push`: gitpython runs `git` for these too.
+    """
+
+    name = "gitpython"
+
+    def __init__(self, repo_dir: str, logger: Optional[logging.Logger] = None):
+        super().__init__(repo_dir, logger)
+        import git
+        self._git = git
+        try:
+            self.repo = git.Repo(repo_dir)
+        except (git.InvalidGitRepositoryError, git.NoSuchPathError) as e:
+            raise GitBackendError(f"Not a git repository: {repo_dir} ({e})")
+
+    @contextmanager
+    def _operation(self, name: str, action: str):
+        """Trace an in-process operation and report gitpython failures as GitBackendError."""
+        with get_tracer().span(f"git.{name}", backend=self.name, retries=0):
+            try:
+                yield
+            except (self._git.GitError, OSError, ValueError) as e:
+                raise GitBackendError(f"Failed to {action}: {e}") from e
+
+    def _active_branch(self) -> Optional[str]:
+        if self.repo.head.is_detached:
+            return None
+        return self.repo.head.reference.name
+
+    def checkout(self, branch: str):
+        if self._active_branch() == branch:
+            self.logger.debug(f"Already on branch {branch}; skipping checkout")
+            return
+        super().checkout(branch)
+
+    def switch_branch(self, branch: str, reset: bool = False):
+        # The branch starts at HEAD's commit, so the working tree and index are already correct
+        with self._operation("switch_branch", f"create branch {branch}"):
+            if not reset and branch in self.repo.heads:
+                raise GitBackendError(f"Failed to create branch {branch}: it already exists")
+            if self._active_branch() == branch:
+                return
+            head = self.repo.create_head(branch, self.repo.head.commit, force=reset)
+            self.repo.head.reference = head
+
+
+@contextmanager
+def temporary_worktree(backend: SubprocessGitBackend, commit: str, sparse_paths: Optional[List[str]] = None,
+                       parent_dir: Optional[str] = None, logger: Optional[logging.Logger] = None) -> Iterator[SubprocessGitBackend]:
+    """
+    Check out `commit` in a temporary linked worktree of `backend`'s repository and
+    yield a backend for it; the worktree is removed on exit. With `sparse_paths`, only
+    those directories (and the files directly in their parents) are checked out.
+    The main checkout's branch, index and working tree are never touched.
+    """
+    if parent_dir:
+        os.makedirs(parent_dir, exist_ok=True)
+    path = tempfile.mkdtemp(prefix="workshop-publish-", dir=parent_dir)
+    try:
+        backend.add_worktree(path, commit, checkout=not sparse_paths)
+    except GitBackendError:
+        shutil.rmtree(path, ignore_errors=True)
+        raise
+    try:
+        # Staging, committing and pushing all run git, so the worktree needs no gitpython Repo
+        worktree = SubprocessGitBackend(path, logger or backend.logger)
+        if sparse_paths:
+            worktree.sparse_checkout(sparse_paths)
+        yield worktree
+    finally:
+        backend.remove_worktree(path)
+
+
+def create_git_backend(name: str, repo_dir: str, logger: Optional[logging.Logger] = None):
+    """
+    Create the local git backend called `name`: "gitpython", "subprocess", or "auto"
+    (gitpython when it is installed and `repo_dir` is a repository, otherwise subprocess).
+    """
+    logger = logger or logging.getLogger(__name__)
+    if name == "subprocess":
+        return SubprocessGitBackend(repo_dir, logger)
+    if name == "gitpython":
+        if not GITPYTHON_AVAILABLE:
+            raise GitBackendError("GIT_BACKEND=gitpython requires the gitpython package")
+        return GitPythonBackend(repo_dir, logger)
+    if name == "auto":
+        if GITPYTHON_AVAILABLE:
+            try:
+                return GitPythonBackend(repo_dir, logger)
+            except GitBackendError as e:
+                logger.debug(f"gitpython backend unavailable, using git subprocesses: {e}")
+        return SubprocessGitBackend(repo_dir, logger)
+    raise GitBackendError(f"Unknown git backend '{name}': expected 'auto', 'gitpython' or 'subprocess'")
@@ -0,0 +1,378 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, Iterator, List, Optional, Union
+
+# Handle both relative and absolute imports for flexibility
+try:
+    from ..orchestrator.config import AppConfig
+    from ..orchestrator.clients import get_gemini_model, get_openai_client
+    from ..orchestrator.tracing import BYTES_PER_TOKEN, get_tracer, text_bytes
+except ImportError:
+    import sys
+    sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+    from orchestrator.config import AppConfig
+    from orchestrator.clients import get_gemini_model, get_openai_client
+    from orchestrator.tracing import BYTES_PER_TOKEN, get_tracer, text_bytes
+
+# Streams yield text deltas, then a final (None, finish_reason) marker
+StreamItem = Union[str, tuple]
+
+
+def _record_usage(tokens_in: Optional[int], tokens_out: Optional[int]):
+    """Attach provider-reported token usage to the current trace span."""
+    if tokens_in is not None and tokens_out is not None:
+        get_tracer().current_span().set(tokens_in=tokens_in, tokens_out=tokens_out)
+
+
+class LLMBackendError(Exception):
+    """Custom exception for LLM backend errors."""
+    pass
+
+
+class LLMBackend(ABC):
+    """
+    Interface shared by every model provider used by the agents.
+
+    - `generate_text(prompt)`: a single prompt in, text out (research queries)
+    - `chat_completion(messages, ...)`: chat messages in, the full response text out
+    - `stream_chat_completion(messages, ...)`: the same, yielding text deltas as they
+      arrive, followed by a `(None, finish_reason)` marker
+
+    Subclasses must implement `generate_text` and `chat_completion`; the default
+    `stream_chat_completion` delivers the whole response as one delta.
+    """
+
+    name = "base"
+    model_name = ""
+    # Whether the provider charges max_tokens against the tokens-per-minute limit up front
+    reserves_max_tokens = False
+
+    def rate_limit_tokens(self, input_text: str, max_tokens: int) -> int:
+        """Tokens a request counts against the provider's tokens-per-minute limit (input is estimated)."""
+        return text_bytes(input_text) // BYTES_PER_TOKEN + (max_tokens if self.reserves_max_tokens else 0)
+
+    @abstractmethod
+    def generate_text(self, prompt: str) -> str:
+        """Return the model's response to a single prompt."""
+
+    @abstractmethod
+    def chat_completion(self, messages: List[Dict[str, str]], max_tokens: int, temperature: float, json_mode: bool = False) -> str:
+        """Return the full response text for chat `messages`."""
+
+    def stream_chat_completion(self, messages: List[Dict[str, str]], max_tokens: int, temperature: float,
+                               json_mode: bool = False) -> Iterator[StreamItem]:
+        # Providers without native streaming deliver the whole response as one delta
+        yield self.chat_completion(messages, max_tokens, temperature, json_mode)
+        yield (None, "stop")
+
+
+class OpenAIBackend(LLMBackend):
+    """OpenAI Chat Completions, through the shared client factory."""
+
+    name = "openai"
+    reserves_max_tokens = True
+
+    def __init__(self, config: AppConfig):
+        if not config.openai_api_key:
+            raise LLMBackendError("OpenAI API key missing.")
+        self.config = config
+        self.model_name = config.openai_model
+        self._client = None
+
+    @property
+    def client(self):
+        if self._client is None:
+            self._client = get_openai_client(self.config)
+        return self._client
+
+    @client.setter
+    def client(self, client):
+        self._client = client
+
+    def _request(self, messages, max_tokens, temperature, json_mode, **extra) -> dict:
+        request = {
+            "model": self.model_name,
+            "messages": messages,
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+            "timeout": self.config.llm_request_timeout_seconds,
+            **extra
+        }
+        if json_mode:
+            request["response_format"] = {"type": "json_object"}  # Ensure JSON response
+        return request
+
+    def generate_text(self, prompt: str) -> str:
+        return self.chat_completion([{"role": "user", "content": prompt}], self.config.openai_max_tokens, self.config.openai_temperature)
+
+    def chat_completion(self, messages, max_tokens, temperature, json_mode=False) -> str:
+        response = self.client.chat.completions.create(**self._request(messages, max_tokens, temperature, json_mode))
+        usage = getattr(response, "usage", None)
+        if usage:
+            _record_usage(usage.prompt_tokens, usage.completion_tokens)
+        return response.choices[0].message.content or ""
+
+    def stream_chat_completion(self, messages, max_tokens, temperature, json_mode=False) -> Iterator[StreamItem]:
+        stream = self.client.chat.completions.create(**self._request(
+            messages, max_tokens, temperature, json_mode, stream=True, stream_options={"include_usage": True}
+        ))
+        finish_reason = None
+        for chunk in stream:
+            if not chunk.choices:
+                # With include_usage, the last chunk carries token usage and no choices
+                usage = getattr(chunk, "usage", None)
+                if usage:
+                    _record_usage(usage.prompt_tokens, usage.completion_tokens)
+                continue
+            choice = chunk.choices[0]
+            finish_reason = choice.finish_reason or finish_reason
+            if choice.delta and choice.delta.content:
+                yield choice.delta.content
+        yield (None, finish_reason)
+
+
+class GeminiBackend(LLMBackend):
+    """Google Gemini, through the shared client factory."""
+
+    name = "gemini"
+
+    def __init__(self, config: AppConfig):
+        if not config.gemini_api_key:
+            raise LLMBackendError("Gemini API key missing.")
+        self.config = config
+        self.model_name = config.gemini_model
+        self._model = None
+
+    @property
+    def model(self):
+        if self._model is None:
+            self._model = get_gemini_model(self.config, self.model_name)
+        return self._model
+
+    @model.setter
+    def model(self, model):
+        self._model = model
+
+    @staticmethod
+    def _messages_to_prompt(messages: List[Dict[str, str]]) -> str:
+        return "\n\n".join(message["content"] for message in messages)
+
+    @staticmethod
+    def _generation_config(max_tokens: int, temperature: float, json_mode: bool) -> dict:
+        generation_config = {"max_output_tokens": max_tokens, "temperature": temperature}
+        if json_mode:
+            generation_config["response_mime_type"] = "application/json"
+        return generation_config
+
+    @staticmethod
+    def _record_response_usage(response):
+        usage = getattr(response, "usage_metadata", None)
+        if usage:
+            _record_usage(getattr(usage, "prompt_token_count", None), getattr(usage, "candidates_token_count", None))
+
+    def _request_options(self) -> dict:
+        return {"timeout": self.config.llm_request_timeout_seconds}
+
+    def generate_text(self, prompt: str) -> str:
+        response = self.model.generate_content(prompt, request_options=self._request_options())
+        self._record_response_usage(response)
+        return response.text
+
+    def chat_completion(self, messages, max_tokens, temperature, json_mode=False) -> str:
+        response = self.model.generate_content(
+            self._messages_to_prompt(messages),
+            generation_config=self._generation_config(max_tokens, temperature, json_mode),
+            request_options=self._request_options()
+        )
+        self._record_response_usage(response)
+        return response.text or ""
+
+    def stream_chat_completion(self, messages, max_tokens, temperature, json_mode=False) -> Iterator[StreamItem]:
+        response = self.model.generate_content(
+            self._messages_to_prompt(messages),
+            generation_config=self._generation_config(max_tokens, temperature, json_mode),
+            request_options=self._request_options(),
+            stream=True
+        )
+        for chunk in response:
+            if chunk.text:
+                yield chunk.text
+        # The aggregated streaming response carries the final usage counts
+        self._record_response_usage(response)
+        yield (None, "stop")
+
+
+class StubBackend(LLMBackend):
+    """
+    Deterministic local backend for offline runs and benchmarks.
+
+    Responses are read from `responses_dir` when a canned file exists for the request
+    kind (`research.txt`, `compile.json`, `outline.json`, `section.md`), and are
+    otherwise generated from templates seeded by a hash of the prompt, so the same
+    request always gets the same response. Provider behaviour is simulated with a
+    fixed `latency_seconds` before the first token and, when `tokens_per_second` is
+    set, a delay proportional to the response length (about 4 characters per token).
+    """
+
+    name = "stub"
+    MODEL_NAME = "stub"
+    STREAM_CHUNK_CHARS = 64
+
+    def __init__(self, latency_seconds: float = 0.0, tokens_per_second: float = 0.0,
+                 response_chars: int = 4000, responses_dir: Optional[str] = None,
+                 logger: Optional[logging.Logger] = None):
+        self.model_name = self.MODEL_NAME
+        self.latency_seconds = latency_seconds
+        self.tokens_per_second = tokens_per_second
+        self.response_chars = response_chars
+        self.responses_dir = responses_dir
+        self.logger = logger or logging.getLogger(__name__)
+
+    def _canned(self, kind: str) -> Optional[str]:
+        if not self.responses_dir:
+            return None
+        path = os.path.join(self.responses_dir, kind)
+        if not os.path.exists(path):
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            return f.read()
+
+    def _generation_seconds(self, text: str) -> float:
+        if not self.tokens_per_second:
+            return 0.0
+        return (len(text) / 4) / self.tokens_per_second
+
+    def _body(self, seed: str, subject: str, chars: int) -> str:
+        """Deterministic filler paragraphs about `subject`, about `chars` characters long."""
+        digest = hashlib.sha256(seed.encode("utf-8")).hexdigest()
+        paragraphs = []
+        length = 0
+        index = 0
+        while length < chars:
+            token = digest[(index * 8) % 56:(index * 8) % 56 + 8]
+            paragraph = (
+                f"Point {index + 1} [{token}]: {subject} is examined here through its core ideas, "
+                f"a worked example and the trade-offs practitioners report. "
+                f"This paragraph is generated by the stub backend and is stable for a given prompt."
+            )
+            paragraphs.append(paragraph)
+            length += len(paragraph) + 2
+            index += 1
+        return "\n\n".join(paragraphs)
+
+    @staticmethod
+    def _quoted(text: str, default: str) -> str:
+        match = re.search(r'"([^"\n]{1,200})"', text)
+        return match.group(1) if match else default
+
+    def _research_response(self, prompt: str) -> str:
+        canned = self._canned("research.txt")
+        if canned is not None:
+            return canned
+        subject = prompt.strip().splitlines()[0].strip() if prompt.strip() else "the topic"
+        bullets = [line.strip()[2:] for line in prompt.splitlines() if line.strip().startswith("- ")]
+        sections = [f"## {bullet}\n\n{self._body(prompt + bullet, bullet, self.response_chars // max(1, len(bullets)))}" for bullet in bullets]
+        return f"# {subject}\n\n" + ("\n\n".join(sections) if sections else self._body(prompt, subject, self.response_chars))
+
+    def _outline_response(self, messages: List[Dict[str, str]]) -> str:
+        canned = self._canned("outline.json")
+        if canned is not None:
+            return canned
+        topic = self._quoted(messages[-1]["content"], "Workshop")
+        titles = ["Introduction", "Core Concepts", "Hands-on Practice", "Advanced Topics"]
+        return json.dumps({
+            "title": topic,
+            "description": f"A hands-on workshop on {topic}.",
+            "difficulty": "intermediate",
+            "duration": "2 hours",
+            "prerequisites": ["Basic programming experience"],
+            "learning_objectives": [f"Understand {topic}", f"Apply {topic} in practice"],
+            "tags": ["stub"],
+            "sections": [
+                {
+                    "filename": f"{i:02d}_{title.lower().replace(' ', '_').replace('-', '_')}.md",
+                    "title": title,
+                    "summary": f"{title} of {topic}.",
+                    "key_points": [f"{title} key point {n}" for n in range(1, 4)]
+                }
+                for i, title in enumerate(titles)
+            ]
+        })
+
+    def _section_response(self, messages: List[Dict[str, str]]) -> str:
+        canned = self._canned("section.md")
+        if canned is not None:
+            return canned
+        user_message = messages[-1]["content"]
+        title_match = re.search(r'titled "([^"]+)"', user_message)
+        title = title_match.group(1) if title_match else "Section"
+        return f"# {title}\n\n{self._body(user_message, title, self.response_chars)}\n"
+
+    def _compile_response(self, messages: List[Dict[str, str]]) -> str:
+        canned = self._canned("compile.json")
+        if canned is not None:
+            return canned
+        user_message = messages[-1]["content"]
+        topic = self._quoted(user_message, "Workshop")
+        section_titles = ["Introduction", "Core Concepts", "Hands-on Practice"]
+        files = {}
+        for i, title in enumerate(section_titles):
+            filename = f"{i:02d}_{title.lower().replace(' ', '_').replace('-', '_')}.md"
+            files[filename] = f"# {title}\n\n{self._body(user_message + title, f'{title} of {topic}', self.response_chars // len(section_titles))}\n"
+        return json.dumps({"files": files})
+
+    def _respond(self, messages: List[Dict[str, str]], json_mode: bool) -> str:
+        if not json_mode:
+            return self._section_response(messages)
+        if '"sections"' in messages[0]["content"]:
+            return self._outline_response(messages)
+        return self._compile_response(messages)
+
+    def generate_text(self, prompt: str) -> str:
+        text = self._research_response(prompt)
+        time.sleep(self.latency_seconds + self._generation_seconds(text))
+        return text
+
+    def chat_completion(self, messages, max_tokens, temperature, json_mode=False) -> str:
+        text = self._respond(messages, json_mode)
+        time.sleep(self.latency_seconds + self._generation_seconds(text))
+        return text
+
+    def stream_chat_completion(self, messages, max_tokens, temperature, json_mode=False) -> Iterator[StreamItem]:
+        text = self._respond(messages, json_mode)
+        time.sleep(self.latency_seconds)
+        for start in range(0, len(text), self.STREAM_CHUNK_CHARS):
+            chunk = text[start:start + self.STREAM_CHUNK_CHARS]
+            delay = self._generation_seconds(chunk)
+            if delay:
+                time.sleep(delay)
+            yield chunk
+        yield (None, "stop")
+
+
+def backend_model_name(name: str, config: AppConfig) -> str:
+    """Model name that backend `name` reports (and that cache keys use), without creating the backend."""
+    return {"openai": config.openai_model, "gemini": config.gemini_model}.get(name, StubBackend.MODEL_NAME)
+
+
+def create_backend(name: str, config: AppConfig, logger: Optional[logging.Logger] = None) -> LLMBackend:
+    """Create the backend called `name` ("gemini", "openai" or "stub")."""
+    if name == "openai":
+        return OpenAIBackend(config)
+    if name == "gemini":
+        return GeminiBackend(config)
+    if name == "stub":
+        stub_config = config.get_stub_backend_config()
+        return StubBackend(
+            latency_seconds=stub_config["latency_seconds"],
+            tokens_per_second=stub_config["tokens_per_second"],
+            response_chars=stub_config["response_chars"],
+            responses_dir=stub_config["responses_dir"],
+            logger=logger
+        )
+    raise LLMBackendError(f"Unknown LLM backend '{name}': expected 'gemini', 'openai' or 'stub'")
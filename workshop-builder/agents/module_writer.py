@@ -0,0 +1,166 @@
+import hashlib
+import logging
+import os
+import shutil
+import tempfile
+import time
+from typing import List, Optional
+
+STAGING_DIR_NAME = ".workshop-staging"
+# Staging directories left behind by crashed runs are removed after this long
+STALE_STAGING_SECONDS = 24 * 3600
+
+
+class ModuleWriterError(Exception):
+    """Custom exception for module writer errors."""
+    pass
+
+
+def _fsync_path(path: str):
+    """Flush a file or directory to disk (directories are skipped where they cannot be opened, e.g. Windows)."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except (IsADirectoryError, PermissionError):
+        return
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _file_sha256(path: str) -> Optional[str]:
+    try:
+        with open(path, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except FileNotFoundError:
+        return None
+
+
+def remove_stale_staging(workshops_base_dir: str, max_age_seconds: float = STALE_STAGING_SECONDS) -> int:
+    """Remove staging directories older than `max_age_seconds` (left by crashed runs); returns how many."""
+    staging_root = os.path.join(workshops_base_dir, STAGING_DIR_NAME)
+    removed = 0
+    try:
+        entries = list(os.scandir(staging_root))
+    except FileNotFoundError:
+        return 0
+    cutoff = time.time() - max_age_seconds
+    for entry in entries:
+        try:
+            if entry.is_dir(follow_symlinks=False) and entry.stat(follow_symlinks=False).st_mtime < cutoff:
+                shutil.rmtree(entry.path)
+                removed += 1
+        except OSError:
+            continue
+    return removed
+
+
+class StagedModule:
+    """
+    Collects the files of a workshop module in a staging directory and publishes them together.
+
+    Files are written to `<workshops_base_dir>/.workshop-staging/<tmp>/<module name>/`,
+    a hidden directory on the same filesystem that the website build skips, so the
+    staged copy has the module's own directory name. Writing the same content to a
+    file twice is skipped by comparing SHA-256 digests, and nothing is fsynced until
+    `publish`, which flushes every staged file once and then:
+
+    - moves the staged directory to `module_path` with a single `rename` when the
+      module does not exist yet (or is an empty directory), so the module appears
+      complete or not at all;
+    - with `update=True` (regenerating sections of an existing module), replaces
+      only the files whose content differs from the module's with `os.replace`,
+      each atomically, and leaves identical files untouched;
+    - otherwise raises ModuleWriterError: a new module is never merged into a
+      directory that already has files in it.
+
+    When the module is not published (the compilation failed), `discard` removes
+    the staged files and the live module is never changed.
+    """
+
+    def __init__(self, module_path: str, fsync: bool = True, update: bool = False, logger: Optional[logging.Logger] = None):
+        self.module_path = os.path.abspath(module_path)
+        self.fsync = fsync
+        self.update = update
+        self.logger = logger or logging.getLogger(__name__)
+        staging_root = os.path.join(os.path.dirname(self.module_path), STAGING_DIR_NAME)
+        try:
+            os.makedirs(staging_root, exist_ok=True)
+            self._staging_dir = tempfile.mkdtemp(prefix=f"{os.path.basename(self.module_path)}-", dir=staging_root)
+            self.path = os.path.join(self._staging_dir, os.path.basename(self.module_path))
+            os.mkdir(self.path)
+        except OSError as e:
+            raise ModuleWriterError(f"Could not create a staging directory for {self.module_path}: {e}")
+        self._digests = {}  # file name -> SHA-256 of the staged content
+        self.published = False
+
+    def write(self, filename: str, content: str) -> str:
+        """Stage one file (a plain file name inside the module); identical rewrites are skipped."""
+        name = os.path.basename(filename)
+        data = content.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        file_path = os.path.join(self.path, name)
+        if self._digests.get(name) == digest:
+            self.logger.debug(f"Skipping unchanged write of {name}")
+            return file_path
+        with open(file_path, "wb") as f:
+            f.write(data)
+        self._digests[name] = digest
+        return file_path
+
+    def files(self) -> List[str]:
+        """Names of the staged files."""
+        return sorted(self._digests)
+
+    def publish(self) -> List[str]:
+        """
+        Flush the staged files and move them into `module_path`.
+
+        Returns:
+            list: Names of the files that were created or changed in the module
+        """
+        if self.published:
+            return []
+        try:
+            # Files written by helpers outside `write` are published (and hashed) too
+            names = sorted(name for name in os.listdir(self.path) if os.path.isfile(os.path.join(self.path, name)))
+            if self.fsync:
+                for name in names:
+                    _fsync_path(os.path.join(self.path, name))
+                _fsync_path(self.path)
+
+            if not os.path.isdir(self.module_path) or not os.listdir(self.module_path):
+                try:
+                    os.rename(self.path, self.module_path)
+                except OSError:
+                    # Windows cannot rename over the empty directory; nothing else writes into it
+                    os.rmdir(self.module_path)
+                    os.rename(self.path, self.module_path)
+                changed = names
+            elif not self.update:
+                raise ModuleWriterError(f"Could not publish staged files to {self.module_path}: it already exists and is not empty")
+            else:
+                changed = []
+                for name in names:
+                    staged_path = os.path.join(self.path, name)
+                    live_path = os.path.join(self.module_path, name)
+                    digest = self._digests.get(name) or _file_sha256(staged_path)
+                    if digest == _file_sha256(live_path):
+                        continue
+                    os.replace(staged_path, live_path)
+                    changed.append(name)
+                if self.fsync and changed:
+                    _fsync_path(self.module_path)
+            if self.fsync:
+                _fsync_path(os.path.dirname(self.module_path))
+        except OSError as e:
+            raise ModuleWriterError(f"Could not publish staged files to {self.module_path}: {e}")
+
+        self.published = True
+        self.discard()
+        self.logger.debug(f"Published {len(changed)} of {len(names)} staged files to {self.module_path}")
+        return changed
+
+    def discard(self):
+        """Remove the staging directory (after publishing it only holds what was not moved)."""
+        shutil.rmtree(self._staging_dir, ignore_errors=True)
@@ -1,32 +1,56 @@
 import logging
 import os
 import json
-import google.generativeai as genai
-from typing import List
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
 
 from ..orchestrator.config import AppConfig
+from ..orchestrator.research_cache import ResearchCache
+from ..orchestrator.rate_limiter import get_rate_limiter
+from ..orchestrator.tracing import get_tracer, text_bytes
+from .llm_backends import create_backend, LLMBackendError
+from .retry_policy import RetryPolicy
 
 class ResearchAgentError(Exception):
     """Custom exception for ResearchAgent errors."""
     pass
 
 class ResearchAgent:
+    # Focus area for each prompt returned by _generate_research_prompts, in order
+    FOCUS_AREAS = ["overview", "practical_applications", "advanced_concepts", "learning_structure"]
+
     def __init__(self, config: AppConfig, temp_data_dir: str):
         self.config = config
         self.logger = config.get_logger(__name__)
         self.temp_data_dir = temp_data_dir
         self.logger.info(f"ResearchAgent initialized. Temp data dir: {self.temp_data_dir}")
 
-        if not self.config.gemini_api_key:
-            self.logger.error("Gemini API key is not configured.")
-            raise ResearchAgentError("Gemini API key missing.")
-        
-        # Configure Gemini Flash 2.5
-        genai.configure(api_key=self.config.gemini_api_key)
-        self.model = genai.GenerativeModel('gemini-2.0-flash-exp')
-        self.logger.info("Gemini Flash 2.5 model configured successfully.")
+        # Model backend (Gemini Flash 2.5 by default); API clients are created on first use
+        try:
+            self.backend = create_backend(self.config.research_backend, self.config, logger=self.logger)
+        except LLMBackendError as e:
+            self.logger.error(f"Research backend could not be configured: {e}")
+            raise ResearchAgentError(str(e))
+        self.model_name = self.backend.model_name
+        self.logger.info(f"Research backend: {self.backend.name} ({self.model_name})")
+        self.retry_policy = RetryPolicy.from_config(self.config, logger=self.logger)
+        self.rate_limiter = get_rate_limiter(self.backend.name, self.config, logger=self.logger)
 
-    def _generate_research_prompts(self, topic: str) -> List[str]:
+        # Persistent response cache shared across runs
+        cache_config = self.config.get_research_cache_config()
+        self.cache = None
+        self.cache_refresh = cache_config["refresh"]
+        if cache_config["enabled"]:
+            self.cache = ResearchCache(
+                cache_config["dir"],
+                ttl_seconds=cache_config["ttl_seconds"],
+                max_bytes=cache_config["max_bytes"],
+                logger=self.logger
+            )
+            self.logger.debug(f"Research cache enabled at {cache_config['dir']} (refresh={self.cache_refresh})")
+
+    @staticmethod
+    def _generate_research_prompts(topic: str) -> List[str]:
         """Generate comprehensive research prompts for deep investigation of the topic."""
         return [
             f"""Provide a comprehensive overview of {topic}. Include:
@@ -66,10 +90,68 @@ class ResearchAgent:
             Design this as a comprehensive curriculum framework."""
         ]
 
+    def _execute_research_query(self, topic: str, index: int, total: int, prompt: str) -> Optional[str]:
+        """
+        Runs a single research prompt and saves the response to its focus-area file.
+        Returns the file path, or None if the query failed or produced no content.
+        """
+        self.logger.info(f"Executing research query {index+1}/{total}")
+
+        try:
+            response_text = None
+            cache_key = ResearchCache.make_key(self.model_name, topic, prompt) if self.cache else None
+            if self.cache and not self.cache_refresh:
+                response_text = self.cache.get(cache_key)
+                if response_text:
+                    self.logger.info(f"Research cache hit for query {index+1}")
+
+            if not response_text:
+                # Generate content using the research backend
+                with get_tracer().span("llm.generate_text", provider=self.backend.name, model=self.model_name,
+                                       focus_area=self.FOCUS_AREAS[index], bytes_in=text_bytes(prompt), retries=0) as span:
+                    request_tokens = self.backend.rate_limit_tokens(prompt, self.config.openai_max_tokens)
+
+                    def query():
+                        # Every attempt, including retries, waits for rate-limit quota
+                        span.add("rate_limit_wait_s", self.rate_limiter.acquire(request_tokens, key=topic))
+                        return self.backend.generate_text(prompt)
+
+                    response_text = self.retry_policy.call(query, f"Research query {index+1}")
+                    span.set(bytes_out=text_bytes(response_text))
+
+                if not response_text:
+                    self.logger.warning(f"Empty response for research query {index+1}")
+                    return None
+
+                if self.cache:
+                    self.cache.put(cache_key, response_text, model=self.model_name, topic=topic)
+
+            # Create descriptive filename based on research focus
+            focus_area = self.FOCUS_AREAS[index]
+            filename = f"{topic.replace(' ', '_').lower()}_{focus_area}.txt"
+            file_path = os.path.join(self.temp_data_dir, filename)
+
+            # Save research data
+            with open(file_path, "w", encoding="utf-8") as f:
+                f.write(f"# Deep Research: {topic} - {focus_area.replace('_', ' ').title()}\n\n")
+                f.write(f"Research Query: {prompt}\n\n")
+                f.write("=" * 80 + "\n\n")
+                f.write(response_text)
+                f.write("\n\n" + "=" * 80 + "\n")
+                f.write(f"Generated by {self.model_name} for Workshop Builder\n")
+
+            self.logger.info(f"Saved research data to: {file_path}")
+            return file_path
+
+        except Exception as e:
+            self.logger.error(f"Failed to generate content for research query {index+1}: {e}")
+            return None
+
     def fetch_unstructured_data(self, topic: str) -> List[str]:
         """
         Fetches unstructured data related to the topic using Gemini Flash 2.5.
-        Performs deep research through multiple targeted prompts.
+        Performs deep research through multiple targeted prompts, running up to
+        `config.research_concurrency` of them at the same time.
         Saves the data into files within the temp_data_dir.
         Returns a list of paths to the created data files.
         """
@@ -80,39 +162,25 @@ class ResearchAgent:
             os.makedirs(self.temp_data_dir, exist_ok=True)
             
             research_prompts = self._generate_research_prompts(topic)
-            file_paths = []
-            
-            for i, prompt in enumerate(research_prompts):
-                self.logger.info(f"Executing research query {i+1}/{len(research_prompts)}")
-                
-                try:
-                    # Generate content using Gemini Flash 2.5
-                    response = self.model.generate_content(prompt)
-                    
-                    if not response.text:
-                        self.logger.warning(f"Empty response for research query {i+1}")
-                        continue
-                    
-                    # Create descriptive filename based on research focus
-                    focus_areas = ["overview", "practical_applications", "advanced_concepts", "learning_structure"]
-                    filename = f"{topic.replace(' ', '_').lower()}_{focus_areas[i]}.txt"
-                    file_path = os.path.join(self.temp_data_dir, filename)
-                    
-                    # Save research data
-                    with open(file_path, "w", encoding="utf-8") as f:
-                        f.write(f"# Deep Research: {topic} - {focus_areas[i].replace('_', ' ').title()}\n\n")
-                        f.write(f"Research Query: {prompt}\n\n")
-                        f.write("=" * 80 + "\n\n")
-                        f.write(response.text)
-                        f.write("\n\n" + "=" * 80 + "\n")
-                        f.write(f"Generated by Gemini Flash 2.5 for Workshop Builder\n")
-                    
-                    file_paths.append(file_path)
-                    self.logger.info(f"Saved research data to: {file_path}")
-                    
-                except Exception as e:
-                    self.logger.error(f"Failed to generate content for research query {i+1}: {e}")
-                    continue
+            total = len(research_prompts)
+            max_workers = min(self.config.research_concurrency, total)
+            self.logger.debug(f"Running {total} research queries with concurrency {max_workers}")
+
+            # Failed queries yield None and are skipped, exactly as in sequential mode
+            if max_workers <= 1:
+                results = [
+                    self._execute_research_query(topic, i, total, prompt)
+                    for i, prompt in enumerate(research_prompts)
+                ]
+            else:
+                with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="research") as executor:
+                    results = list(executor.map(
+                        get_tracer().bind(lambda item: self._execute_research_query(topic, item[0], total, item[1])),
+                        enumerate(research_prompts)
+                    ))
+
+            completed = [(i, path) for i, path in enumerate(results) if path]
+            file_paths = [path for _, path in completed]
             
             # Generate a research summary
             if file_paths:
@@ -121,7 +189,7 @@ class ResearchAgent:
                     "topic": topic,
                     "research_files": [os.path.basename(fp) for fp in file_paths],
                     "total_files": len(file_paths),
-                    "research_areas": ["overview", "practical_applications", "advanced_concepts", "learning_structure"][:len(file_paths)]
+                    "research_areas": [self.FOCUS_AREAS[i] for i, _ in completed]
                 }
                 
                 with open(summary_path, "w", encoding="utf-8") as f:
@@ -0,0 +1,130 @@
+import email.utils
+import logging
+import random
+import time
+from typing import Callable, Optional, TypeVar
+
+# Handle both relative and absolute imports for flexibility
+try:
+    from ..orchestrator.config import AppConfig
+    from ..orchestrator.tracing import get_tracer
+except ImportError:
+    import os
+    import sys
+    sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+    from orchestrator.config import AppConfig
+    from orchestrator.tracing import get_tracer
+
+T = TypeVar("T")
+
+# HTTP statuses worth retrying: request timeout, rate limiting and server-side failures
+RETRYABLE_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+
+# Transient error classes of the OpenAI and Google SDKs (and their HTTP libraries), matched
+# by name so that neither SDK has to be imported to classify an error
+RETRYABLE_ERROR_NAMES = {
+    "APIConnectionError", "APITimeoutError", "RateLimitError", "InternalServerError",
+    "DeadlineExceeded", "ServiceUnavailable", "ResourceExhausted", "TooManyRequests",
+    "ConnectError", "ReadTimeout", "ConnectTimeout", "RemoteProtocolError",
+}
+
+
+def status_code_of(error: BaseException) -> Optional[int]:
+    """HTTP status of an SDK error: OpenAI errors expose `status_code`, Google API errors `code`."""
+    for attribute in ("status_code", "code"):
+        value = getattr(error, attribute, None)
+        if isinstance(value, int) and not isinstance(value, bool):
+            return value
+    return None
+
+
+def retry_after_seconds(error: BaseException) -> Optional[float]:
+    """
+    Delay requested by the server through the error's HTTP response headers
+    (`retry-after-ms`, or `retry-after` in seconds or as an HTTP date), if any.
+    """
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    if not headers:
+        return None
+    try:
+        value = headers.get("retry-after-ms")
+        if value is not None:
+            return max(0.0, float(value) / 1000)
+        value = headers.get("retry-after")
+        if value is None:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            retry_at = email.utils.parsedate_to_datetime(value)
+            return max(0.0, retry_at.timestamp() - time.time())
+    except (TypeError, ValueError, AttributeError):
+        return None
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Whether `error` is a transient failure (timeout, connection error, 429 or 5xx)."""
+    status = status_code_of(error)
+    if status is not None:
+        return status in RETRYABLE_STATUS_CODES
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+    return type(error).__name__ in RETRYABLE_ERROR_NAMES
+
+
+class RetryPolicy:
+    """
+    Retries transient LLM API failures with exponential backoff and full jitter.
+
+    Attempt `n` (counting retries from 0) waits a random time between 0 and
+    `min(max_delay, base_delay * 2**n)`, unless the server sent a Retry-After header,
+    which is honoured (capped at `max_delay`). Errors that are not transient, such as
+    authentication or validation errors, are raised immediately. Each retry is counted
+    on the current trace span. Per-request timeouts are set by the backends
+    (LLM_REQUEST_TIMEOUT_SECONDS); a timed-out request is retried like any other
+    transient failure.
+    """
+
+    def __init__(self, max_retries: int = 3, base_delay: float = 1.0, max_delay: float = 60.0,
+                 logger: Optional[logging.Logger] = None, sleep: Callable[[float], None] = time.sleep):
+        self.max_retries = max(0, max_retries)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.logger = logger or logging.getLogger(__name__)
+        self._sleep = sleep
+
+    @classmethod
+    def from_config(cls, config: AppConfig, logger: Optional[logging.Logger] = None) -> "RetryPolicy":
+        """Policy from MAX_RETRY_ATTEMPTS and the RETRY_* settings; no retries when ERROR_RECOVERY_ENABLED is false."""
+        retry_config = config.get_error_handling_config()
+        return cls(
+            max_retries=retry_config["max_retry_attempts"] if retry_config["recovery_enabled"] else 0,
+            base_delay=retry_config["retry_base_delay_seconds"],
+            max_delay=retry_config["retry_max_delay_seconds"],
+            logger=logger
+        )
+
+    def backoff_delay(self, retry: int, error: Optional[BaseException] = None) -> float:
+        """Seconds to wait before retry number `retry` (0-based)."""
+        requested = retry_after_seconds(error) if error is not None else None
+        if requested is not None:
+            return min(requested, self.max_delay)
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** retry)))
+
+    def call(self, fn: Callable[[], T], description: str = "API call") -> T:
+        """Call `fn`, retrying transient failures; the last error is raised once retries run out."""
+        retry = 0
+        while True:
+            try:
+                return fn()
+            except Exception as e:
+                if retry >= self.max_retries or not is_retryable(e):
+                    raise
+                delay = self.backoff_delay(retry, e)
+                retry += 1
+                get_tracer().current_span().add("retries")
+                self.logger.warning(
+                    f"{description} failed ({type(e).__name__}: {e}); "
+                    f"retry {retry}/{self.max_retries} in {delay:.1f}s"
+                )
+                self._sleep(delay)
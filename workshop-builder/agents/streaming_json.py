@@ -0,0 +1,103 @@
+import json
+import re
+from typing import List, Tuple
+
+# Characters that end a run of plain string content: a closing quote or an escape
+_STRING_SPECIAL = re.compile(r'["\\]')
+
+
+class StreamingFilesParser:
+    """
+    Incremental parser for the compiler's `{"files": {"<name>": "<content>", ...}}` response.
+
+    Text is fed in arbitrary chunks as it streams in. As soon as the string value of
+    an entry under the `files` object is complete, `feed` returns it as a
+    `(filename, content)` pair, so callers can write each file without waiting for
+    (or buffering) the rest of the response. Only the string currently being read
+    is held in memory.
+    """
+
+    def __init__(self, container_key: str = "files"):
+        self.container_key = container_key
+        # One frame per open object/array: {"type": "object"|"array", "key": str|None, "expect_key": bool}
+        self._stack = []
+        self._in_string = False
+        self._escape = False
+        self._string_parts = []
+        self._started = False
+        self.complete = False
+        self.files_emitted = 0
+
+    def feed(self, chunk: str) -> List[Tuple[str, str]]:
+        """Consume the next chunk of response text and return any files completed by it."""
+        completed = []
+        i = 0
+        length = len(chunk)
+
+        while i < length:
+            if self._in_string:
+                if self._escape:
+                    self._string_parts.append(chunk[i])
+                    self._escape = False
+                    i += 1
+                    continue
+                match = _STRING_SPECIAL.search(chunk, i)
+                if not match:
+                    self._string_parts.append(chunk[i:])
+                    break
+                end = match.start()
+                self._string_parts.append(chunk[i:end + 1])
+                i = end + 1
+                if match.group() == '\\':
+                    self._escape = True
+                    continue
+                # Closing quote: decode the complete JSON string token
+                self._in_string = False
+                value = json.loads('"' + "".join(self._string_parts))
+                self._string_parts = []
+                file_entry = self._on_string(value)
+                if file_entry:
+                    completed.append(file_entry)
+                continue
+
+            ch = chunk[i]
+            i += 1
+            if ch == '"':
+                self._in_string = True
+                self._string_parts = []
+            elif ch == '{':
+                self._push("object")
+            elif ch == '[':
+                self._push("array")
+            elif ch in '}]':
+                if self._stack:
+                    self._stack.pop()
+                if self._started and not self._stack:
+                    self.complete = True
+            elif ch == ',':
+                if self._stack and self._stack[-1]["type"] == "object":
+                    self._stack[-1]["expect_key"] = True
+                    self._stack[-1]["key"] = None
+
+        return completed
+
+    def _push(self, container_type: str):
+        self._started = True
+        self._stack.append({"type": container_type, "key": None, "expect_key": container_type == "object"})
+
+    def _on_string(self, value: str):
+        if not self._stack:
+            return None
+        frame = self._stack[-1]
+        if frame["type"] == "object" and frame["expect_key"]:
+            frame["key"] = value
+            frame["expect_key"] = False
+            return None
+
+        # A string value: emit it if it's a direct child of the top-level files object
+        if (len(self._stack) == 2
+                and self._stack[0]["key"] == self.container_key
+                and frame["type"] == "object"):
+            self.files_emitted += 1
+            return frame["key"], value
+        return None
@@ -0,0 +1,170 @@
+import json
+import logging
+import os
+import threading
+from typing import Any, Dict, List, Optional
+
+from jinja2 import Environment, FileSystemLoader, StrictUndefined, TemplateError
+
+MANIFEST_TEMPLATE = "workshop_manifest.json.j2"
+README_TEMPLATE = "README.md.j2"
+DEFAULT_TEMPLATES_DIR = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "templates"))
+
+# One renderer per templates directory, shared by every compiler in the process
+_renderers: Dict[str, "TemplateRenderer"] = {}
+_renderers_lock = threading.Lock()
+
+
+class TemplateRendererError(Exception):
+    """Custom exception for template rendering errors."""
+    pass
+
+
+def _to_json(value: Any) -> str:
+    # Jinja's own `tojson` escapes <, > and & for HTML; manifests are not embedded in HTML
+    return json.dumps(value, ensure_ascii=False)
+
+
+class TemplateRenderer:
+    """
+    Renders a module's manifest.json and README.md from the Jinja2 templates.
+
+    Both templates are compiled once when the renderer is created and kept in the
+    environment's cache without checking the files for changes, so rendering a
+    module only evaluates the compiled templates. The rendered manifest is parsed
+    back and checked against the section list it was rendered from before it is
+    returned, so a module is never published with an invalid manifest.
+    """
+
+    def __init__(self, templates_dir: str = DEFAULT_TEMPLATES_DIR, logger: Optional[logging.Logger] = None):
+        self.templates_dir = os.path.abspath(templates_dir)
+        self.logger = logger or logging.getLogger(__name__)
+        self.environment = Environment(
+            loader=FileSystemLoader(self.templates_dir),
+            autoescape=False,
+            undefined=StrictUndefined,
+            trim_blocks=True,
+            lstrip_blocks=True,
+            keep_trailing_newline=True,
+            auto_reload=False
+        )
+        self.environment.filters["to_json"] = _to_json
+        try:
+            self._manifest_template = self.environment.get_template(MANIFEST_TEMPLATE)
+            self._readme_template = self.environment.get_template(README_TEMPLATE)
+        except TemplateError as e:
+            raise TemplateRendererError(f"Could not load module templates from {self.templates_dir}: {e}")
+        self.logger.debug(f"Compiled module templates in {self.templates_dir}")
+
+    def render_manifest(self, context: Dict[str, Any]) -> str:
+        """Render manifest.json; raises TemplateRendererError unless it is a valid manifest of `context['sections']`."""
+        content = self._render(self._manifest_template, context)
+        try:
+            manifest = json.loads(content)
+        except ValueError as e:
+            raise TemplateRendererError(f"{MANIFEST_TEMPLATE} rendered invalid JSON: {e}")
+        expected = [section["filename"] for section in context["sections"]]
+        if not isinstance(manifest, dict) or manifest.get("files") != expected or not manifest.get("id"):
+            raise TemplateRendererError(f"{MANIFEST_TEMPLATE} did not render the id and files of {context.get('module_id')}")
+        return content
+
+    def render_readme(self, context: Dict[str, Any]) -> str:
+        """Render README.md."""
+        return self._render(self._readme_template, context)
+
+    def _render(self, template, context: Dict[str, Any]) -> str:
+        try:
+            return template.render(**context)
+        except TemplateError as e:
+            raise TemplateRendererError(f"Could not render {template.name}: {e}")
+
+
+def get_template_renderer(templates_dir: str = DEFAULT_TEMPLATES_DIR, logger: Optional[logging.Logger] = None) -> TemplateRenderer:
+    """The process-wide renderer for `templates_dir`, created (and its templates compiled) on first use."""
+    key = os.path.abspath(templates_dir)
+    with _renderers_lock:
+        renderer = _renderers.get(key)
+        if renderer is None:
+            renderer = TemplateRenderer(key, logger=logger)
+            _renderers[key] = renderer
+        return renderer
+
+
+def reset_template_renderers():
+    """Drop the cached renderers so edited templates are compiled again."""
+    with _renderers_lock:
+        _renderers.clear()
+
+
+def module_sections(filenames: List[str], contents: Dict[str, str], summaries: Optional[Dict[str, str]] = None) -> List[Dict[str, str]]:
+    """Section entries (filename, title, summary) for the templates; `contents` gives each file's markdown."""
+    summaries = summaries or {}
+    return [
+        {
+            "filename": filename,
+            "title": markdown_title(filename, contents.get(filename)),
+            "summary": summaries.get(filename) or first_paragraph(contents.get(filename))
+        }
+        for filename in filenames
+    ]
+
+
+def markdown_title(filename: str, content: Optional[str]) -> str:
+    """A section's H1 heading, or a title made from its file name."""
+    for line in (content or "").splitlines():
+        if line.startswith("# ") and line[2:].strip():
+            return line[2:].strip().rstrip("#").strip()
+    name = filename[:-3] if filename.endswith(".md") else filename
+    name = name.split("_", 1)[1] if name[:2].isdigit() and "_" in name else name
+    return name.replace("_", " ").replace("-", " ").title()
+
+
+def first_paragraph(content: Optional[str], max_chars: int = 200) -> str:
+    """The first prose paragraph of a markdown document (not a heading, list, quote, table or code), shortened to `max_chars`."""
+    paragraph = []
+    in_code = False
+    for line in (content or "").splitlines():
+        stripped = line.strip()
+        if stripped.startswith("```"):
+            in_code = not in_code
+            if paragraph:
+                break
+            continue
+        if in_code:
+            continue
+        if not stripped:
+            if paragraph:
+                break
+            continue
+        if stripped[0] in "#-*>|!<[" or stripped[:2].rstrip(".").isdigit():
+            if paragraph:
+                break
+            continue
+        paragraph.append(stripped)
+    text = " ".join(paragraph)
+    if len(text) <= max_chars:
+        return text
+    cut = text[:max_chars]
+    sentence_end = cut.rfind(". ")
+    if sentence_end >= max_chars // 2:
+        return cut[:sentence_end + 1]
+    return cut.rsplit(" ", 1)[0].rstrip(",;:") + "…"
+
+
+def list_under_heading(content: Optional[str], heading_words: tuple) -> List[str]:
+    """Items of the first bullet list under a heading containing one of `heading_words` (e.g. "Prerequisites")."""
+    items = []
+    in_section = False
+    for line in (content or "").splitlines():
+        stripped = line.strip()
+        if stripped.startswith("#"):
+            if in_section and items:
+                break
+            title = stripped.lstrip("#").strip().lower()
+            in_section = any(word in title for word in heading_words)
+            continue
+        if in_section and stripped[:2] in ("- ", "* "):
+            items.append(stripped[2:].strip())
+        elif in_section and items and stripped:
+            break
+    return items
@@ -0,0 +1,200 @@
+import importlib.util
+import json
+import logging
+import math
+import os
+import re
+import threading
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional
+
+# sentence-transformers is imported lazily when an embedding model is configured
+EMBEDDINGS_AVAILABLE = importlib.util.find_spec("sentence_transformers") is not None
+
+# Words that say nothing about what a workshop covers
+STOP_WORDS = frozenset("""
+a an and as at by for from in into of on or the to with your you
+workshop workshops module modules session morning afternoon introduction intro guide
+edition mastering understanding using building practical hands
+""".split())
+HEADING_PATTERN = re.compile(r"^#\s+(.+)$", re.MULTILINE)
+
+
+class TopicSimilarityError(Exception):
+    """Custom exception for topic similarity errors."""
+    pass
+
+
+def describe_module(module_path: str) -> str:
+    """
+    Short description of a workshop module used for similarity: its manifest title and
+    description, the first README heading and the words of its directory slug.
+    """
+    parts = []
+    try:
+        with open(os.path.join(module_path, "manifest.json"), "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        if isinstance(manifest, dict):
+            parts.extend(str(manifest[key]) for key in ("title", "description") if isinstance(manifest.get(key), str))
+    except (OSError, ValueError):
+        pass
+    try:
+        with open(os.path.join(module_path, "README.md"), "r", encoding="utf-8") as f:
+            match = HEADING_PATTERN.search(f.read(4096))
+        if match and match.group(1).strip() not in parts:
+            parts.append(match.group(1).strip())
+    except OSError:
+        pass
+    slug = re.sub(r"^workshop-\d+-?", "", os.path.basename(os.path.normpath(module_path)))
+    parts.append(slug.replace("-", " "))
+    return " | ".join(parts)
+
+
+def _words(text: str, keep_letters: bool = False) -> List[str]:
+    """Lower-case words without stop words or plural "s"; single letters ("R", "C") only with `keep_letters`."""
+    words = []
+    for word in re.findall(r"[a-z0-9]+", text.lower()):
+        if word in STOP_WORDS or (len(word) < 2 and not word.isdigit() and not keep_letters):
+            continue
+        if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+            word = word[:-1]
+        words.append(word)
+    return words
+
+
+def missing_terms(topic: str, description: str) -> List[str]:
+    """
+    Words of `topic` that `description` does not contain, such as "R" in "Data Analysis
+    with R" against "Python for Data Analysis". A word also counts as present when it
+    and its neighbour are written as one word in the description ("VS Code" ~ "vscode").
+    """
+    described = _words(description, keep_letters=True)
+    vocabulary = set(described) | {a + b for a, b in zip(described, described[1:])}
+    words = _words(topic, keep_letters=True)
+    missing = []
+    for i, word in enumerate(words):
+        joined = {words[i - 1] + word} if i > 0 else set()
+        if i + 1 < len(words):
+            joined.add(word + words[i + 1])
+        if word not in vocabulary and not joined & vocabulary and word not in missing:
+            missing.append(word)
+    return missing
+
+
+def _features(text: str) -> Counter:
+    """Word and character-trigram counts; trigrams match plurals and close spellings ("RAG systems" ~ "rag-system")."""
+    features = Counter()
+    for word in _words(text):
+        features[f"w:{word}"] += 1
+        padded = f" {word} "
+        for i in range(len(padded) - 2):
+            features[f"c:{padded[i:i + 3]}"] += 1
+    return features
+
+
+class TopicSimilarityIndex:
+    """
+    In-memory vector index of workshop module descriptions for duplicate-topic checks.
+
+    Each module is described by `describe_module` (titles and slug, not the full
+    content) and vectorised with TF-IDF over words and character trigrams, kept in
+    an inverted index so a query only touches modules that share a feature with
+    it. With `embedding_model` set and sentence-transformers installed, a local
+    embedding model is used instead. Descriptions and vectors are cached by module
+    name and manifest hash, so refreshing after new modules only reads those.
+    """
+
+    def __init__(self, embedding_model: Optional[str] = None, logger: Optional[logging.Logger] = None):
+        self.logger = logger or logging.getLogger(__name__)
+        self.embedding_model = embedding_model or None
+        if self.embedding_model and not EMBEDDINGS_AVAILABLE:
+            self.logger.warning(f"TOPIC_EMBEDDING_MODEL={self.embedding_model} needs sentence-transformers; using TF-IDF instead")
+            self.embedding_model = None
+        self._model = None
+        self._lock = threading.Lock()
+        self._documents: Dict[str, dict] = {}  # module name -> {"key", "text", "features" or "embedding"}
+        self._postings = None  # TF-IDF inverted index, rebuilt after the documents change
+        self._idf = {}
+
+    @property
+    def method(self) -> str:
+        return f"embeddings ({self.embedding_model})" if self.embedding_model else "tf-idf"
+
+    def _embed(self, texts: List[str]):
+        if self._model is None:
+            try:
+                from sentence_transformers import SentenceTransformer
+                self._model = SentenceTransformer(self.embedding_model)
+            except Exception as e:
+                raise TopicSimilarityError(f"Could not load embedding model {self.embedding_model}: {e}")
+        return self._model.encode(texts, normalize_embeddings=True)
+
+    def update(self, workshops_base_dir: str, entries: List[dict]):
+        """
+        Synchronise with the workshop index `entries` (dicts with `name` and `manifest_sha256`);
+        only new or changed modules are read and vectorised.
+        """
+        with self._lock:
+            wanted = {entry["name"]: entry.get("manifest_sha256") for entry in entries}
+            changed = [name for name, key in wanted.items()
+                       if name not in self._documents or self._documents[name]["key"] != key]
+            removed = [name for name in self._documents if name not in wanted]
+            if not changed and not removed:
+                return
+            for name in removed:
+                del self._documents[name]
+            texts = [describe_module(os.path.join(workshops_base_dir, name)) for name in changed]
+            if self.embedding_model:
+                vectors = self._embed(texts) if texts else []
+                for name, text, vector in zip(changed, texts, vectors):
+                    self._documents[name] = {"key": wanted[name], "text": text, "embedding": vector}
+            else:
+                for name, text in zip(changed, texts):
+                    self._documents[name] = {"key": wanted[name], "text": text, "features": _features(text)}
+                self._postings = None
+            self.logger.debug(f"Topic similarity index: {len(changed)} modules (re)described, {len(removed)} removed")
+
+    def _build_tfidf(self):
+        document_frequency = Counter()
+        for document in self._documents.values():
+            document_frequency.update(document["features"].keys())
+        count = len(self._documents)
+        self._idf = {feature: math.log((1 + count) / (1 + df)) + 1 for feature, df in document_frequency.items()}
+        self._postings = defaultdict(list)
+        for name, document in self._documents.items():
+            weights = {feature: (1 + math.log(tf)) * self._idf[feature] for feature, tf in document["features"].items()}
+            norm = math.sqrt(sum(weight * weight for weight in weights.values())) or 1.0
+            for feature, weight in weights.items():
+                self._postings[feature].append((name, weight / norm))
+
+    def search(self, topic: str, limit: int = 3) -> List[dict]:
+        """
+        Modules most similar to `topic`, best first.
+
+        Returns:
+            list: dicts with `name`, `score` (cosine similarity, 0 to 1), `description` and
+            `missing_terms` (words of `topic` the description lacks, see `missing_terms`)
+        """
+        with self._lock:
+            if not self._documents:
+                return []
+            if self.embedding_model:
+                query = self._embed([topic])[0]
+                scores = {name: float(sum(a * b for a, b in zip(query, document["embedding"])))
+                          for name, document in self._documents.items()}
+            else:
+                if self._postings is None:
+                    self._build_tfidf()
+                # Features no module has count towards the query's norm with the highest IDF
+                unseen_idf = math.log(1 + len(self._documents)) + 1
+                weights = {feature: (1 + math.log(tf)) * self._idf.get(feature, unseen_idf)
+                           for feature, tf in _features(topic).items()}
+                norm = math.sqrt(sum(weight * weight for weight in weights.values())) or 1.0
+                scores = defaultdict(float)
+                for feature, weight in weights.items():
+                    for name, document_weight in self._postings.get(feature, ()):
+                        scores[name] += weight / norm * document_weight
+            best = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:limit]
+            return [{"name": name, "score": round(score, 3), "description": self._documents[name]["text"],
+                     "missing_terms": missing_terms(topic, self._documents[name]["text"])}
+                    for name, score in best if score > 0]
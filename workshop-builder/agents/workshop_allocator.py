@@ -0,0 +1,190 @@
+import logging
+import os
+import re
+import tempfile
+from typing import Callable, Optional, Set, Tuple
+
+from .workshop_index import WorkshopIndex, WorkshopIndexError
+
+# Module directories are named workshop-<number>[-<slug>], with or without zero padding
+MODULE_NUMBER_PATTERN = re.compile(r"^workshop-0*(\d+)(?:-|$)")
+
+
+class WorkshopAllocatorError(Exception):
+    """Custom exception for workshop number allocation errors."""
+    pass
+
+
+class WorkshopNumberAllocator:
+    """
+    Allocates workshop numbers and module directories safely across concurrent runs.
+
+    A number is owned by whoever manages to create `<ledger_dir>/<number>.reserved`
+    with O_CREAT | O_EXCL, which the filesystem guarantees only one process can do.
+    The reservation file records the module directory name, so the ledger doubles
+    as an allocation history. A `next` hint file remembers where to start looking,
+    instead of seeding from a full scan of the existing modules on every call; a
+    stale hint only costs a few extra reservation attempts, never a duplicate number.
+
+    Numbers already used by a module directory that the allocator did not create
+    (`workshop-NN-*` added by hand or by a `git pull`) are skipped. With a
+    `WorkshopIndex`, each candidate is one indexed query after the index's
+    mtime check; without one, the directory is listed once and listed again only
+    when its modification time changes, so allocation does not grow with the
+    number of modules either way. The module directory itself is created with
+    `os.mkdir`, so an existing module is never reused or removed. With
+    `create_directory=False` only the name is reserved and the caller creates the
+    directory later (the compiler moves its staged files into place in one
+    rename); names that already exist are skipped in the same way.
+    """
+
+    LEDGER_DIR_NAME = ".workshop-allocations"
+    MAX_ATTEMPTS = 1000
+
+    def __init__(self, workshops_base_dir: str, scan_highest_number: Callable[[], int],
+                 index: Optional[WorkshopIndex] = None, logger: Optional[logging.Logger] = None):
+        self.workshops_base_dir = workshops_base_dir
+        self.ledger_dir = os.path.join(workshops_base_dir, self.LEDGER_DIR_NAME)
+        self.hint_path = os.path.join(self.ledger_dir, "next")
+        self.scan_highest_number = scan_highest_number
+        self.index = index
+        self.logger = logger or logging.getLogger(__name__)
+        self._listing = (None, set())  # (directory mtime, numbers in use) of the last listing
+
+    def allocate(self, topic_slug: str, create_directory: bool = True) -> Tuple[int, str]:
+        """
+        Reserve the next free workshop number and create its module directory
+        (or only reserve its name when `create_directory` is False).
+
+        Returns:
+            tuple: (workshop_number, module_path)
+        """
+        os.makedirs(self.ledger_dir, exist_ok=True)
+        number = self._read_hint()
+        in_use = self._in_use_check()
+
+        for _ in range(self.MAX_ATTEMPTS):
+            if self._reserve(number):
+                module_name = f"workshop-{number}-{topic_slug}"
+                module_path = os.path.join(self.workshops_base_dir, module_name)
+                try:
+                    if in_use(number):
+                        raise FileExistsError(module_path)
+                    if create_directory:
+                        mtime_ns = self._directory_mtime_ns()
+                        os.mkdir(module_path)
+                        self._created(number, module_path, mtime_ns)
+                    elif os.path.lexists(module_path):
+                        raise FileExistsError(module_path)
+                except FileExistsError:
+                    # A module created outside the allocator already uses this number; leave it untouched
+                    self.logger.warning(f"Workshop number {number} is already used by a module directory; skipping it")
+                    self._record(number, f"{module_name} (pre-existing)")
+                    number += 1
+                    continue
+
+                self._record(number, module_name)
+                self._write_hint(number + 1)
+                self.logger.debug(f"Allocated workshop number {number}: {module_path}")
+                return number, module_path
+            number += 1
+
+        raise WorkshopAllocatorError(f"Could not allocate a workshop number in {self.workshops_base_dir} after {self.MAX_ATTEMPTS} attempts")
+
+    def peek(self) -> int:
+        """Return the first workshop number the next `allocate` call will try, without reserving it."""
+        number = self._read_hint()
+        in_use = self._in_use_check()
+        while in_use(number) or os.path.exists(self._reservation_path(number)):
+            number += 1
+        return number
+
+    def _in_use_check(self) -> Callable[[int], bool]:
+        """Whether a workshop number is used by a module directory: an index query, or the cached directory listing."""
+        if self.index is None:
+            return self._numbers_in_use().__contains__
+        try:
+            self.index.refresh()
+        except WorkshopIndexError as e:
+            self.logger.warning(f"{e}; listing the workshops directory instead")
+            return self._numbers_in_use().__contains__
+
+        def in_use(number: int) -> bool:
+            try:
+                return self.index.has_number(number)
+            except WorkshopIndexError as e:
+                self.logger.warning(f"{e}; listing the workshops directory instead")
+                return number in self._numbers_in_use()
+        return in_use
+
+    def _directory_mtime_ns(self) -> Optional[int]:
+        try:
+            return os.stat(self.workshops_base_dir).st_mtime_ns
+        except OSError:
+            return None
+
+    def _numbers_in_use(self) -> Set[int]:
+        """Workshop numbers of the module directories in `workshops_base_dir`, listed again only after it changed."""
+        mtime_ns = self._directory_mtime_ns()
+        if mtime_ns is not None and mtime_ns == self._listing[0]:
+            return self._listing[1]
+        numbers = set()
+        try:
+            names = os.listdir(self.workshops_base_dir)
+        except OSError:
+            names = []
+        for name in names:
+            match = MODULE_NUMBER_PATTERN.match(name)
+            if match:
+                numbers.add(int(match.group(1)))
+        self._listing = (mtime_ns, numbers)
+        return numbers
+
+    def _created(self, number: int, module_path: str, mtime_ns: Optional[int]):
+        """
+        Record a module directory this allocator just created, where `mtime_ns` is the
+        directory's modification time just before; the listing and the index stay
+        current (no rescan) if they were current then.
+        """
+        if mtime_ns is not None and mtime_ns == self._listing[0]:
+            self._listing[1].add(number)
+            self._listing = (self._directory_mtime_ns(), self._listing[1])
+        if self.index is not None:
+            try:
+                self.index.add(module_path, None, expected_mtime_ns=mtime_ns)
+            except WorkshopIndexError as e:
+                self.logger.warning(str(e))
+
+    def _reservation_path(self, number: int) -> str:
+        return os.path.join(self.ledger_dir, f"{number}.reserved")
+
+    def _reserve(self, number: int) -> bool:
+        try:
+            fd = os.open(self._reservation_path(number), os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+        except FileExistsError:
+            return False
+        os.close(fd)
+        return True
+
+    def _record(self, number: int, module_name: str):
+        with open(self._reservation_path(number), "w", encoding="utf-8") as f:
+            f.write(module_name + "\n")
+
+    def _read_hint(self) -> int:
+        try:
+            with open(self.hint_path, "r", encoding="utf-8") as f:
+                return max(1, int(f.read().strip()))
+        except (OSError, ValueError):
+            # First allocation (or unreadable hint): seed from the existing modules once
+            return self.scan_highest_number() + 1
+
+    def _write_hint(self, number: int):
+        fd, tmp_path = tempfile.mkstemp(dir=self.ledger_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(str(number))
+            os.replace(tmp_path, self.hint_path)
+        except OSError as e:
+            self.logger.warning(f"Could not update workshop allocation hint: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
@@ -0,0 +1,231 @@
+import hashlib
+import json
+import logging
+import os
+import pathlib
+import re
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import List, Optional
+
+MODULE_NAME_PATTERN = re.compile(r"^workshop-(\d+)(?:-(.+))?$")
+# Leading "Workshop 04:", "Module 06 -" or "Workshop:" in manifest titles
+TITLE_PREFIX_PATTERN = re.compile(r"^(?:workshop|module)\s*\d*\s*[:\-–]\s*", re.IGNORECASE)
+
+
+class WorkshopIndexError(Exception):
+    """Custom exception for workshop index errors."""
+    pass
+
+
+def topic_key(topic: str) -> str:
+    """Normalized form of a topic used for duplicate lookups (lowercase words, single spaces)."""
+    return " ".join(re.findall(r"\w+", topic.lower()))
+
+
+class WorkshopIndex:
+    """
+    Persistent index of the workshop modules in `workshops_base_dir`, stored in SQLite.
+
+    Each module directory (`workshop-<number>-<slug>`) has a row with its number, slug,
+    topic, the SHA-256 of its manifest.json and its creation time, so the highest
+    number and slug or topic lookups are index queries instead of directory scans.
+
+    The index records the modification time of `workshops_base_dir` when it was last
+    synchronised. `refresh` compares it with one `stat` call and only lists the
+    directory again when modules were added or removed outside the index (by hand, a
+    git pull, another machine). Modules created by the compiler are added as they
+    are allocated. The database lives in the allocator's ledger directory, so writing
+    it does not change the modification time of `workshops_base_dir`.
+
+    With `read_only` (offline dry runs) an existing database is opened as immutable,
+    so not even SQLite's -wal and -shm files are created, and `refresh` raises
+    WorkshopIndexError instead of rescanning when the index is out of date.
+    """
+
+    def __init__(self, workshops_base_dir: str, db_path: str, read_only: bool = False,
+                 logger: Optional[logging.Logger] = None):
+        self.workshops_base_dir = workshops_base_dir
+        self.db_path = db_path
+        self.read_only = read_only
+        self.logger = logger or logging.getLogger(__name__)
+        self._lock = threading.Lock()
+
+        if read_only:
+            if not os.path.isfile(self.db_path):
+                raise WorkshopIndexError(f"Workshop index {self.db_path} does not exist")
+            try:
+                uri = f"{pathlib.Path(os.path.abspath(self.db_path)).as_uri()}?mode=ro&immutable=1"
+                self._conn = sqlite3.connect(uri, uri=True, timeout=30, check_same_thread=False)
+                self._conn.execute("SELECT COUNT(*) FROM modules").fetchone()
+            except sqlite3.Error as e:
+                raise WorkshopIndexError(f"Could not open workshop index {self.db_path}: {e}")
+            return
+
+        try:
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+            # The index can always be rebuilt from the directory, so commits need not wait for fsync
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            with self._lock, self._conn:
+                self._conn.execute(
+                    "CREATE TABLE IF NOT EXISTS modules ("
+                    " name TEXT PRIMARY KEY,"
+                    " number INTEGER NOT NULL,"
+                    " slug TEXT NOT NULL,"
+                    " topic TEXT,"
+                    " topic_key TEXT,"
+                    " manifest_sha256 TEXT,"
+                    " created_at REAL NOT NULL)"
+                )
+                self._conn.execute("CREATE INDEX IF NOT EXISTS modules_number ON modules (number)")
+                self._conn.execute("CREATE INDEX IF NOT EXISTS modules_slug ON modules (slug)")
+                self._conn.execute("CREATE INDEX IF NOT EXISTS modules_topic_key ON modules (topic_key)")
+                self._conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        except (OSError, sqlite3.Error) as e:
+            raise WorkshopIndexError(f"Could not open workshop index {self.db_path}: {e}")
+
+    @contextmanager
+    def _database(self, action: str):
+        """Hold the lock and a transaction; database and filesystem failures become WorkshopIndexError."""
+        with self._lock:
+            try:
+                with self._conn:
+                    yield
+            except (OSError, sqlite3.Error) as e:
+                raise WorkshopIndexError(f"Could not {action}: {e}")
+
+    def _directory_mtime_ns(self) -> Optional[int]:
+        try:
+            return os.stat(self.workshops_base_dir).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def _stored_mtime_ns(self) -> Optional[int]:
+        row = self._conn.execute("SELECT value FROM meta WHERE key = 'dir_mtime_ns'").fetchone()
+        return int(row[0]) if row else None
+
+    def _store_mtime_ns(self, mtime_ns: Optional[int]):
+        if mtime_ns is None:
+            self._conn.execute("DELETE FROM meta WHERE key = 'dir_mtime_ns'")
+        else:
+            self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('dir_mtime_ns', ?)", (str(mtime_ns),))
+
+    @staticmethod
+    def _manifest_details(module_path: str) -> tuple:
+        """(manifest SHA-256, title without its "Workshop NN:" prefix) of a module, or Nones."""
+        try:
+            with open(os.path.join(module_path, "manifest.json"), "rb") as f:
+                data = f.read()
+        except OSError:
+            return None, None
+        title = None
+        try:
+            manifest = json.loads(data)
+            if isinstance(manifest, dict) and isinstance(manifest.get("title"), str):
+                title = TITLE_PREFIX_PATTERN.sub("", manifest["title"]).strip() or None
+        except ValueError:
+            pass
+        return hashlib.sha256(data).hexdigest(), title
+
+    def refresh(self) -> bool:
+        """
+        Bring the index in line with `workshops_base_dir` if its modification time changed.
+
+        Returns:
+            bool: True when the directory was rescanned
+        """
+        with self._database(f"refresh the workshop index of {self.workshops_base_dir}"):
+            mtime_ns = self._directory_mtime_ns()
+            if mtime_ns is not None and mtime_ns == self._stored_mtime_ns():
+                return False
+            if self.read_only:
+                raise WorkshopIndexError(f"Workshop index {self.db_path} is out of date and opened read-only")
+            try:
+                names = {name for name in os.listdir(self.workshops_base_dir) if MODULE_NAME_PATTERN.match(name)
+                         and os.path.isdir(os.path.join(self.workshops_base_dir, name))}
+            except FileNotFoundError:
+                names = set()
+            indexed = {row[0] for row in self._conn.execute("SELECT name FROM modules")}
+            for name in indexed - names:
+                self._conn.execute("DELETE FROM modules WHERE name = ?", (name,))
+            for name in sorted(names - indexed):
+                module_path = os.path.join(self.workshops_base_dir, name)
+                manifest_sha256, title = self._manifest_details(module_path)
+                self._insert(name, title, manifest_sha256, os.stat(module_path).st_mtime)
+            self._store_mtime_ns(mtime_ns)
+            self.logger.debug(f"Workshop index rescanned {self.workshops_base_dir}: "
+                              f"{len(names - indexed)} added, {len(indexed - names)} removed")
+            return True
+
+    def _insert(self, name: str, topic: Optional[str], manifest_sha256: Optional[str], created_at: float):
+        match = MODULE_NAME_PATTERN.match(name)
+        self._conn.execute(
+            "INSERT OR REPLACE INTO modules (name, number, slug, topic, topic_key, manifest_sha256, created_at)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (name, int(match.group(1)), match.group(2) or "", topic, topic_key(topic) if topic else None,
+             manifest_sha256, created_at)
+        )
+
+    def add(self, module_path: str, topic: str, expected_mtime_ns: Optional[int] = None):
+        """
+        Record a module directory that was just created for `topic`.
+
+        `expected_mtime_ns` is the directory modification time from `mtime_ns()` just
+        before the module was created; when the index was up to date then, it stays up
+        to date (no rescan) after this call.
+        """
+        name = os.path.basename(os.path.normpath(module_path))
+        if not MODULE_NAME_PATTERN.match(name):
+            raise WorkshopIndexError(f"Not a workshop module directory name: {name}")
+        with self._database(f"add {name} to the workshop index"):
+            self._insert(name, topic, None, time.time())
+            if expected_mtime_ns is not None and expected_mtime_ns == self._stored_mtime_ns():
+                self._store_mtime_ns(self._directory_mtime_ns())
+
+    def mtime_ns(self) -> Optional[int]:
+        """Current modification time of `workshops_base_dir` (None when it does not exist)."""
+        return self._directory_mtime_ns()
+
+    def update_manifest(self, module_path: str):
+        """Record the hash of a module's (re)written manifest.json."""
+        name = os.path.basename(os.path.normpath(module_path))
+        manifest_sha256, _ = self._manifest_details(module_path)
+        with self._database(f"update the manifest hash of {name}"):
+            self._conn.execute("UPDATE modules SET manifest_sha256 = ? WHERE name = ?", (manifest_sha256, name))
+
+    def highest_number(self) -> int:
+        """Highest workshop number in the index (0 when there are no modules)."""
+        with self._lock:
+            return self._conn.execute("SELECT COALESCE(MAX(number), 0) FROM modules").fetchone()[0]
+
+    def has_number(self, number: int) -> bool:
+        """Whether an indexed module directory uses workshop number `number`."""
+        with self._database(f"look up workshop number {number}"):
+            return self._conn.execute("SELECT 1 FROM modules WHERE number = ? LIMIT 1", (number,)).fetchone() is not None
+
+    def _entries(self, where: str = "", parameters: tuple = ()) -> List[dict]:
+        columns = ("name", "number", "slug", "topic", "manifest_sha256", "created_at")
+        query = f"SELECT {', '.join(columns)} FROM modules {where} ORDER BY number, name"
+        with self._lock:
+            rows = self._conn.execute(query, parameters).fetchall()
+        return [dict(zip(columns, row)) for row in rows]
+
+    def find_by_slug(self, slug: str) -> List[dict]:
+        """Modules whose directory name ends in `slug`."""
+        return self._entries("WHERE slug = ?", (slug,))
+
+    def find_by_topic(self, topic: str) -> List[dict]:
+        """Modules recorded with the same topic, ignoring case and punctuation."""
+        return self._entries("WHERE topic_key = ?", (topic_key(topic),))
+
+    def entries(self) -> List[dict]:
+        """Every indexed module, ordered by number."""
+        return self._entries()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
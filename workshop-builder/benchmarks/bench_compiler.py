@@ -0,0 +1,94 @@
+"""CompilerAgent benchmarks: prompt preparation and response parsing/writing."""
+import os
+
+from harness import load_builder_module, make_config, measure, result, work_directory, write_research_files
+
+TOPIC = "Benchmark Topic"
+RESEARCH_SIZES = [1024, 64 * 1024, 1024 * 1024, 5 * 1024 * 1024]
+QUICK_RESEARCH_SIZES = [1024, 64 * 1024, 1024 * 1024]
+
+
+def bench_prepare_messages(research_bytes: int, packing: bool, repeat: int) -> dict:
+    """CompilerAgent._prepare_workshop_messages over `research_bytes` of research."""
+    compiler_agent = load_builder_module("agents.compiler_agent")
+    with work_directory() as work_dir:
+        config = make_config(work_dir, research_context_packing=packing)
+        agent = compiler_agent.CompilerAgent(config)
+        paths = write_research_files(os.path.join(work_dir, "research"), TOPIC, research_bytes)
+        module_path = os.path.join(config.workshops_base_dir, "workshop-1-benchmark")
+        stats = measure(lambda _: agent._prepare_workshop_messages(TOPIC, paths, module_path), repeat)
+        prompt_chars = sum(len(message["content"]) for message in stats["last"])
+    return result("compiler.prepare_messages", {"research_bytes": research_bytes, "packing": packing}, stats, prompt_chars=prompt_chars)
+
+
+def bench_execute_api(response_bytes: int, stream: bool, repeat: int, fsync: bool = True) -> dict:
+    """
+    CompilerAgent._execute_openai_api: parse a stub response of about `response_bytes`,
+    stage its files, render manifest.json and README.md and publish them into the
+    module directory (as compile_workshop does).
+    """
+    compiler_agent = load_builder_module("agents.compiler_agent")
+    llm_backends = load_builder_module("agents.llm_backends")
+    with work_directory() as work_dir:
+        config = make_config(work_dir, openai_stream_compilation=stream, module_write_fsync=fsync)
+        agent = compiler_agent.CompilerAgent(config)
+        agent.backend = llm_backends.StubBackend(response_chars=response_bytes)
+        messages = [
+            {"role": "system", "content": "Respond with a JSON object of files."},
+            {"role": "user", "content": f'Create a comprehensive workshop module for: "{TOPIC}"'}
+        ]
+        modules = iter(range(repeat))
+
+        def compile_module(_):
+            module_path = os.path.join(config.workshops_base_dir, f"workshop-{next(modules) + 1}-benchmark")
+            with agent._staged_module(module_path) as staged:
+                succeeded = agent._execute_openai_api(messages, staged.path)
+                agent._render_module_files(staged.path, TOPIC)
+                agent._publish_staged_module(staged)
+            return succeeded
+
+        stats = measure(compile_module, repeat)
+    return result(
+        "compiler.execute_api_streaming" if stream else "compiler.execute_api",
+        {"response_bytes": response_bytes, "fsync": fsync},
+        stats,
+        succeeded=bool(stats["last"])
+    )
+
+
+def bench_render_module_files(response_bytes: int, repeat: int) -> dict:
+    """
+    CompilerAgent._render_module_files: render manifest.json and README.md from the
+    templates and a staged module's sections (about `response_bytes` of markdown).
+    `rendered_chars` is the size of the two files the model no longer writes.
+    """
+    compiler_agent = load_builder_module("agents.compiler_agent")
+    llm_backends = load_builder_module("agents.llm_backends")
+    with work_directory() as work_dir:
+        config = make_config(work_dir)
+        agent = compiler_agent.CompilerAgent(config)
+        agent.backend = llm_backends.StubBackend(response_chars=response_bytes)
+        messages = [
+            {"role": "system", "content": "Respond with a JSON object of files."},
+            {"role": "user", "content": f'Create a comprehensive workshop module for: "{TOPIC}"'}
+        ]
+        module_path = os.path.join(config.workshops_base_dir, "workshop-1-benchmark")
+        with agent._staged_module(module_path) as staged:
+            agent._execute_openai_api(messages, staged.path)
+            stats = measure(lambda _: agent._render_module_files(staged.path, TOPIC), repeat)
+            rendered_chars = sum(os.path.getsize(os.path.join(staged.path, name)) for name in ("manifest.json", "README.md"))
+    return result("compiler.render_module_files", {"response_bytes": response_bytes}, stats, rendered_chars=rendered_chars)
+
+
+def run(quick: bool, repeat: int) -> list:
+    sizes = QUICK_RESEARCH_SIZES if quick else RESEARCH_SIZES
+    results = []
+    for size in sizes:
+        for packing in (True, False):
+            results.append(bench_prepare_messages(size, packing, repeat))
+    for size in sizes:
+        for stream in (False, True):
+            results.append(bench_execute_api(size, stream, repeat))
+        results.append(bench_execute_api(size, False, repeat, fsync=False))
+        results.append(bench_render_module_files(size, repeat))
+    return results
@@ -0,0 +1,129 @@
+"""GitAgent benchmarks: local git operations in a repository holding many workshop modules."""
+import contextlib
+import io
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from github_standin import GitHubStandIn
+from harness import (
+    BENCHMARK_ENV, create_workshop_modules, git, init_git_repo, load_builder_module, make_config, measure, result,
+    work_directory
+)
+
+MODULE_COUNTS = [10, 100, 1000, 10000]
+QUICK_MODULE_COUNTS = [10, 100, 1000]
+# (GIT_PUBLISH_MODE, GIT_BACKEND) combinations measured by git.publish_simulated
+PUBLISH_VARIANTS = [("checkout", "subprocess"), ("checkout", "gitpython"), ("worktree", "gitpython")]
+PARALLEL_PUBLISHES = 4
+
+
+def make_git_agent(config, repo_dir: str):
+    """A GitAgent that works on `repo_dir` and publishes without the GitHub API (local push only)."""
+    git_agent = load_builder_module("agents.git_agent")
+    with contextlib.redirect_stdout(io.StringIO()):
+        agent = git_agent.GitAgent(config)
+    agent.project_root_dir = repo_dir
+    return agent
+
+
+@contextlib.contextmanager
+def simulated_github():
+    """Route GitAgent.publish_module through its simulated (git-only) path."""
+    git_agent = load_builder_module("agents.git_agent")
+    previous = git_agent.PYGITHUB_AVAILABLE
+    git_agent.PYGITHUB_AVAILABLE = False
+    try:
+        yield
+    finally:
+        git_agent.PYGITHUB_AVAILABLE = previous
+
+
+def bench_git_repo(module_count: int, repeat: int) -> list:
+    results = []
+    with work_directory() as work_dir:
+        repo_dir = os.path.join(work_dir, "repo")
+        config = make_config(work_dir, workshops_base_dir=os.path.join(repo_dir, "workshops"))
+        create_workshop_modules(config.workshops_base_dir, module_count)
+        init_git_repo(repo_dir, remote_dir=os.path.join(work_dir, "origin.git"))
+        agent = make_git_agent(config, repo_dir)
+        params = {"modules": module_count}
+
+        stats = measure(lambda _: agent._run_git_command(["status", "--porcelain"]), repeat)
+        results.append(result("git.status", params, stats))
+
+        numbers = iter(range(module_count + 1, module_count + 1 + (len(PUBLISH_VARIANTS) + PARALLEL_PUBLISHES) * repeat))
+
+        def new_module():
+            git(repo_dir, "checkout", "-q", "main")
+            number = next(numbers)
+            module_path = os.path.join(config.workshops_base_dir, f"workshop-{number}-new-topic")
+            os.makedirs(module_path)
+            for index in range(5):
+                with open(os.path.join(module_path, f"{index:02d}_section.md"), "w", encoding="utf-8") as f:
+                    f.write(f"# Section {index}\n\nNew module {number}.\n")
+            return number, module_path
+
+        def publish(state):
+            number, module_path = state
+            return agent.publish_module(module_path, f"New Topic {number}", str(number))
+
+        for publish_mode, backend in PUBLISH_VARIANTS:
+            agent.config.git_publish_mode = publish_mode
+            agent.config.git_backend = backend
+            with simulated_github():
+                stats = measure(publish, repeat, setup=new_module)
+            results.append(result("git.publish_simulated", dict(params, mode=publish_mode, backend=backend), stats))
+
+        # Several modules published at once, each from its own worktree
+        def publish_parallel(states):
+            with ThreadPoolExecutor(max_workers=len(states)) as executor:
+                return list(executor.map(publish, states))
+
+        agent.config.git_publish_mode = "worktree"
+        with simulated_github():
+            stats = measure(publish_parallel, repeat, setup=lambda: [new_module() for _ in range(PARALLEL_PUBLISHES)])
+        results.append(result("git.publish_worktree_parallel", dict(params, publishes=PARALLEL_PUBLISHES), stats))
+    return results
+
+
+def bench_api_publish(repeat: int, agent_per_publish: bool) -> list:
+    """
+    publish_module in API publish mode against a local GitHub stand-in (no local git at all),
+    with one GitAgent for every publish (as in a daemon) or a new GitAgent per publish.
+    """
+    clients = load_builder_module("orchestrator.clients")
+    with work_directory() as work_dir, GitHubStandIn(BENCHMARK_ENV["GITHUB_REPO_OWNER"], BENCHMARK_ENV["GITHUB_REPO_NAME"]) as github:
+        config = make_config(work_dir, git_publish_mode="api", github_api_url=github.url,
+                             github_workshops_path="public/data/workshops")
+        clients.reset_clients()
+        agent = make_git_agent(config, work_dir)
+        numbers = iter(range(1, repeat + 1))
+
+        def new_module():
+            number = next(numbers)
+            module_path = os.path.join(config.workshops_base_dir, f"workshop-{number:02d}-new-topic")
+            os.makedirs(module_path)
+            for index in range(5):
+                with open(os.path.join(module_path, f"{index:02d}_section.md"), "w", encoding="utf-8") as f:
+                    f.write(f"# Section {index}\n\nNew module {number}.\n")
+            return number, module_path
+
+        def publish(state):
+            number, module_path = state
+            publisher = make_git_agent(config, work_dir) if agent_per_publish else agent
+            return publisher.publish_module(module_path, f"New Topic {number}", str(number))
+
+        stats = measure(publish, repeat, setup=new_module)
+        clients.reset_clients()
+        agents = "per_publish" if agent_per_publish else "shared"
+        return [result("git.publish_api", {"files": 6, "agents": agents}, stats,
+                       api_calls_per_publish=round(github.api_calls() / repeat, 2))]
+
+
+def run(quick: bool, repeat: int) -> list:
+    results = []
+    for count in QUICK_MODULE_COUNTS if quick else MODULE_COUNTS:
+        results.extend(bench_git_repo(count, repeat))
+    for agent_per_publish in (False, True):
+        results.extend(bench_api_publish(repeat, agent_per_publish))
+    return results
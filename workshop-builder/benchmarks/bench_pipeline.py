@@ -0,0 +1,109 @@
+"""End-to-end Orchestrator.run and Orchestrator.update benchmarks with stub backends and a local git remote."""
+import contextlib
+import io
+import os
+import statistics
+
+from bench_git import make_git_agent, simulated_github
+from harness import create_workshop_modules, init_git_repo, load_builder_module, make_config, measure, result, work_directory
+
+# Total research size per run; the stub backend splits it across the research queries
+RESEARCH_SIZES = [1024, 64 * 1024, 1024 * 1024, 5 * 1024 * 1024]
+QUICK_RESEARCH_SIZES = [1024, 64 * 1024]
+EXISTING_MODULES = 100
+
+
+def bench_pipeline(research_bytes: int, compilation_mode: str, repeat: int) -> dict:
+    orchestrator_module = load_builder_module("orchestrator.orchestrator")
+    research_agent = load_builder_module("agents.research_agent")
+    with work_directory() as work_dir:
+        repo_dir = os.path.join(work_dir, "repo")
+        config = make_config(
+            work_dir,
+            workshops_base_dir=os.path.join(repo_dir, "workshops"),
+            compilation_mode=compilation_mode,
+            # Every repetition generates the same topic; the check is measured in the workshops suite
+            duplicate_topic_action="off",
+            stub_response_chars=max(1, research_bytes // len(research_agent.ResearchAgent.FOCUS_AREAS))
+        )
+        create_workshop_modules(config.workshops_base_dir, EXISTING_MODULES)
+        init_git_repo(repo_dir, remote_dir=os.path.join(work_dir, "origin.git"))
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            orchestrator = orchestrator_module.Orchestrator(config)
+        orchestrator._git_agent = make_git_agent(config, repo_dir)
+
+        phase_samples = {}
+
+        def run_pipeline(_):
+            results = orchestrator.run("Benchmark Pipeline Topic")
+            for phase, seconds in results["phase_times"].items():
+                phase_samples.setdefault(phase, []).append(seconds)
+            return results["success"]
+
+        with simulated_github():
+            stats = measure(run_pipeline, repeat)
+
+    return result(
+        "pipeline.run",
+        {"research_bytes": research_bytes, "compilation_mode": compilation_mode},
+        stats,
+        succeeded=bool(stats["last"]),
+        phase_median_s={phase: round(statistics.median(samples), 6) for phase, samples in phase_samples.items()}
+    )
+
+
+def bench_update(sections: int, repeat: int) -> dict:
+    """Orchestrator.update of `sections` sections of a module generated by a sectioned run."""
+    orchestrator_module = load_builder_module("orchestrator.orchestrator")
+    with work_directory() as work_dir:
+        repo_dir = os.path.join(work_dir, "repo")
+        config = make_config(work_dir, workshops_base_dir=os.path.join(repo_dir, "workshops"), compilation_mode="sectioned")
+        create_workshop_modules(config.workshops_base_dir, EXISTING_MODULES)
+        init_git_repo(repo_dir, remote_dir=os.path.join(work_dir, "origin.git"))
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            orchestrator = orchestrator_module.Orchestrator(config)
+        orchestrator._git_agent = make_git_agent(config, repo_dir)
+
+        with simulated_github(), contextlib.redirect_stdout(io.StringIO()):
+            module_path = orchestrator.run("Benchmark Update Topic")["module_path"]
+        section_files = sorted(name for name in os.listdir(module_path) if name[:2].isdigit() and name.endswith(".md"))[:sections]
+
+        # Characters sent to the model per update, to compare with a full compilation
+        compiler_agent = orchestrator._get_compiler_agent()
+        chat_completion = compiler_agent.backend.chat_completion
+        prompt_chars = []
+
+        def counting_chat_completion(messages, *args, **kwargs):
+            prompt_chars[-1] += sum(len(message["content"]) for message in messages)
+            return chat_completion(messages, *args, **kwargs)
+
+        compiler_agent.backend.chat_completion = counting_chat_completion
+
+        def run_update(_):
+            prompt_chars.append(0)
+            # New instructions every time, so each update rewrites and publishes the sections
+            results = orchestrator.update(os.path.basename(module_path), section_files, instructions=f"Revision {len(prompt_chars)}")
+            return results["success"] and len(results["updated"]) == len(section_files)
+
+        with simulated_github():
+            stats = measure(run_update, repeat)
+
+    return result(
+        "pipeline.update",
+        {"sections": len(section_files)},
+        stats,
+        succeeded=bool(stats["last"]),
+        prompt_chars_median=statistics.median(prompt_chars)
+    )
+
+
+def run(quick: bool, repeat: int) -> list:
+    results = []
+    for size in QUICK_RESEARCH_SIZES if quick else RESEARCH_SIZES:
+        results.append(bench_pipeline(size, "single", repeat))
+    results.append(bench_pipeline(64 * 1024, "sectioned", repeat))
+    for sections in (1, 3):
+        results.append(bench_update(sections, repeat))
+    return results
@@ -0,0 +1,67 @@
+"""Workshop directory benchmarks: next-number lookups (directory scan vs. workshop index), duplicate and similar-topic lookups and module allocation as the workshops directory grows."""
+import os
+
+from harness import create_workshop_modules, load_builder_module, make_config, measure, result, work_directory
+
+MODULE_COUNTS = [10, 100, 1000, 10000]
+QUICK_MODULE_COUNTS = [10, 100, 1000]
+
+
+def bench_workshops_dir(module_count: int, repeat: int) -> list:
+    compiler_agent = load_builder_module("agents.compiler_agent")
+    workshop_allocator = load_builder_module("agents.workshop_allocator")
+    results = []
+    with work_directory() as work_dir:
+        config = make_config(work_dir)
+        create_workshop_modules(config.workshops_base_dir, module_count)
+        agent = compiler_agent.CompilerAgent(config)
+        params = {"modules": module_count}
+
+        index_path = os.path.join(config.workshops_base_dir, workshop_allocator.WorkshopNumberAllocator.LEDGER_DIR_NAME, "index.sqlite3")
+
+        def drop_index():
+            agent._index = None
+            if os.path.exists(index_path):
+                os.remove(index_path)
+
+        config.workshop_index_enabled = False
+        stats = measure(lambda _: agent._determine_next_workshop_number(), repeat)
+        results.append(result("workshops.scan_next_number", dict(params, index=False), stats, next_number=stats["last"]))
+
+        config.workshop_index_enabled = True
+        stats = measure(lambda _: agent._determine_next_workshop_number(), repeat, setup=drop_index)
+        results.append(result("workshops.index_rebuild", params, stats, next_number=stats["last"]))
+
+        stats = measure(lambda _: agent._determine_next_workshop_number(), repeat)
+        results.append(result("workshops.scan_next_number", dict(params, index=True), stats, next_number=stats["last"]))
+
+        stats = measure(lambda _: agent.find_existing_modules(f"Benchmark Topic {module_count // 2}"), repeat)
+        results.append(result("workshops.find_existing_modules", params, stats, matches=len(stats["last"])))
+
+        agent._similarity_index = None
+        stats = measure(lambda _: agent.find_similar_modules("Benchmark Topics", config.duplicate_topic_threshold), 1)
+        results.append(result("workshops.find_similar_modules_cold", params, stats, matches=len(stats["last"])))
+
+        stats = measure(lambda _: agent.find_similar_modules(f"Benchmark Topic {module_count // 2}", config.duplicate_topic_threshold), repeat)
+        results.append(result("workshops.find_similar_modules", params, stats, matches=len(stats["last"])))
+
+        topics = iter(range(repeat * 2))
+        hint_path = os.path.join(config.workshops_base_dir, workshop_allocator.WorkshopNumberAllocator.LEDGER_DIR_NAME, "next")
+
+        def remove_hint():
+            if os.path.exists(hint_path):
+                os.remove(hint_path)
+
+        stats = measure(lambda _: agent._reserve_module_directory(f"Topic {next(topics)}"), repeat, setup=remove_hint)
+        results.append(result("workshops.allocate_module_cold", params, stats))
+
+        stats = measure(lambda _: agent._reserve_module_directory(f"Topic {next(topics)}"), repeat)
+        results.append(result("workshops.allocate_module", params, stats))
+    return results
+
+
+def run(quick: bool, repeat: int) -> list:
+    results = []
+    for count in QUICK_MODULE_COUNTS if quick else MODULE_COUNTS:
+        results.extend(bench_workshops_dir(count, repeat))
+    return results
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Compare two benchmark result files and report regressions.
+
+Usage:
+    python benchmarks/compare.py BASELINE.json CURRENT.json [--threshold 0.2] [--min-seconds 0.001]
+
+Benchmarks are matched by name and parameters and compared on their median time.
+Exits with status 1 when any benchmark is slower than the baseline by more than
+the threshold (ignoring benchmarks faster than --min-seconds in both runs, where
+timer noise dominates).
+"""
+import argparse
+import json
+import sys
+
+
+def load_results(path: str) -> dict:
+    with open(path, "r", encoding="utf-8") as f:
+        report = json.load(f)
+    return {
+        (entry["name"], json.dumps(entry["params"], sort_keys=True)): entry
+        for entry in report["benchmarks"]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files.")
+    parser.add_argument("baseline", help="Baseline results (e.g. from the main branch).")
+    parser.add_argument("current", help="Results to check against the baseline.")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed slowdown as a fraction (default: 0.2 = 20%%).")
+    parser.add_argument("--min-seconds", type=float, default=0.001, help="Ignore benchmarks below this median time (default: 0.001).")
+    args = parser.parse_args()
+
+    baseline = load_results(args.baseline)
+    current = load_results(args.current)
+    regressions = []
+
+    for key in sorted(current):
+        name, params = key
+        if key not in baseline:
+            print(f"NEW        {name} {params}")
+            continue
+        before = baseline[key]["median_s"]
+        after = current[key]["median_s"]
+        ratio = after / before if before else float("inf")
+        status = "ok"
+        if max(before, after) >= args.min_seconds and ratio > 1 + args.threshold:
+            status = "REGRESSION"
+            regressions.append(key)
+        elif max(before, after) >= args.min_seconds and ratio < 1 - args.threshold:
+            status = "faster"
+        print(f"{status:<10} {name} {params}: {before * 1000:.2f} ms -> {after * 1000:.2f} ms ({ratio:.2f}x)")
+
+    for key in sorted(set(baseline) - set(current)):
+        print(f"MISSING    {key[0]} {key[1]}")
+
+    if regressions:
+        print(f"\n{len(regressions)} benchmark(s) regressed by more than {args.threshold:.0%}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
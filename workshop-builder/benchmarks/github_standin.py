@@ -0,0 +1,240 @@
+"""
+A local HTTP stand-in for the subset of the GitHub REST API used by GitAgent.
+
+It serves one repository from memory: branches and refs, the Git Data API (blobs,
+trees, commits), pull requests and labels. Trees are stored flattened (path ->
+blob), which is enough to check what a publish committed. GET responses carry an
+ETag and conditional requests that match it get 304 Not Modified. Every request is
+counted per route, so benchmarks can report API calls as well as time.
+
+Point the agent at it with `config.github_api_url = standin.url`.
+"""
+import base64
+import hashlib
+import json
+import re
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+
+
+def _sha(kind: str, payload) -> str:
+    data = payload if isinstance(payload, bytes) else json.dumps(payload, sort_keys=True).encode("utf-8")
+    return hashlib.sha1(kind.encode("ascii") + b"\0" + data).hexdigest()
+
+
+class GitHubStandIn:
+    """In-memory repository `owner/name` with `default_branch`, served on 127.0.0.1."""
+
+    def __init__(self, owner: str, name: str, default_branch: str = "main", labels=("workshop", "content")):
+        self.owner = owner
+        self.name = name
+        self.default_branch = default_branch
+        self.labels = list(labels)
+        self.blobs: Dict[str, bytes] = {}
+        self.trees: Dict[str, Dict[str, str]] = {}  # tree sha -> {path: blob sha}
+        self.commits: Dict[str, dict] = {}
+        self.refs: Dict[str, str] = {}  # "heads/<branch>" -> commit sha
+        self.pulls = []
+        self.requests = Counter()
+        self.not_modified = Counter()  # conditional GETs answered with 304, by route
+        self._lock = threading.Lock()
+
+        root_tree = self._store_tree({"README.md": self._store_blob(b"# Website\n")})
+        self.refs[f"heads/{default_branch}"] = self._store_commit("Initial commit", root_tree, [])
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def repo_url(self) -> str:
+        return f"{self.url}/repos/{self.owner}/{self.name}"
+
+    def __enter__(self) -> "GitHubStandIn":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._server.shutdown()
+        self._server.server_close()
+
+    # Object store -----------------------------------------------------------------
+
+    def _store_blob(self, data: bytes) -> str:
+        sha = _sha("blob", data)
+        self.blobs[sha] = data
+        return sha
+
+    def _store_tree(self, entries: Dict[str, str]) -> str:
+        sha = _sha("tree", entries)
+        self.trees[sha] = dict(entries)
+        return sha
+
+    def _store_commit(self, message: str, tree: str, parents: list) -> str:
+        commit = {"message": message, "tree": tree, "parents": list(parents)}
+        sha = _sha("commit", dict(commit, n=len(self.commits)))
+        self.commits[sha] = commit
+        return sha
+
+    def branch_files(self, branch: str) -> Dict[str, bytes]:
+        """Path -> content of every file at the tip of `branch`."""
+        tree = self.trees[self.commits[self.refs[f"heads/{branch}"]]["tree"]]
+        return {path: self.blobs[sha] for path, sha in tree.items()}
+
+    def api_calls(self) -> int:
+        return sum(self.requests.values())
+
+    # JSON representations ------------------------------------------------------------
+
+    def _repo_json(self) -> dict:
+        return {
+            "id": 1, "name": self.name, "full_name": f"{self.owner}/{self.name}",
+            "owner": {"login": self.owner}, "default_branch": self.default_branch, "url": self.repo_url,
+        }
+
+    def _commit_json(self, sha: str) -> dict:
+        commit = self.commits[sha]
+        return {
+            "sha": sha, "url": f"{self.repo_url}/git/commits/{sha}", "message": commit["message"],
+            "tree": {"sha": commit["tree"], "url": f"{self.repo_url}/git/trees/{commit['tree']}"},
+            "parents": [{"sha": parent, "url": f"{self.repo_url}/git/commits/{parent}"} for parent in commit["parents"]],
+        }
+
+    def _ref_json(self, ref: str) -> dict:
+        sha = self.refs[ref]
+        return {
+            "ref": f"refs/{ref}", "url": f"{self.repo_url}/git/refs/{ref}",
+            "object": {"sha": sha, "type": "commit", "url": f"{self.repo_url}/git/commits/{sha}"},
+        }
+
+    def _tree_json(self, sha: str) -> dict:
+        return {
+            "sha": sha, "url": f"{self.repo_url}/git/trees/{sha}",
+            "tree": [{"path": path, "mode": "100644", "type": "blob", "sha": blob} for path, blob in sorted(self.trees[sha].items())],
+        }
+
+    def _label_json(self, name: str) -> dict:
+        return {"name": name, "color": "ededed", "url": f"{self.repo_url}/labels/{name}"}
+
+    # Routes ---------------------------------------------------------------------------
+
+    def handle(self, method: str, path: str, body: Optional[dict]):
+        """Return (status, json) for one request; `path` is relative to the repository URL."""
+        if method == "GET" and path == "":
+            return 200, self._repo_json()
+        match = re.fullmatch(r"/branches/(.+)", path)
+        if method == "GET" and match:
+            ref = f"heads/{match.group(1)}"
+            if ref not in self.refs:
+                return 404, {"message": "Branch not found"}
+            sha = self.refs[ref]
+            return 200, {"name": match.group(1), "commit": {"sha": sha, "url": f"{self.repo_url}/commits/{sha}",
+                                                           "commit": self._commit_json(sha)}}
+        if method == "POST" and path == "/git/refs":
+            ref = body["ref"][len("refs/"):]
+            if ref in self.refs:
+                return 422, {"message": "Reference already exists"}
+            self.refs[ref] = body["sha"]
+            return 201, self._ref_json(ref)
+        match = re.fullmatch(r"/git/refs?/(.+)", path)
+        if match:
+            ref = match.group(1)
+            if ref not in self.refs:
+                return 404, {"message": "Not Found"}
+            if method == "PATCH":
+                self.refs[ref] = body["sha"]
+            return 200, self._ref_json(ref)
+        match = re.fullmatch(r"/git/commits/(\w+)", path)
+        if method == "GET" and match:
+            if match.group(1) not in self.commits:
+                return 404, {"message": "Not Found"}
+            return 200, self._commit_json(match.group(1))
+        if method == "POST" and path == "/git/blobs":
+            data = base64.b64decode(body["content"]) if body.get("encoding") == "base64" else body["content"].encode("utf-8")
+            sha = self._store_blob(data)
+            return 201, {"sha": sha, "url": f"{self.repo_url}/git/blobs/{sha}"}
+        if method == "POST" and path == "/git/trees":
+            entries = dict(self.trees[body["base_tree"]]) if body.get("base_tree") else {}
+            for element in body["tree"]:
+                if "content" in element:
+                    entries[element["path"]] = self._store_blob(element["content"].encode("utf-8"))
+                elif element.get("sha") is None:
+                    entries.pop(element["path"], None)
+                else:
+                    entries[element["path"]] = element["sha"]
+            return 201, self._tree_json(self._store_tree(entries))
+        if method == "POST" and path == "/git/commits":
+            sha = self._store_commit(body["message"], body["tree"], body.get("parents", []))
+            return 201, self._commit_json(sha)
+        if method == "POST" and path == "/pulls":
+            number = len(self.pulls) + 1
+            pull = {
+                "number": number, "title": body["title"], "body": body.get("body"), "labels": [],
+                "head": {"ref": body["head"]}, "base": {"ref": body["base"]},
+                "url": f"{self.repo_url}/pulls/{number}", "issue_url": f"{self.repo_url}/issues/{number}",
+                "html_url": f"https://github.test/{self.owner}/{self.name}/pull/{number}",
+            }
+            self.pulls.append(pull)
+            return 201, pull
+        if method == "GET" and path == "/labels":
+            return 200, [self._label_json(name) for name in self.labels]
+        match = re.fullmatch(r"/issues/(\d+)/labels", path)
+        if method == "POST" and match:
+            pull = self.pulls[int(match.group(1)) - 1]
+            pull["labels"].extend(body["labels"] if isinstance(body, dict) else body)
+            return 200, [self._label_json(name) for name in pull["labels"]]
+        return 404, {"message": f"Not implemented by the stand-in: {method} {path}"}
+
+    def _handler_class(self):
+        standin = self
+        prefix = f"/repos/{self.owner}/{self.name}"
+
+        class Handler(BaseHTTPRequestHandler):
+            def _respond(self, method: str):
+                path = self.path.split("?", 1)[0]
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length)) if length else None
+                route = path
+                if path.startswith(prefix):
+                    with standin._lock:
+                        route = re.sub(r"/[0-9a-f]{40}$|/\d+(?=/|$)", "/:id", path[len(prefix):]) or "/"
+                        standin.requests[f"{method} {route}"] += 1
+                        status, payload = standin.handle(method, path[len(prefix):], body)
+                else:
+                    status, payload = 404, {"message": "Not Found"}
+                data = json.dumps(payload).encode("utf-8")
+                etag = f'"{hashlib.sha1(data).hexdigest()}"' if method == "GET" and status == 200 else None
+                if etag and self.headers.get("If-None-Match") == etag:
+                    with standin._lock:
+                        standin.not_modified[f"{method} {route}"] += 1
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(data)))
+                if etag:
+                    self.send_header("ETag", etag)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                self._respond("GET")
+
+            def do_POST(self):
+                self._respond("POST")
+
+            def do_PATCH(self):
+                self._respond("PATCH")
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
@@ -0,0 +1,187 @@
+"""
+Shared helpers for the Workshop Builder benchmarks.
+
+The workshop-builder directory is not an installable package (its modules use
+relative imports between `agents` and `orchestrator`), so the benchmarks register
+it in `sys.modules` under the name `workshop_builder` and import from there.
+Every benchmark runs against the stub LLM backend and temporary directories, so
+no network access, API keys or changes to the real workshops are needed.
+"""
+import contextlib
+import importlib
+import io
+import logging
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import types
+from typing import Callable, Optional
+
+BUILDER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PACKAGE_NAME = "workshop_builder"
+
+# Environment for every benchmark: stub backends, no persistent caches, quiet logs
+BENCHMARK_ENV = {
+    "LLM_BACKEND": "stub",
+    "STUB_LATENCY_MS": "0",
+    "STUB_TOKENS_PER_SECOND": "0",
+    "RESEARCH_CACHE_ENABLED": "false",
+    "COMPLETION_CACHE_ENABLED": "false",
+    "COMPILATION_MODE": "single",
+    "OPENAI_STREAM_COMPILATION": "false",
+    "GITHUB_TOKEN": "benchmark-token",
+    "GITHUB_REPO_OWNER": "benchmark-owner",
+    "GITHUB_REPO_NAME": "benchmark-repo",
+    # The GitHub stand-in has no secondary rate limits; measure the client, not its pauses
+    "GITHUB_SECONDS_BETWEEN_REQUESTS": "0",
+    "GITHUB_SECONDS_BETWEEN_WRITES": "0",
+    "LOG_LEVEL": "WARNING",
+}
+
+
+def load_builder_module(name: str):
+    """Import `workshop_builder.<name>`, registering the workshop-builder directory as a package first."""
+    if PACKAGE_NAME not in sys.modules:
+        package = types.ModuleType(PACKAGE_NAME)
+        package.__path__ = [BUILDER_DIR]
+        sys.modules[PACKAGE_NAME] = package
+        # The orchestrator package must be imported before the agents package
+        importlib.import_module(f"{PACKAGE_NAME}.orchestrator")
+    return importlib.import_module(f"{PACKAGE_NAME}.{name}")
+
+
+def make_config(work_dir: str, **overrides):
+    """Build an AppConfig whose data directories all live under `work_dir`."""
+    os.environ.update(BENCHMARK_ENV)
+    config_module = load_builder_module("orchestrator.config")
+    with contextlib.redirect_stdout(io.StringIO()):
+        config = config_module.AppConfig()
+    config.workshops_base_dir = os.path.join(work_dir, "workshops")
+    config.temp_data_dir = os.path.join(work_dir, "temp_research_data")
+    config.checkpoint_dir = os.path.join(work_dir, "run_checkpoints")
+    config.research_cache_dir = os.path.join(work_dir, "research_cache")
+    config.completion_cache_path = os.path.join(work_dir, "compile_cache", "completions.sqlite3")
+    for key, value in overrides.items():
+        setattr(config, key, value)
+    os.makedirs(config.workshops_base_dir, exist_ok=True)
+    logging.getLogger().setLevel(logging.WARNING)
+    return config
+
+
+@contextlib.contextmanager
+def work_directory(prefix: str = "wb-bench-"):
+    path = tempfile.mkdtemp(prefix=prefix)
+    try:
+        yield path
+    finally:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def measure(fn: Callable, repeat: int, setup: Optional[Callable] = None) -> dict:
+    """
+    Call `fn(state)` `repeat` times, where `state` comes from `setup()` (untimed).
+
+    Returns:
+        dict: repeat, min_s, median_s, mean_s, max_s and the last return value under "last"
+    """
+    samples = []
+    last = None
+    for _ in range(repeat):
+        state = setup() if setup else None
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            last = fn(state)
+            samples.append(time.perf_counter() - start)
+    return {
+        "repeat": repeat,
+        "min_s": round(min(samples), 6),
+        "median_s": round(statistics.median(samples), 6),
+        "mean_s": round(statistics.fmean(samples), 6),
+        "max_s": round(max(samples), 6),
+        "last": last,
+    }
+
+
+def synthetic_paragraphs(total_bytes: int, seed: str) -> str:
+    """Deterministic research-like text of roughly `total_bytes` bytes (a share of paragraphs repeat)."""
+    paragraphs = []
+    size = 0
+    index = 0
+    while size < total_bytes:
+        # Every fifth paragraph repeats an earlier one, as overlapping research responses do
+        number = index - 3 if index % 5 == 4 else index
+        paragraph = (
+            f"{seed} note {number}: retrieval, indexing and evaluation interact in ways that shape "
+            f"the design; this paragraph describes trade-off {number % 17} with an example and a caveat."
+        )
+        paragraphs.append(paragraph)
+        size += len(paragraph) + 2
+        index += 1
+    return "\n\n".join(paragraphs)
+
+
+def write_research_files(directory: str, topic: str, total_bytes: int) -> list:
+    """Write research files in the ResearchAgent layout, `total_bytes` in total across the focus areas."""
+    research_agent = load_builder_module("agents.research_agent")
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    areas = research_agent.ResearchAgent.FOCUS_AREAS
+    for area in areas:
+        path = os.path.join(directory, f"{topic.replace(' ', '_').lower()}_{area}.txt")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(f"# Deep Research: {topic} - {area.replace('_', ' ').title()}\n\n")
+            f.write(f"Research Query: benchmark query for {area}\n\n")
+            f.write("=" * 80 + "\n\n")
+            f.write(synthetic_paragraphs(total_bytes // len(areas), area))
+            f.write("\n\n" + "=" * 80 + "\n")
+            f.write("Generated by stub for Workshop Builder\n")
+        paths.append(path)
+    return paths
+
+
+def create_workshop_modules(workshops_dir: str, count: int, files_per_module: int = 3) -> None:
+    """Create `count` small workshop modules named like the CompilerAgent's output."""
+    os.makedirs(workshops_dir, exist_ok=True)
+    for number in range(1, count + 1):
+        module_path = os.path.join(workshops_dir, f"workshop-{number}-benchmark-topic-{number}")
+        os.makedirs(module_path, exist_ok=True)
+        for index in range(files_per_module):
+            with open(os.path.join(module_path, f"{index:02d}_section.md"), "w", encoding="utf-8") as f:
+                f.write(f"# Section {index}\n\nBenchmark module {number}.\n")
+
+
+def git(repo_dir: str, *args: str) -> str:
+    result = subprocess.run(["git", *args], cwd=repo_dir, capture_output=True, text=True, check=True)
+    return result.stdout.strip()
+
+
+def init_git_repo(repo_dir: str, remote_dir: Optional[str] = None) -> None:
+    """Create a git repository (with a local bare `origin` when `remote_dir` is given) and commit its contents."""
+    os.makedirs(repo_dir, exist_ok=True)
+    git(repo_dir, "init", "-q", "-b", "main")
+    git(repo_dir, "config", "user.email", "benchmark@example.com")
+    git(repo_dir, "config", "user.name", "Benchmark")
+    git(repo_dir, "config", "commit.gpgsign", "false")
+    git(repo_dir, "add", "-A")
+    git(repo_dir, "commit", "-q", "--allow-empty", "-m", "Benchmark baseline")
+    if remote_dir:
+        subprocess.run(["git", "init", "-q", "--bare", remote_dir], capture_output=True, check=True)
+        git(repo_dir, "remote", "add", "origin", remote_dir)
+        git(repo_dir, "push", "-q", "origin", "main")
+
+
+def git_commit_id() -> Optional[str]:
+    try:
+        return git(BUILDER_DIR, "rev-parse", "HEAD")
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def result(name: str, params: dict, stats: dict, **extra) -> dict:
+    """Shape one benchmark measurement for the JSON report."""
+    stats = {key: value for key, value in stats.items() if key != "last"}
+    return {"name": name, "params": params, **stats, "extra": extra}
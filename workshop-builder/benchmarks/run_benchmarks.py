@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Run the Workshop Builder benchmark suite and write the results as JSON.
+
+Usage:
+    python benchmarks/run_benchmarks.py [--quick] [--repeat N] [--suite NAME ...] [--output PATH]
+
+Compare two result files with `benchmarks/compare.py`.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import bench_compiler
+import bench_git
+import bench_pipeline
+import bench_workshops
+from harness import git_commit_id
+
+SUITES = {
+    "compiler": bench_compiler,
+    "workshops": bench_workshops,
+    "git": bench_git,
+    "pipeline": bench_pipeline,
+}
+SCHEMA_VERSION = 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Workshop Builder pipeline against stub backends.")
+    parser.add_argument("--quick", action="store_true", help="Skip the largest inputs (5 MB research, 10,000 modules).")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed repetitions per benchmark (default: 3).")
+    parser.add_argument("--suite", action="append", choices=sorted(SUITES), help="Only run the given suite (repeatable).")
+    parser.add_argument("--output", type=str, help="Write the JSON results to this file instead of stdout.")
+    args = parser.parse_args()
+
+    report = {
+        "schema_version": SCHEMA_VERSION,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "git_commit": git_commit_id(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "quick": args.quick,
+        "repeat": args.repeat,
+        "benchmarks": []
+    }
+
+    for name in args.suite or list(SUITES):
+        print(f"Running {name} benchmarks...", file=sys.stderr)
+        for entry in SUITES[name].run(args.quick, args.repeat):
+            report["benchmarks"].append(entry)
+            print(f"  {entry['name']:<36} {json.dumps(entry['params']):<52} median {entry['median_s'] * 1000:10.2f} ms", file=sys.stderr)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+        print(f"Results written to {args.output}", file=sys.stderr)
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,27 +1,63 @@
 import argparse
 import logging
 import os
+import sys
 # from dotenv import load_dotenv # Handled in AppConfig
-
-# Assuming orchestrator and config will be in an 'orchestrator' subdirectory
-from orchestrator import Orchestrator, AppConfig
+# The orchestrator (and the SDKs behind it) are imported after argument parsing so `--help` stays fast
 
 
 def main():
     parser = argparse.ArgumentParser(description="CLI tool to generate workshop modules using AI agents.")
-    parser.add_argument("--topic", type=str, required=True, help="The topic for the workshop to be generated.")
+    target_group = parser.add_mutually_exclusive_group(required=True)
+    target_group.add_argument("--topic", type=str, help="The topic for the workshop to be generated.")
+    target_group.add_argument("--topics-file", type=str, metavar="PATH", help="Generate a workshop for every topic in a text, YAML or JSONL file.")
+    target_group.add_argument("--resume", type=str, metavar="RUN_ID", help="Resume a failed run, skipping the phases it already completed.")
+    target_group.add_argument("--update", type=str, metavar="MODULE", help="Regenerate --sections of an existing workshop module (directory name or path) without new research.")
+    parser.add_argument("--sections", nargs="+", metavar="FILE", help="Update mode: section files to regenerate, e.g. 02_hands_on.md.")
+    parser.add_argument("--instructions", type=str, help="Update mode: what to change or improve in the regenerated sections.")
+    parser.add_argument("--research-workers", type=int, help="Batch mode: topics researched concurrently (default: BATCH_RESEARCH_WORKERS).")
+    parser.add_argument("--compile-workers", type=int, help="Batch mode: topics compiled concurrently (default: BATCH_COMPILE_WORKERS).")
+    parser.add_argument("--publish-workers", type=int, help="Batch mode: topics published concurrently in worktree or API publish mode (default: BATCH_PUBLISH_WORKERS).")
+    parser.add_argument("--single-pr", action="store_true", help="Batch mode: publish all generated workshops together in one branch and pull request.")
+    parser.add_argument("--allow-duplicate", action="store_true", help="Generate topics that resemble an existing workshop module even with DUPLICATE_TOPIC_ACTION=skip (same as DUPLICATE_TOPIC_ACTION=warn, the default).")
     parser.add_argument("--verbose", action="store_true", help="Enable verbose logging.")
+    parser.add_argument("--trace", action="store_true", help="Write per-phase and per-call trace spans to TRACE_DIR (same as TRACING_ENABLED=true).")
+    cache_group = parser.add_mutually_exclusive_group()
+    cache_group.add_argument("--no-cache", action="store_true", help="Disable the research and compilation response caches for this run.")
+    cache_group.add_argument("--refresh", action="store_true", help="Ignore cached research and compilation responses and re-query, updating the caches.")
+    network_group = parser.add_mutually_exclusive_group()
+    network_group.add_argument("--preflight", action="store_true", help="Check connectivity to OpenAI, Gemini and GitHub before starting, and stop if any check fails.")
+    network_group.add_argument("--offline", action="store_true", help="Dry run: plan the run for each topic without making any network calls.")
 
     args = parser.parse_args()
+    if args.offline and (args.resume or args.update):
+        parser.error("--offline cannot be combined with --resume or --update")
+    if bool(args.update) != bool(args.sections):
+        parser.error("--update and --sections must be given together")
+    if args.instructions and not args.update:
+        parser.error("--instructions requires --update")
+
+    # Assuming orchestrator and config will be in an 'orchestrator' subdirectory
+    from orchestrator import Orchestrator, AppConfig, BatchRunner, load_topics, preflight
 
-    config = AppConfig()
+    config = AppConfig(offline=args.offline)
+    if args.no_cache:
+        config.research_cache_enabled = False
+        config.completion_cache_enabled = False
+    if args.refresh:
+        config.research_cache_refresh = True
+        config.completion_cache_refresh = True
+    if args.trace:
+        config.tracing_enabled = True
+    if args.allow_duplicate and config.duplicate_topic_action == "skip":
+        config.duplicate_topic_action = "warn"
 
     log_level = logging.DEBUG if args.verbose else getattr(logging, config.log_level, logging.INFO)
     logging.basicConfig(level=log_level, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
     
     logger = logging.getLogger(__name__)
     logger.info("Workshop Builder CLI started.")
-    logger.debug(f"Arguments: Topic='{args.topic}', Verbose={args.verbose}")
+    logger.debug(f"Arguments: Topic='{args.topic}', TopicsFile={args.topics_file}, Resume={args.resume}, Update={args.update}, Sections={args.sections}, Verbose={args.verbose}, NoCache={args.no_cache}, Refresh={args.refresh}, Preflight={args.preflight}, Offline={args.offline}")
     logger.debug(f"Configuration loaded. Log level: {config.log_level}")
 
 
@@ -34,9 +70,35 @@ def main():
         logger.debug(f"Resolved workshops_base_dir to: {config.workshops_base_dir}")
 
 
+    if args.preflight:
+        checks = preflight(config, logger=logger)
+        failed = [service for service, check in checks.items() if not check["ok"]]
+        for service, check in checks.items():
+            print(f"{'✅' if check['ok'] else '❌'} {service}: {check['detail']}")
+        if failed:
+            print(f"Error: preflight failed for {', '.join(failed)}")
+            sys.exit(1)
+
     orchestrator = Orchestrator(config)
     try:
-        orchestrator.run(args.topic)
+        if args.offline:
+            topics = load_topics(args.topics_file) if args.topics_file else [args.topic]
+            for topic in topics:
+                orchestrator.dry_run(topic)
+        elif args.topics_file:
+            topics = load_topics(args.topics_file)
+            batch_runner = BatchRunner(
+                orchestrator,
+                research_workers=args.research_workers or config.batch_research_workers,
+                compile_workers=args.compile_workers or config.batch_compile_workers,
+                publish_workers=args.publish_workers or config.batch_publish_workers,
+                single_pr=args.single_pr
+            )
+            batch_runner.run(topics)
+        elif args.update:
+            orchestrator.update(args.update, args.sections, instructions=args.instructions)
+        else:
+            orchestrator.run(args.topic, resume_run_id=args.resume)
     except Exception as e:
         logger.error(f"An error occurred during workshop generation: {e}", exc_info=True)
         print(f"Error: {e}")
@@ -0,0 +1,11 @@
+"""
+pytest setup. The agents and orchestrator modules import each other relatively, so
+tests load them as the `workshop_builder` package with the benchmarks' helper:
+
+    from harness import load_builder_module
+    module_writer = load_builder_module("agents.module_writer")
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks"))
@@ -1,5 +1,18 @@
 # This file makes the 'orchestrator' directory a Python package.
 from .config import AppConfig
 from .orchestrator import Orchestrator
+from .research_cache import ResearchCache
+from .checkpoints import CheckpointStore, CheckpointError
+from .batch import BatchRunner, BatchError, load_topics
+from .clients import ClientFactoryError, preflight
+from .tracing import Tracer, get_tracer, configure_tracing
+from .rate_limiter import RateLimiter, get_rate_limiter
 
-__all__ = ["AppConfig", "Orchestrator"]
\ No newline at end of file
+__all__ = [
+    "AppConfig", "Orchestrator", "ResearchCache",
+    "CheckpointStore", "CheckpointError",
+    "BatchRunner", "BatchError", "load_topics",
+    "ClientFactoryError", "preflight",
+    "Tracer", "get_tracer", "configure_tracing",
+    "RateLimiter", "get_rate_limiter"
+]
\ No newline at end of file
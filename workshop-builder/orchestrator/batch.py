@@ -0,0 +1,136 @@
+import json
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+
+class BatchError(Exception):
+    """Custom exception for batch run errors."""
+    pass
+
+
+def load_topics(topics_file: str) -> List[str]:
+    """
+    Load workshop topics from a file.
+
+    Supported formats (chosen by extension):
+    - `.yaml`/`.yml`: a list of topics, a list of `{topic: ...}` mappings, or a mapping with a `topics` list
+    - `.jsonl`: one JSON string or `{"topic": ...}` object per line
+    - anything else: plain text, one topic per line; blank lines and `#` comments are ignored
+    """
+    if not os.path.exists(topics_file):
+        raise BatchError(f"Topics file not found: {topics_file}")
+
+    extension = os.path.splitext(topics_file)[1].lower()
+    with open(topics_file, "r", encoding="utf-8") as f:
+        raw = f.read()
+
+    if extension in (".yaml", ".yml"):
+        import yaml
+        try:
+            data = yaml.safe_load(raw) or []
+        except yaml.YAMLError as e:
+            raise BatchError(f"Invalid YAML in topics file {topics_file}: {e}")
+        if isinstance(data, dict):
+            data = data.get("topics", [])
+        entries = data
+    elif extension == ".jsonl":
+        entries = []
+        for line_number, line in enumerate(raw.splitlines(), start=1):
+            if not line.strip():
+                continue
+            try:
+                entries.append(json.loads(line))
+            except json.JSONDecodeError as e:
+                raise BatchError(f"Invalid JSON on line {line_number} of {topics_file}: {e}")
+    else:
+        entries = [line for line in raw.splitlines() if line.strip() and not line.strip().startswith("#")]
+
+    if not isinstance(entries, list):
+        raise BatchError(f"Topics file {topics_file} must contain a list of topics")
+
+    topics = []
+    for entry in entries:
+        topic = entry.get("topic") if isinstance(entry, dict) else entry
+        if not isinstance(topic, str) or not topic.strip():
+            raise BatchError(f"Invalid topic entry in {topics_file}: {entry!r}")
+        topics.append(topic.strip())
+
+    if not topics:
+        raise BatchError(f"No topics found in {topics_file}")
+    return topics
+
+
+class BatchRunner:
+    """
+    Runs many workshop pipelines in one process through a shared Orchestrator.
+
+    Every topic runs the normal `Orchestrator.run` pipeline on a worker thread.
+    The orchestrator bounds research, compilation and publishing separately
+    (publishing is serialised in checkout publish mode), so the
+    worker pool only needs to be large enough to keep every phase busy.
+
+    With `single_pr`, topics stop after compilation and every workshop that was
+    created is published together at the end: one branch, one push, one PR.
+    """
+
+    def __init__(self, orchestrator, research_workers: int, compile_workers: int, publish_workers: int = 1,
+                 single_pr: bool = False, logger: Optional[logging.Logger] = None):
+        self.orchestrator = orchestrator
+        self.research_workers = max(1, research_workers)
+        self.compile_workers = max(1, compile_workers)
+        self.publish_workers = max(1, publish_workers)
+        self.single_pr = single_pr
+        self.logger = logger or logging.getLogger(__name__)
+        self.orchestrator.configure_concurrency(self.research_workers, self.compile_workers, self.publish_workers)
+
+    def run(self, topics: List[str]) -> List[dict]:
+        """Generate a workshop for every topic. Failed topics are reported, not raised."""
+        # Extra workers let topics publish while the other phases stay saturated
+        max_workers = min(len(topics), self.research_workers + self.compile_workers + self.publish_workers)
+        self.logger.info(
+            f"📚 Batch run: {len(topics)} topics with {self.research_workers} research and "
+            f"{self.compile_workers} compile workers"
+        )
+
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="batch") as executor:
+            results = list(executor.map(self._run_topic, topics))
+
+        if self.single_pr:
+            self._publish_together(results)
+
+        self._print_batch_summary(results)
+        return results
+
+    def _run_topic(self, topic: str) -> dict:
+        try:
+            return self.orchestrator.run(topic, publish=not self.single_pr)
+        except Exception as e:
+            self.logger.error(f"Batch topic '{topic}' failed: {e}")
+            return {'topic': topic, 'success': False, 'error': str(e)}
+
+    def _publish_together(self, results: List[dict]):
+        try:
+            self.orchestrator.publish_batch(results)
+        except Exception as e:
+            self.logger.error(f"Batch publish failed: {e}")
+            for result in results:
+                if result.get('success') and not result.get('pr_url'):
+                    result['success'] = False
+                    result['error'] = f"Publishing failed (resume with --resume {result['run_id']}): {e}"
+
+    def _print_batch_summary(self, results: List[dict]):
+        """Print a summary of every topic in the batch."""
+        succeeded = [r for r in results if r.get('success')]
+        print("\n" + "="*80)
+        print(f"📚 BATCH GENERATION FINISHED: {len(succeeded)}/{len(results)} workshops created")
+        print("="*80)
+        for result in results:
+            if result.get('success'):
+                print(f"✅ {result['topic']}: {result['pr_url']}")
+            elif result.get('skipped'):
+                print(f"⏭️  {result['topic']}: {result.get('error')}")
+            else:
+                print(f"❌ {result['topic']}: {result.get('error')}")
+        print("="*80)
@@ -0,0 +1,109 @@
+import json
+import logging
+import os
+import re
+import tempfile
+import time
+import uuid
+from typing import Optional
+
+
+class CheckpointError(Exception):
+    """Custom exception for checkpoint store errors."""
+    pass
+
+
+class CheckpointStore:
+    """
+    Persists the outputs of each pipeline phase so a failed run can be resumed.
+
+    Each run is identified by a run ID and stored as `<checkpoint_dir>/<run_id>.json`:
+
+        {
+          "run_id": "...", "topic": "...", "status": "running|failed|compiled|completed",
+          "created_at": ..., "updated_at": ...,
+          "phases": {
+            "research": {"completed_at": ..., "research_data_paths": [...]},
+            "compile":  {"completed_at": ..., "module_path": "...", "workshop_number": "..."},
+            "publish":  {"completed_at": ..., "pr_url": "..."}
+          }
+        }
+    """
+
+    PHASES = ("research", "compile", "publish")
+
+    def __init__(self, checkpoint_dir: str, logger: Optional[logging.Logger] = None):
+        self.checkpoint_dir = checkpoint_dir
+        self.logger = logger or logging.getLogger(__name__)
+        os.makedirs(self.checkpoint_dir, exist_ok=True)
+
+    @staticmethod
+    def new_run_id(topic: str) -> str:
+        """Generate a readable, unique run ID for a topic."""
+        slug = re.sub(r'[^a-z0-9]+', '-', topic.lower()).strip('-')[:40] or "run"
+        return f"{time.strftime('%Y%m%d-%H%M%S')}-{slug}-{uuid.uuid4().hex[:6]}"
+
+    def _checkpoint_path(self, run_id: str) -> str:
+        if not re.fullmatch(r'[A-Za-z0-9._-]+', run_id):
+            raise CheckpointError(f"Invalid run ID: {run_id}")
+        return os.path.join(self.checkpoint_dir, f"{run_id}.json")
+
+    def create(self, run_id: str, topic: str) -> dict:
+        """Create a new checkpoint for a run."""
+        now = time.time()
+        checkpoint = {
+            "run_id": run_id,
+            "topic": topic,
+            "status": "running",
+            "created_at": now,
+            "updated_at": now,
+            "phases": {}
+        }
+        self._save(checkpoint)
+        return checkpoint
+
+    def load(self, run_id: str) -> dict:
+        """Load the checkpoint for an existing run."""
+        checkpoint_path = self._checkpoint_path(run_id)
+        if not os.path.exists(checkpoint_path):
+            raise CheckpointError(f"No checkpoint found for run ID '{run_id}' in {self.checkpoint_dir}")
+        try:
+            with open(checkpoint_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            raise CheckpointError(f"Could not read checkpoint for run ID '{run_id}': {e}")
+
+    def record_phase(self, checkpoint: dict, phase: str, **outputs) -> None:
+        """Mark a phase as complete and persist its outputs."""
+        if phase not in self.PHASES:
+            raise CheckpointError(f"Unknown pipeline phase: {phase}")
+        checkpoint["phases"][phase] = dict(outputs, completed_at=time.time())
+        self._save(checkpoint)
+        self.logger.debug(f"Checkpointed phase '{phase}' for run {checkpoint['run_id']}")
+
+    def set_status(self, checkpoint: dict, status: str, error: Optional[str] = None) -> None:
+        """Update the overall run status."""
+        checkpoint["status"] = status
+        if error is not None:
+            checkpoint["error"] = error
+        else:
+            checkpoint.pop("error", None)
+        self._save(checkpoint)
+
+    @staticmethod
+    def phase_outputs(checkpoint: dict, phase: str) -> Optional[dict]:
+        """Return the recorded outputs of a completed phase, or None."""
+        return checkpoint.get("phases", {}).get(phase)
+
+    def _save(self, checkpoint: dict) -> None:
+        checkpoint["updated_at"] = time.time()
+        checkpoint_path = self._checkpoint_path(checkpoint["run_id"])
+        fd, tmp_path = tempfile.mkstemp(dir=self.checkpoint_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(checkpoint, f, indent=2)
+            os.replace(tmp_path, checkpoint_path)
+        except OSError as e:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise CheckpointError(f"Could not write checkpoint for run {checkpoint['run_id']}: {e}")
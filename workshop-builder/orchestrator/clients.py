@@ -0,0 +1,215 @@
+import json
+import logging
+import threading
+import time
+from typing import Optional
+
+from .config import AppConfig
+from .tracing import get_tracer
+
+
+class ClientFactoryError(Exception):
+    """Custom exception for API client creation errors."""
+    pass
+
+
+# Process-wide client cache, keyed by service and credentials
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def _get_or_create(key: tuple, create):
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            client = create()
+            _clients[key] = client
+        return client
+
+
+def _ensure_online(config: AppConfig, service: str):
+    if config.offline:
+        raise ClientFactoryError(f"{service} client requested in offline mode; no network calls are allowed")
+
+
+def get_openai_client(config: AppConfig):
+    """Return the shared OpenAI client. The SDK is only imported on first use."""
+    _ensure_online(config, "OpenAI")
+    if not config.openai_api_key:
+        raise ClientFactoryError("OpenAI API key missing.")
+
+    def create():
+        import openai
+        # The agents' RetryPolicy handles retries, so the SDK's own retries are disabled
+        return openai.OpenAI(api_key=config.openai_api_key, max_retries=0)
+
+    return _get_or_create(("openai", config.openai_api_key), create)
+
+
+def get_gemini_model(config: AppConfig, model_name: str):
+    """Return the shared Gemini model for `model_name`. The SDK is only imported on first use."""
+    _ensure_online(config, "Gemini")
+    if not config.gemini_api_key:
+        raise ClientFactoryError("Gemini API key missing.")
+
+    def create():
+        import google.generativeai as genai
+        genai.configure(api_key=config.gemini_api_key)
+        return genai.GenerativeModel(model_name)
+
+    return _get_or_create(("gemini", config.gemini_api_key, model_name), create)
+
+
+def _counting_token_auth(token: str, on_request):
+    """PyGithub token authentication that calls `on_request` for every request it signs."""
+    from github import Auth
+
+    class CountingToken(Auth.Token):
+        def authentication(self, headers: dict) -> None:
+            super().authentication(headers)
+            on_request()
+
+    return CountingToken(token)
+
+
+class GitHubSession:
+    """
+    The process-wide PyGithub client for one token and API URL, with cached repository
+    metadata and a count of the API requests made through it.
+
+    PyGithub keeps one pooled `requests` session per client, so every agent and publish
+    in the process reuses its connections. A repository (which carries the default
+    branch) and its label names are fetched once; after `GITHUB_METADATA_TTL_SECONDS`
+    they are revalidated with an ETag conditional request, which GitHub answers with
+    304 Not Modified, without counting it against the rate limit, while nothing changed.
+    """
+
+    def __init__(self, config: AppConfig):
+        from github import Github
+        github_config = config.get_github_config()
+        self.metadata_ttl_seconds = github_config["metadata_ttl_seconds"]
+        self.client = Github(
+            auth=_counting_token_auth(config.github_token, self._count_api_call),
+            base_url=github_config["api_url"],
+            seconds_between_requests=github_config["seconds_between_requests"],
+            seconds_between_writes=github_config["seconds_between_writes"]
+        )
+        self._api_calls = 0
+        self._count_lock = threading.Lock()
+        self._metadata_lock = threading.Lock()
+        self._repositories = {}  # full name -> (repository, fetched at)
+        self._labels = {}  # full name -> (label names, etag, fetched at)
+
+    def _count_api_call(self):
+        with self._count_lock:
+            self._api_calls += 1
+        get_tracer().current_span().add("github_api_calls")
+
+    @property
+    def api_calls(self) -> int:
+        """Number of GitHub API requests made through this session (conditional ones included)."""
+        return self._api_calls
+
+    def _is_fresh(self, fetched_at: float) -> bool:
+        return time.monotonic() - fetched_at < self.metadata_ttl_seconds
+
+    def repository(self, full_name: str):
+        """The repository `owner/name`, fetched once and revalidated when the cached copy is stale."""
+        with self._metadata_lock:
+            cached = self._repositories.get(full_name)
+            if cached is not None and self._is_fresh(cached[1]):
+                return cached[0]
+            if cached is None:
+                repo = self.client.get_repo(full_name)
+            else:
+                repo = cached[0]
+                # Sends If-None-Match with the cached ETag; a 304 leaves the attributes as they are
+                repo.update()
+            self._repositories[full_name] = (repo, time.monotonic())
+            return repo
+
+    def label_names(self, repo) -> frozenset:
+        """Names of `repo`'s labels, listed once and revalidated when the cached copy is stale."""
+        from github import GithubException
+        with self._metadata_lock:
+            names, etag, fetched_at = self._labels.get(repo.full_name, (None, None, 0.0))
+            if names is not None and self._is_fresh(fetched_at):
+                return names
+            headers = {"If-None-Match": etag} if names is not None and etag else None
+            status, response_headers, output = self.client.requester.requestJson(
+                "GET", f"{repo.url}/labels", parameters={"per_page": 100}, headers=headers
+            )
+            if status >= 400:
+                raise GithubException(status, json.loads(output) if output else None, response_headers)
+            if status != 304:
+                if 'rel="next"' in response_headers.get("link", ""):
+                    # Several pages have no single ETag, so these are listed in full every time
+                    names, etag = frozenset(label.name for label in repo.get_labels()), None
+                else:
+                    names, etag = frozenset(label["name"] for label in json.loads(output)), response_headers.get("etag")
+            self._labels[repo.full_name] = (names, etag, time.monotonic())
+            return names
+
+
+def get_github_session(config: AppConfig) -> GitHubSession:
+    """Return the shared GitHub session. PyGithub is only imported on first use."""
+    _ensure_online(config, "GitHub")
+    if not config.github_token:
+        raise ClientFactoryError("GitHub token missing.")
+    return _get_or_create(("github", config.github_token, config.github_api_url), lambda: GitHubSession(config))
+
+
+def get_github_client(config: AppConfig):
+    """Return the shared PyGithub client."""
+    return get_github_session(config).client
+
+
+def reset_clients():
+    """Drop all cached clients (used when credentials change, e.g. in tests)."""
+    with _clients_lock:
+        _clients.clear()
+
+
+def preflight(config: AppConfig, logger: Optional[logging.Logger] = None) -> dict:
+    """
+    Check connectivity to every external service the pipeline uses.
+
+    Returns:
+        dict: service name -> {"ok": bool, "detail": str}
+    """
+    logger = logger or logging.getLogger(__name__)
+    results = {}
+
+    def check(service: str, probe):
+        try:
+            detail = probe()
+            results[service] = {"ok": True, "detail": detail}
+            logger.info(f"Preflight: {service} reachable ({detail})")
+        except Exception as e:
+            results[service] = {"ok": False, "detail": str(e)}
+            logger.error(f"Preflight: {service} check failed: {e}")
+
+    def probe_openai():
+        client = get_openai_client(config)
+        client.models.retrieve(config.openai_model)
+        return f"model {config.openai_model} available"
+
+    def probe_gemini():
+        _ensure_online(config, "Gemini")
+        import google.generativeai as genai
+        genai.configure(api_key=config.gemini_api_key)
+        next(iter(genai.list_models()), None)
+        return "model list retrieved"
+
+    def probe_github():
+        repo = get_github_session(config).repository(f"{config.github_repo_owner}/{config.github_repo_name}")
+        return f"repository {repo.full_name} accessible"
+
+    # The stub backend is local, so only the providers actually in use are checked
+    backends = {config.research_backend, config.compiler_backend}
+    if "openai" in backends:
+        check("openai", probe_openai)
+    if "gemini" in backends:
+        check("gemini", probe_gemini)
+    check("github", probe_github)
+    return results
@@ -11,7 +11,7 @@ class AppConfig:
     professional error handling.
     """
     
-    def __init__(self):
+    def __init__(self, offline: bool = False):
         # Load .env file from the workshop-builder directory (one level up from orchestrator)
         dotenv_path = os.path.join(os.path.dirname(__file__), '..', '.env')
         if not load_dotenv(dotenv_path):
@@ -21,17 +21,61 @@ class AppConfig:
                  print("Warning: .env file not found. Please ensure it exists in the 'workshop-builder' directory or current working directory.")
 
         # Core Configuration
+        # Offline mode (`cli.py --offline`): API clients refuse to be created, so no network calls are made
+        self.offline = offline
         self.log_level = os.getenv("LOG_LEVEL", "INFO").upper()
         
         # API Keys for AI Services
         self.gemini_api_key = os.getenv("GEMINI_API_KEY")
         self.openai_api_key = os.getenv("OPENAI_API_KEY")
         self.github_token = os.getenv("GITHUB_TOKEN")
+        # GitHub REST API root; set for GitHub Enterprise Server or a local stand-in
+        self.github_api_url = os.getenv("GITHUB_API_URL", "https://api.github.com").rstrip("/")
+        # Repository metadata (default branch, labels) is cached per process and revalidated with
+        # conditional requests once it is older than the TTL; PyGithub pauses between requests
+        # and between writes to stay under GitHub's secondary rate limits
+        self.github_metadata_ttl_seconds = float(os.getenv("GITHUB_METADATA_TTL_SECONDS", "300"))
+        self.github_seconds_between_requests = float(os.getenv("GITHUB_SECONDS_BETWEEN_REQUESTS", "0.25"))
+        self.github_seconds_between_writes = float(os.getenv("GITHUB_SECONDS_BETWEEN_WRITES", "1"))
         
         # OpenAI API Configuration
         self.openai_model = os.getenv("OPENAI_MODEL", "gpt-4o")
         self.openai_max_tokens = int(os.getenv("OPENAI_MAX_TOKENS", "4000"))
         self.openai_temperature = float(os.getenv("OPENAI_TEMPERATURE", "0.1"))
+        self.openai_stream_compilation = os.getenv("OPENAI_STREAM_COMPILATION", "false").lower() == "true"
+
+        # LLM Backend Configuration ("gemini", "openai" or "stub")
+        # LLM_BACKEND sets both agents at once; RESEARCH_BACKEND / COMPILER_BACKEND override it per agent
+        self.gemini_model = os.getenv("GEMINI_MODEL", "gemini-2.0-flash-exp")
+        self.llm_backend = os.getenv("LLM_BACKEND", "").lower()
+        self.research_backend = os.getenv("RESEARCH_BACKEND", self.llm_backend or "gemini").lower()
+        self.compiler_backend = os.getenv("COMPILER_BACKEND", self.llm_backend or "openai").lower()
+
+        # Client-side Rate Limits per provider (0 = unlimited); set them to your account's tier limits
+        self.openai_requests_per_minute = float(os.getenv("OPENAI_REQUESTS_PER_MINUTE", "0"))
+        self.openai_tokens_per_minute = float(os.getenv("OPENAI_TOKENS_PER_MINUTE", "0"))
+        self.gemini_requests_per_minute = float(os.getenv("GEMINI_REQUESTS_PER_MINUTE", "0"))
+        self.gemini_tokens_per_minute = float(os.getenv("GEMINI_TOKENS_PER_MINUTE", "0"))
+        self.stub_requests_per_minute = float(os.getenv("STUB_REQUESTS_PER_MINUTE", "0"))
+        self.stub_tokens_per_minute = float(os.getenv("STUB_TOKENS_PER_MINUTE", "0"))
+        self.rate_limit_burst_seconds = float(os.getenv("RATE_LIMIT_BURST_SECONDS", "10"))
+
+        # Stub Backend Configuration (offline runs and benchmarks)
+        self.stub_latency_ms = float(os.getenv("STUB_LATENCY_MS", "0"))
+        self.stub_tokens_per_second = float(os.getenv("STUB_TOKENS_PER_SECOND", "0"))
+        self.stub_response_chars = int(os.getenv("STUB_RESPONSE_CHARS", "4000"))
+        self.stub_responses_dir = os.getenv("STUB_RESPONSES_DIR")
+
+        # Compilation Mode Configuration
+        # "single": one completion returns every file; "sectioned": an outline call, then one completion per section
+        self.compilation_mode = os.getenv("COMPILATION_MODE", "single").lower()
+        self.openai_outline_max_tokens = int(os.getenv("OPENAI_OUTLINE_MAX_TOKENS", "1500"))
+        self.openai_section_max_tokens = int(os.getenv("OPENAI_SECTION_MAX_TOKENS", "4000"))
+        self.section_concurrency = max(1, int(os.getenv("SECTION_CONCURRENCY", "4")))
+
+        # Research Context Packing Configuration (0 budget = no trimming)
+        self.research_context_packing = os.getenv("RESEARCH_CONTEXT_PACKING", "true").lower() == "true"
+        self.research_context_token_budget = int(os.getenv("RESEARCH_CONTEXT_TOKEN_BUDGET", "12000"))
         
         # AGENTS.MD Support Configuration
         self.agents_md_enabled = os.getenv("AGENTS_MD_ENABLED", "true").lower() == "true"
@@ -40,16 +84,79 @@ class AppConfig:
         # Professional Error Handling Configuration
         self.error_recovery_enabled = os.getenv("ERROR_RECOVERY_ENABLED", "true").lower() == "true"
         self.max_retry_attempts = int(os.getenv("MAX_RETRY_ATTEMPTS", "3"))
+        self.retry_base_delay_seconds = float(os.getenv("RETRY_BASE_DELAY_SECONDS", "1"))
+        self.retry_max_delay_seconds = float(os.getenv("RETRY_MAX_DELAY_SECONDS", "60"))
+        self.llm_request_timeout_seconds = float(os.getenv("LLM_REQUEST_TIMEOUT_SECONDS", "120"))
         self.fallback_generation_enabled = os.getenv("FALLBACK_GENERATION_ENABLED", "true").lower() == "true"
         
         # Workshop Infrastructure Configuration
         self.workshops_base_dir = os.getenv("WORKSHOPS_BASE_DIR", "../public/data/workshops")
         self.github_repo_owner = os.getenv("GITHUB_REPO_OWNER")
         self.github_repo_name = os.getenv("GITHUB_REPO_NAME")
+        # Local git operations: "gitpython" (branch creation and checkout in-process, the rest
+        # through git), "subprocess" (one git process per command) or "auto" (gitpython when
+        # installed, otherwise subprocess)
+        self.git_backend = os.getenv("GIT_BACKEND", "auto").lower()
+        # Publishing: "worktree" commits in a temporary git worktree, leaving the main checkout
+        # alone; "checkout" switches branches in the main checkout; "api" commits through the
+        # GitHub Git Data API without any local git operations
+        self.git_publish_mode = os.getenv("GIT_PUBLISH_MODE", "worktree").lower()
+        # Repository path of WORKSHOPS_BASE_DIR (e.g. public/data/workshops); derived from the
+        # local checkout when empty, so API publishing from a machine without a clone needs it
+        self.github_workshops_path = os.getenv("GITHUB_WORKSHOPS_PATH", "").strip("/")
+        self.git_worktree_sparse = os.getenv("GIT_WORKTREE_SPARSE", "true").lower() == "true"
+        self.git_worktree_dir = os.getenv("GIT_WORKTREE_DIR", "")
 
         # Prompt and Template Configuration
         self.compiler_agent_prompt_path = os.getenv("COMPILER_AGENT_PROMPT_PATH", "workshop_compiler_agent_prompt.md")
+        # Jinja2 templates manifest.json and README.md of each module are rendered from
+        self.module_templates_dir = os.getenv("MODULE_TEMPLATES_DIR", "templates")
         self.temp_data_dir = os.getenv("TEMP_DATA_DIR", "temp_research_data")
+
+        # Persistent index of the workshop modules (number, slug, topic, manifest hash), kept in
+        # WORKSHOPS_BASE_DIR's allocation ledger; when disabled the directory is scanned instead
+        self.workshop_index_enabled = os.getenv("WORKSHOP_INDEX_ENABLED", "true").lower() == "true"
+
+        # Compiled modules are staged in WORKSHOPS_BASE_DIR/.workshop-staging and moved into place
+        # in one rename; MODULE_WRITE_FSYNC=false skips flushing the staged files to disk first
+        self.module_write_fsync = os.getenv("MODULE_WRITE_FSYNC", "true").lower() == "true"
+
+        # Duplicate-topic check before a new run: "warn" logs the existing modules at least
+        # DUPLICATE_TOPIC_THRESHOLD similar to the topic, "skip" also stops the run when one of
+        # them covers every word of the topic, "off" disables the check. TOPIC_EMBEDDING_MODEL
+        # names a local sentence-transformers model to compare with instead of TF-IDF
+        self.duplicate_topic_action = os.getenv("DUPLICATE_TOPIC_ACTION", "warn").lower()
+        self.duplicate_topic_threshold = float(os.getenv("DUPLICATE_TOPIC_THRESHOLD", "0.6"))
+        self.topic_embedding_model = os.getenv("TOPIC_EMBEDDING_MODEL", "")
+
+        # Research Concurrency Configuration
+        self.research_concurrency = max(1, int(os.getenv("RESEARCH_CONCURRENCY", "4")))
+
+        # Research Cache Configuration
+        self.research_cache_enabled = os.getenv("RESEARCH_CACHE_ENABLED", "true").lower() == "true"
+        self.research_cache_dir = os.getenv("RESEARCH_CACHE_DIR", "research_cache")
+        self.research_cache_ttl_hours = float(os.getenv("RESEARCH_CACHE_TTL_HOURS", "168"))
+        self.research_cache_max_mb = float(os.getenv("RESEARCH_CACHE_MAX_MB", "200"))
+        self.research_cache_refresh = False  # Set by `cli.py --refresh` to bypass cached responses
+
+        # Compilation Cache Configuration (OpenAI completion responses)
+        self.completion_cache_enabled = os.getenv("COMPLETION_CACHE_ENABLED", "true").lower() == "true"
+        self.completion_cache_path = os.getenv("COMPLETION_CACHE_PATH", "compile_cache/completions.sqlite3")
+        self.completion_cache_max_mb = float(os.getenv("COMPLETION_CACHE_MAX_MB", "200"))
+        self.completion_cache_refresh = False  # Set by `cli.py --refresh` to bypass cached responses
+
+        # Tracing Configuration (per-phase and per-call spans; `cli.py --trace` enables it for one run)
+        self.tracing_enabled = os.getenv("TRACING_ENABLED", "false").lower() == "true"
+        self.trace_dir = os.getenv("TRACE_DIR", "traces")
+        self.trace_formats = [f.strip().lower() for f in os.getenv("TRACE_FORMATS", "jsonl,otlp").split(",") if f.strip()]
+
+        # Pipeline Checkpoint Configuration (used by `cli.py --resume`)
+        self.checkpoint_dir = os.getenv("CHECKPOINT_DIR", "run_checkpoints")
+
+        # Batch Mode Configuration (used by `cli.py --topics-file`)
+        self.batch_research_workers = max(1, int(os.getenv("BATCH_RESEARCH_WORKERS", "2")))
+        self.batch_compile_workers = max(1, int(os.getenv("BATCH_COMPILE_WORKERS", "2")))
+        self.batch_publish_workers = max(1, int(os.getenv("BATCH_PUBLISH_WORKERS", "2")))
         
         # Professional Output Configuration
         self.professional_formatting = os.getenv("PROFESSIONAL_FORMATTING", "true").lower() == "true"
@@ -64,10 +171,15 @@ class AppConfig:
         """Validate required configuration for OpenAI Codex Framework integration."""
         missing_vars = []
         
-        # Core API Keys
-        if not self.gemini_api_key:
+        for backend in (self.research_backend, self.compiler_backend):
+            if backend not in ("gemini", "openai", "stub"):
+                raise ValueError(f"Invalid LLM backend '{backend}': expected 'gemini', 'openai' or 'stub'")
+        backends = {self.research_backend, self.compiler_backend}
+
+        # Core API Keys (only for the backends in use)
+        if "gemini" in backends and not self.gemini_api_key:
             missing_vars.append("GEMINI_API_KEY")
-        if not self.openai_api_key:
+        if "openai" in backends and not self.openai_api_key:
             missing_vars.append("OPENAI_API_KEY")
         if not self.github_token:
             missing_vars.append("GITHUB_TOKEN")
@@ -76,7 +188,25 @@ class AppConfig:
         if not self.github_repo_name:
             missing_vars.append("GITHUB_REPO_NAME")
 
-        if missing_vars:
+        if self.compilation_mode not in ("single", "sectioned"):
+            raise ValueError(f"Invalid COMPILATION_MODE '{self.compilation_mode}': expected 'single' or 'sectioned'")
+
+        if self.git_backend not in ("auto", "gitpython", "subprocess"):
+            raise ValueError(f"Invalid GIT_BACKEND '{self.git_backend}': expected 'auto', 'gitpython' or 'subprocess'")
+
+        if self.git_publish_mode not in ("worktree", "checkout", "api"):
+            raise ValueError(f"Invalid GIT_PUBLISH_MODE '{self.git_publish_mode}': expected 'worktree', 'checkout' or 'api'")
+
+        if self.duplicate_topic_action not in ("skip", "warn", "off"):
+            raise ValueError(f"Invalid DUPLICATE_TOPIC_ACTION '{self.duplicate_topic_action}': expected 'skip', 'warn' or 'off'")
+
+        for trace_format in self.trace_formats:
+            if trace_format not in ("jsonl", "otlp"):
+                raise ValueError(f"Invalid TRACE_FORMATS entry '{trace_format}': expected 'jsonl' and/or 'otlp'")
+
+        if missing_vars and self.offline:
+            logging.warning(f"Missing environment variables (ignored in offline mode): {', '.join(missing_vars)}")
+        elif missing_vars:
             error_message = "Error: Missing required environment variables for Workshop Builder:\n"
             for var in missing_vars:
                 error_message += f"- {var}\n"
@@ -85,16 +215,7 @@ class AppConfig:
             logging.critical(error_message)
             raise ValueError(error_message)
 
-        # Validate OpenAI API Configuration
-        if self.openai_api_key:
-            try:
-                import openai
-                client = openai.OpenAI(api_key=self.openai_api_key)
-                # Test API connectivity with a simple models list call
-                models = client.models.list()
-                logging.info("OpenAI API connectivity validated successfully")
-            except Exception as e:
-                logging.warning(f"OpenAI API validation failed: {e}")
+        # API connectivity is not checked here; run `cli.py --preflight` (orchestrator.clients.preflight)
 
     def get_logger(self, name: str) -> logging.Logger:
         """Get a configured logger for the specified component."""
@@ -116,6 +237,7 @@ class AppConfig:
             "model": self.openai_model,
             "max_tokens": self.openai_max_tokens,
             "temperature": self.openai_temperature,
+            "stream_compilation": self.openai_stream_compilation,
             "api_key": self.openai_api_key
         }
 
@@ -131,9 +253,85 @@ class AppConfig:
         return {
             "recovery_enabled": self.error_recovery_enabled,
             "max_retry_attempts": self.max_retry_attempts,
+            "retry_base_delay_seconds": self.retry_base_delay_seconds,
+            "retry_max_delay_seconds": self.retry_max_delay_seconds,
+            "request_timeout_seconds": self.llm_request_timeout_seconds,
             "fallback_generation_enabled": self.fallback_generation_enabled
         }
 
+    def get_research_cache_config(self) -> dict:
+        """Get research cache configuration parameters."""
+        return {
+            "enabled": self.research_cache_enabled,
+            "dir": self.research_cache_dir,
+            "ttl_seconds": self.research_cache_ttl_hours * 3600,
+            "max_bytes": int(self.research_cache_max_mb * 1024 * 1024),
+            "refresh": self.research_cache_refresh
+        }
+
+    def get_completion_cache_config(self) -> dict:
+        """Get compilation (completion response) cache configuration parameters."""
+        return {
+            "enabled": self.completion_cache_enabled,
+            "path": self.completion_cache_path,
+            "max_bytes": int(self.completion_cache_max_mb * 1024 * 1024),
+            "refresh": self.completion_cache_refresh
+        }
+
+    def get_tracing_config(self) -> dict:
+        """Get tracing configuration parameters."""
+        return {
+            "enabled": self.tracing_enabled,
+            "dir": self.trace_dir,
+            "formats": list(self.trace_formats)
+        }
+
+    def get_rate_limit_config(self, provider: str) -> dict:
+        """Get client-side rate limits for `provider` ("openai", "gemini" or "stub")."""
+        return {
+            "requests_per_minute": getattr(self, f"{provider}_requests_per_minute", 0),
+            "tokens_per_minute": getattr(self, f"{provider}_tokens_per_minute", 0),
+            "burst_seconds": self.rate_limit_burst_seconds
+        }
+
+    def get_stub_backend_config(self) -> dict:
+        """Get stub LLM backend configuration parameters."""
+        return {
+            "latency_seconds": self.stub_latency_ms / 1000,
+            "tokens_per_second": self.stub_tokens_per_second,
+            "response_chars": self.stub_response_chars,
+            "responses_dir": self.stub_responses_dir
+        }
+
+    def get_github_config(self) -> dict:
+        """Get GitHub API client configuration parameters."""
+        return {
+            "api_url": self.github_api_url,
+            "metadata_ttl_seconds": self.github_metadata_ttl_seconds,
+            "seconds_between_requests": self.github_seconds_between_requests,
+            "seconds_between_writes": self.github_seconds_between_writes
+        }
+
+    def get_duplicate_topic_config(self) -> dict:
+        """Get duplicate-topic check configuration parameters."""
+        return {
+            "action": self.duplicate_topic_action,
+            "threshold": self.duplicate_topic_threshold,
+            "embedding_model": self.topic_embedding_model or None
+        }
+
+    def get_git_publish_config(self) -> dict:
+        """Get local git publishing configuration parameters."""
+        return {
+            "backend": self.git_backend,
+            "mode": self.git_publish_mode,
+            "worktree_sparse": self.git_worktree_sparse,
+            "worktree_dir": self.git_worktree_dir or None,
+            "workshops_path": self.github_workshops_path or None,
+            # Concurrent publishes only work when they do not share the main checkout (None: no limit)
+            "max_concurrent": 1 if self.git_publish_mode == "checkout" else None
+        }
+
     def get_professional_config(self) -> dict:
         """Get professional output configuration parameters."""
         return {
@@ -1,16 +1,22 @@
 import logging
 import os
 import shutil
+import threading
 import time
+from contextlib import nullcontext
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 
 from .config import AppConfig
+from .checkpoints import CheckpointStore, CheckpointError
+from .research_cache import ResearchCache
+from .tracing import configure_tracing, get_tracer
 from ..agents import (
     ResearchAgent, ResearchAgentError,
     CompilerAgent, CompilerAgentError,
     GitAgent, GitAgentError
 )
+from ..agents.llm_backends import backend_model_name
 
 class OrchestratorError(Exception):
     """Custom exception for Orchestrator errors."""
@@ -22,17 +28,73 @@ class Orchestrator:
         self.logger = config.get_logger(__name__)
         self.logger.info("Orchestrator initialized with Codex framework integration.")
 
-        # Resolve absolute path for temp_data_dir if it's relative
-        if not os.path.isabs(self.config.temp_data_dir):
-            script_dir = os.path.dirname(os.path.abspath(__file__))
-            self.config.temp_data_dir = os.path.join(script_dir, '..', self.config.temp_data_dir)
-            self.config.temp_data_dir = os.path.normpath(self.config.temp_data_dir)
+        # Resolve working directories relative to the workshop-builder directory
+        self.config.temp_data_dir = self._resolve_builder_path(self.config.temp_data_dir)
+        self.config.research_cache_dir = self._resolve_builder_path(self.config.research_cache_dir)
+        self.config.completion_cache_path = self._resolve_builder_path(self.config.completion_cache_path)
+        self.config.checkpoint_dir = self._resolve_builder_path(self.config.checkpoint_dir)
+        self.config.trace_dir = self._resolve_builder_path(self.config.trace_dir)
+        if self.config.git_worktree_dir:
+            self.config.git_worktree_dir = self._resolve_builder_path(self.config.git_worktree_dir)
         
         self.logger.debug(f"Temporary data directory set to: {self.config.temp_data_dir}")
+        self.logger.debug(f"Checkpoint directory set to: {self.config.checkpoint_dir}")
+
+        self.checkpoints = CheckpointStore(self.config.checkpoint_dir, logger=self.logger)
+        tracer = configure_tracing(self.config, logger=self.logger)
+        if tracer.enabled:
+            self.logger.info(f"Tracing enabled: spans are written to {self.config.trace_dir}")
+
+        # Phase concurrency limits; unbounded until configure_concurrency() is called for batch runs.
+        # Publishing is serialised unless it leaves the main checkout alone (worktree or API publish mode).
+        self._research_slots = nullcontext()
+        self._compile_slots = nullcontext()
+        self._publish_slots = threading.BoundedSemaphore(1)
+        self._print_lock = threading.Lock()
+
+        # Agents that hold API clients are created once and shared by every run
+        self._agent_lock = threading.Lock()
+        self._compiler_agent = None
+        self._git_agent = None
         
         # Create orchestrator AGENTS.MD for guidance
         self._create_orchestrator_agents_md()
 
+    def configure_concurrency(self, research_workers: int, compile_workers: int, publish_workers: int = 1):
+        """
+        Bound how many runs may be in each phase at once. More than one publish at a time
+        is only allowed in the worktree and API publish modes, where publishes do not share a checkout.
+        """
+        max_concurrent_publishes = self.config.get_git_publish_config()["max_concurrent"]
+        if max_concurrent_publishes is not None:
+            publish_workers = min(publish_workers, max_concurrent_publishes)
+        self._research_slots = threading.BoundedSemaphore(research_workers)
+        self._compile_slots = threading.BoundedSemaphore(compile_workers)
+        self._publish_slots = threading.BoundedSemaphore(max(1, publish_workers))
+        self.logger.debug(
+            f"Phase concurrency: research={research_workers}, compile={compile_workers}, publish={max(1, publish_workers)}"
+        )
+
+    def _get_compiler_agent(self) -> CompilerAgent:
+        with self._agent_lock:
+            if self._compiler_agent is None:
+                self._compiler_agent = CompilerAgent(self.config)
+            return self._compiler_agent
+
+    def _get_git_agent(self) -> GitAgent:
+        with self._agent_lock:
+            if self._git_agent is None:
+                self._git_agent = GitAgent(self.config)
+            return self._git_agent
+
+    @staticmethod
+    def _resolve_builder_path(path: str) -> str:
+        """Resolve a path relative to the workshop-builder directory if it isn't absolute."""
+        if os.path.isabs(path):
+            return path
+        script_dir = os.path.dirname(os.path.abspath(__file__))
+        return os.path.normpath(os.path.join(script_dir, '..', path))
+
     def _create_orchestrator_agents_md(self):
         """Create AGENTS.MD file for orchestrator guidance following Codex best practices."""
         agents_md_path = os.path.join(os.path.dirname(__file__), "AGENTS.MD")
@@ -80,128 +142,396 @@ This is the AI Workshop Builder orchestrator that coordinates multiple specializ
             self.logger.warning(f"Could not create orchestrator AGENTS.MD: {e}")
 
 
-    def _setup_temp_dir(self):
-        """Creates or cleans the temporary directory for research data."""
-        if os.path.exists(self.config.temp_data_dir):
-            self.logger.info(f"Cleaning existing temporary data directory: {self.config.temp_data_dir}")
+    def _run_data_dir(self, run_id: str) -> str:
+        """Return the research data directory for a run inside temp_data_dir."""
+        return os.path.join(self.config.temp_data_dir, run_id)
+
+    def _setup_temp_dir(self, run_data_dir: str):
+        """Creates or cleans the temporary directory for a run's research data."""
+        if os.path.exists(run_data_dir):
+            self.logger.info(f"Cleaning existing temporary data directory: {run_data_dir}")
             try:
-                shutil.rmtree(self.config.temp_data_dir)
+                shutil.rmtree(run_data_dir)
             except OSError as e:
-                self.logger.error(f"Error removing temporary directory {self.config.temp_data_dir}: {e}")
+                self.logger.error(f"Error removing temporary directory {run_data_dir}: {e}")
                 raise # Re-raise to halt execution if temp dir can't be managed
         
         try:
-            os.makedirs(self.config.temp_data_dir, exist_ok=True)
-            self.logger.info(f"Ensured temporary data directory exists: {self.config.temp_data_dir}")
+            os.makedirs(run_data_dir, exist_ok=True)
+            self.logger.info(f"Ensured temporary data directory exists: {run_data_dir}")
         except OSError as e:
-            self.logger.error(f"Error creating temporary directory {self.config.temp_data_dir}: {e}")
+            self.logger.error(f"Error creating temporary directory {run_data_dir}: {e}")
             raise
 
 
-    def _cleanup_temp_dir(self):
-        """Removes the temporary directory after processing."""
-        if os.path.exists(self.config.temp_data_dir):
-            self.logger.info(f"Cleaning up temporary data directory: {self.config.temp_data_dir}")
+    def _cleanup_temp_dir(self, run_data_dir: str):
+        """Removes a run's temporary research data after processing."""
+        if os.path.exists(run_data_dir):
+            self.logger.info(f"Cleaning up temporary data directory: {run_data_dir}")
             try:
-                shutil.rmtree(self.config.temp_data_dir)
+                shutil.rmtree(run_data_dir)
             except OSError as e:
-                self.logger.warning(f"Could not remove temporary directory {self.config.temp_data_dir}: {e}")
+                self.logger.warning(f"Could not remove temporary directory {run_data_dir}: {e}")
         else:
-            self.logger.debug(f"Temporary data directory not found for cleanup: {self.config.temp_data_dir}")
+            self.logger.debug(f"Temporary data directory not found for cleanup: {run_data_dir}")
 
 
-    def run(self, topic: str) -> dict:
+    def run(self, topic: Optional[str] = None, resume_run_id: Optional[str] = None, publish: bool = True) -> dict:
         """
         Execute the complete workshop generation pipeline using Codex framework.
+
+        Each phase's outputs are checkpointed under the run ID. When a run fails,
+        its research data is kept so `run(resume_run_id=...)` can skip the phases
+        that already finished.
         
         Args:
             topic (str): The workshop topic to research and generate content for
+            resume_run_id (str): Run ID of a previous, failed run to resume
+            publish (bool): Publish the module; when False the run stops after compilation
+                with status "compiled", and `publish_batch` publishes it later
             
         Returns:
             dict: Results containing module_path, pr_url, and generation metadata
         """
         start_time = time.time()
-        self.logger.info(f"🚀 Starting Codex-powered workshop generation for topic: '{topic}'")
+
+        if resume_run_id:
+            checkpoint = self.checkpoints.load(resume_run_id)
+            if topic and topic != checkpoint['topic']:
+                self.logger.warning(f"Ignoring topic '{topic}': run {resume_run_id} was started for '{checkpoint['topic']}'")
+            topic = checkpoint['topic']
+            self.logger.info(f"🔁 Resuming run {resume_run_id} for topic: '{topic}'")
+        else:
+            if not topic:
+                raise OrchestratorError("A topic is required to start a new run")
+            duplicates = self._find_duplicate_modules(topic)
+            covering = [match for match in duplicates if not match["missing_terms"]]
+            if covering and self.config.duplicate_topic_action == "skip":
+                return self._skip_duplicate_topic(topic, covering, start_time)
+            checkpoint = self.checkpoints.create(CheckpointStore.new_run_id(topic), topic)
+            self.logger.info(f"🚀 Starting Codex-powered workshop generation for topic: '{topic}' (run {checkpoint['run_id']})")
+
+        run_id = checkpoint['run_id']
+        run_data_dir = self._run_data_dir(run_id)
+        self.checkpoints.set_status(checkpoint, "running")
+        
+        results = self._new_results(topic, run_id)
+        if not resume_run_id:
+            results['duplicate_of'] = duplicates
         
+        tracer = get_tracer()
+        with tracer.span("workshop.run", topic=topic, run_id=run_id, resumed=bool(resume_run_id)) as run_span:
+            results['trace_id'] = run_span.trace_id
+            try:
+                # Phase 1: Deep Research using Gemini Flash 2.5
+                research_data_paths = self._resumable_outputs(checkpoint, 'research', 'research_data_paths')
+                if research_data_paths:
+                    results['resumed_phases'].append('research')
+                    self.logger.info(f"⏭️ Phase 1 skipped: reusing {len(research_data_paths)} checkpointed research files")
+                else:
+                    phase_start = time.perf_counter()
+                    with tracer.span("phase.research"):
+                        research_data_paths = self._run_research_phase(topic, run_data_dir)
+                    results['phase_times']['research'] = round(time.perf_counter() - phase_start, 3)
+                    self.checkpoints.record_phase(checkpoint, 'research', research_data_paths=research_data_paths)
+                results['research_files_count'] = len(research_data_paths)
+
+                # Phase 2: Content Compilation using OpenAI Codex CLI
+                module_path = self._resumable_outputs(checkpoint, 'compile', 'module_path')
+                if module_path:
+                    results['resumed_phases'].append('compile')
+                    workshop_number = checkpoint['phases']['compile']['workshop_number']
+                    self.logger.info(f"⏭️ Phase 2 skipped: reusing checkpointed module at {module_path}")
+                else:
+                    compiler_agent = self._get_compiler_agent()
+                    cache_before = compiler_agent.cache_stats(topic)
+                    phase_start = time.perf_counter()
+                    with tracer.span("phase.compile"):
+                        module_path = self._run_compile_phase(topic, research_data_paths)
+                    results['phase_times']['compile'] = round(time.perf_counter() - phase_start, 3)
+                    # Counted by topic, so other runs sharing the agent (a batch, or earlier runs) are excluded
+                    results['compilation_cache'] = {key: count - cache_before[key]
+                                                    for key, count in compiler_agent.cache_stats(topic).items()}
+                    workshop_number = self._extract_workshop_number(module_path)
+                    self.checkpoints.record_phase(checkpoint, 'compile', module_path=module_path, workshop_number=workshop_number)
+                results['module_path'] = module_path
+                results['workshop_number'] = workshop_number
+
+                # Phase 3: Professional PR Creation and Publishing
+                publish_outputs = self.checkpoints.phase_outputs(checkpoint, 'publish')
+                if not publish and not publish_outputs:
+                    results['success'] = True
+                    results['generation_time'] = round(time.time() - start_time, 2)
+                    self.checkpoints.set_status(checkpoint, "compiled")
+                    self.logger.info(f"📦 Workshop compiled in {results['generation_time']}s; publishing deferred")
+                    return results
+                if publish_outputs:
+                    results['resumed_phases'].append('publish')
+                    pr_url = publish_outputs['pr_url']
+                    self.logger.info(f"⏭️ Phase 3 skipped: PR already created at {pr_url}")
+                else:
+                    phase_start = time.perf_counter()
+                    with tracer.span("phase.publish"):
+                        pr_url = self._run_publish_phase(topic, module_path, workshop_number)
+                    results['phase_times']['publish'] = round(time.perf_counter() - phase_start, 3)
+                    self.checkpoints.record_phase(checkpoint, 'publish', pr_url=pr_url)
+            
+                results['pr_url'] = pr_url
+                results['success'] = True
+                results['generation_time'] = round(time.time() - start_time, 2)
+                self.checkpoints.set_status(checkpoint, "completed")
+            
+                self.logger.info(f"🎉 Workshop generation completed successfully in {results['generation_time']}s")
+            
+                # Print success summary
+                self._print_success_summary(results)
+            
+                return results
+
+            except (ResearchAgentError, CompilerAgentError, GitAgentError) as agent_error:
+                results['error'] = str(agent_error)
+                results['generation_time'] = round(time.time() - start_time, 2)
+                self.logger.error(f"❌ Agent error during workshop generation: {agent_error}", exc_info=True)
+                self._mark_run_failed(checkpoint, agent_error)
+                self._print_error_summary(results, agent_error)
+                raise
+            
+            except Exception as e:
+                results['error'] = str(e)
+                results['generation_time'] = round(time.time() - start_time, 2)
+                self.logger.error(f"❌ Unexpected error in orchestrator: {e}", exc_info=True)
+                self._mark_run_failed(checkpoint, e)
+                self._print_error_summary(results, e)
+                raise OrchestratorError(f"Workshop generation failed: {e}") from e
+            
+            finally:
+                # Research data is only needed again if the run has to be resumed
+                if checkpoint.get('status') == "completed":
+                    self._cleanup_temp_dir(run_data_dir)
+                    self.logger.info("🧹 Temporary workspace cleaned up")
+                elif os.path.exists(run_data_dir):
+                    self.logger.info(f"💾 Research data kept for resume in {run_data_dir}")
+
+    def update(self, module: str, sections: List[str], instructions: Optional[str] = None, publish: bool = True) -> dict:
+        """
+        Regenerate some sections of an existing workshop module and publish the change.
+
+        No research is done and the rest of the module is only read for context
+        (`CompilerAgent.update_workshop`); the pull request contains the rewritten
+        files. Updates are not checkpointed: a failed update can simply be repeated.
+
+        Args:
+            module (str): Module directory name (e.g. "workshop-03-afternoon-rag-system") or path
+            sections (list): Section file names to regenerate
+            instructions (str): Optional guidance for the revision
+            publish (bool): Open a pull request for the rewritten files
+
+        Returns:
+            dict: Results containing module_path, the updated, unchanged and failed sections and pr_url
+        """
+        start_time = time.time()
         results = {
+            'module': module,
+            'topic': None,
+            'success': False,
+            'module_path': None,
+            'workshop_number': None,
+            'updated': [],
+            'unchanged': [],
+            'failed': [],
+            'manifest_updated': False,
+            'readme_updated': False,
+            'pr_url': None,
+            'generation_time': None,
+            'compilation_cache': None,
+            'phase_times': {},
+            'trace_id': None,
+            'error': None
+        }
+        self.logger.info(f"📝 Updating {', '.join(sections)} in workshop module '{module}'")
+
+        tracer = get_tracer()
+        with tracer.span("workshop.update", module=module, sections=len(sections)) as update_span:
+            results['trace_id'] = update_span.trace_id
+            try:
+                phase_start = time.perf_counter()
+                with tracer.span("phase.compile"), self._compile_slots:
+                    update = self._get_compiler_agent().update_workshop(module, sections, instructions)
+                results['phase_times']['compile'] = round(time.perf_counter() - phase_start, 3)
+                results.update(update)
+                results['workshop_number'] = self._extract_workshop_number(update['module_path'])
+
+                changed_files = update['updated'] + [name for name, rewritten in
+                                                     (('manifest.json', update['manifest_updated']), ('README.md', update['readme_updated']))
+                                                     if rewritten]
+                if publish and changed_files:
+                    phase_start = time.perf_counter()
+                    with tracer.span("phase.publish"), self._publish_slots:
+                        self.logger.info(f"📤 Creating PR for the update of workshop {results['workshop_number']}")
+                        results['pr_url'] = self._get_git_agent().publish_module_update(
+                            update['module_path'], update['topic'], results['workshop_number'], changed_files
+                        )
+                    results['phase_times']['publish'] = round(time.perf_counter() - phase_start, 3)
+                elif not changed_files:
+                    self.logger.info("Regenerated sections are identical to the current ones; nothing to publish")
+
+                results['success'] = True
+                results['generation_time'] = round(time.time() - start_time, 2)
+                self.logger.info(f"🎉 Workshop update completed in {results['generation_time']}s")
+                self._print_update_summary(results)
+                return results
+
+            except (CompilerAgentError, GitAgentError) as agent_error:
+                results['error'] = str(agent_error)
+                results['generation_time'] = round(time.time() - start_time, 2)
+                self.logger.error(f"❌ Workshop update failed: {agent_error}", exc_info=True)
+                self._print_update_summary(results)
+                raise
+
+    @staticmethod
+    def _new_results(topic: str, run_id: Optional[str]) -> dict:
+        return {
             'topic': topic,
+            'run_id': run_id,
             'success': False,
+            'skipped': False,
+            'duplicate_of': [],
             'module_path': None,
             'pr_url': None,
             'generation_time': None,
             'research_files_count': 0,
             'workshop_number': None,
+            'resumed_phases': [],
+            'compilation_cache': None,
+            'phase_times': {},
+            'trace_id': None,
             'error': None
         }
-        
+
+    def _find_duplicate_modules(self, topic: str) -> List[dict]:
+        """
+        Existing modules similar enough to `topic` to count as duplicates (DUPLICATE_TOPIC_*).
+        With DUPLICATE_TOPIC_ACTION=skip, `run` only skips the topic for a module that also
+        covers every word of it (no `missing_terms`).
+        """
+        duplicate_config = self.config.get_duplicate_topic_config()
+        if duplicate_config["action"] == "off":
+            return []
         try:
-            # Setup temporary workspace
-            self._setup_temp_dir()
-            self.logger.info("📁 Temporary workspace prepared")
+            duplicates = self._get_compiler_agent().find_similar_modules(topic, duplicate_config["threshold"])
+        except CompilerAgentError as e:
+            self.logger.warning(f"Duplicate-topic check skipped: {e}")
+            return []
+        for match in duplicates:
+            # A module lacking some of the topic's words is only reported, never a reason to skip
+            missing = f"; it does not cover: {', '.join(match['missing_terms'])}" if match["missing_terms"] else ""
+            self.logger.warning(f"⚠️ '{topic}' resembles existing module {match['name']} (similarity {match['score']}{missing})")
+        return duplicates
 
-            # Phase 1: Deep Research using Gemini Flash 2.5
+    def _skip_duplicate_topic(self, topic: str, duplicates: List[dict], start_time: float) -> dict:
+        """Results of a run that was not started because `topic` is already covered."""
+        results = self._new_results(topic, None)
+        results['skipped'] = True
+        results['duplicate_of'] = duplicates
+        results['generation_time'] = round(time.time() - start_time, 2)
+        results['error'] = (
+            f"'{topic}' is already covered by {', '.join(match['name'] for match in duplicates)}; "
+            "pass --allow-duplicate (or set DUPLICATE_TOPIC_ACTION=warn) to generate it anyway, "
+            f"or extend the existing module instead with --update {duplicates[0]['name']} "
+            "--sections <file.md> --instructions <what to add>"
+        )
+        self.logger.info(f"⏭️ Skipping '{topic}': no research or compilation was started")
+        self._print_skipped_summary(results)
+        return results
+
+    def publish_batch(self, results: List[dict]) -> Optional[str]:
+        """
+        Publish the modules of runs made with `run(..., publish=False)` in one pull request.
+
+        Successful runs without a PR are committed together on one branch; their
+        checkpoints record the shared PR URL and are completed, and each result's
+        `pr_url` is set. Returns the PR URL, or None if there was nothing to publish.
+        """
+        pending = [r for r in results if r.get('success') and r.get('module_path') and not r.get('pr_url')]
+        if not pending:
+            return None
+
+        self.logger.info(f"📤 Phase 3: Creating one PR for {len(pending)} workshops")
+        tracer = get_tracer()
+        with tracer.span("phase.publish", workshops=len(pending)), self._publish_slots:
+            modules = [(r['module_path'], r['topic'], r['workshop_number']) for r in pending]
+            pr_url = self._get_git_agent().publish_modules(modules)
+        if not pr_url:
+            raise GitAgentError("PR creation failed - no URL returned")
+
+        for result in pending:
+            result['pr_url'] = pr_url
+            checkpoint = self.checkpoints.load(result['run_id'])
+            self.checkpoints.record_phase(checkpoint, 'publish', pr_url=pr_url)
+            self.checkpoints.set_status(checkpoint, "completed")
+            self._cleanup_temp_dir(self._run_data_dir(result['run_id']))
+
+        self.logger.info(f"✅ Publishing Phase complete: {len(pending)} workshops in PR {pr_url}")
+        return pr_url
+
+    def _resumable_outputs(self, checkpoint: dict, phase: str, key: str):
+        """Return a checkpointed phase output if the phase completed and its files still exist."""
+        outputs = self.checkpoints.phase_outputs(checkpoint, phase)
+        if not outputs:
+            return None
+        value = outputs.get(key)
+        paths = value if isinstance(value, list) else [value]
+        if not value or not all(p and os.path.exists(p) for p in paths):
+            self.logger.warning(f"Checkpointed {phase} outputs are missing on disk; re-running the {phase} phase")
+            return None
+        return value
+
+    def _mark_run_failed(self, checkpoint: dict, error: Exception):
+        """Record the failure so the run can be resumed later."""
+        try:
+            self.checkpoints.set_status(checkpoint, "failed", error=str(error))
+        except CheckpointError as e:
+            self.logger.warning(f"Could not record failure in checkpoint: {e}")
+
+    def _run_research_phase(self, topic: str, run_data_dir: str) -> list:
+        """Phase 1: gather research data for the topic into the run's data directory."""
+        self._setup_temp_dir(run_data_dir)
+        self.logger.info("📁 Temporary workspace prepared")
+
+        with self._research_slots:
             self.logger.info(f"🔍 Phase 1: Executing deep research for '{topic}' using Gemini Flash 2.5")
-            research_agent = ResearchAgent(self.config, self.config.temp_data_dir)
+            research_agent = ResearchAgent(self.config, run_data_dir)
             research_data_paths = research_agent.fetch_unstructured_data(topic)
-            
-            if not research_data_paths:
-                raise ResearchAgentError("No research data was generated - cannot proceed")
-            
-            results['research_files_count'] = len(research_data_paths)
-            self.logger.info(f"✅ Research Phase complete: {len(research_data_paths)} comprehensive data files generated")
+        
+        if not research_data_paths:
+            raise ResearchAgentError("No research data was generated - cannot proceed")
+        
+        self.logger.info(f"✅ Research Phase complete: {len(research_data_paths)} comprehensive data files generated")
+        return research_data_paths
 
-            # Phase 2: Content Compilation using OpenAI Codex CLI
-            self.logger.info(f"⚙️ Phase 2: Compiling workshop content using OpenAI Codex CLI")
-            compiler_agent = CompilerAgent(self.config)
-            module_path = compiler_agent.compile_workshop(topic, research_data_paths)
-            
-            if not module_path or not os.path.exists(module_path):
-                raise CompilerAgentError(f"Workshop compilation failed - module not created at {module_path}")
-            
-            results['module_path'] = module_path
-            
-            # Extract workshop number for proper tracking
-            workshop_number = self._extract_workshop_number(module_path)
-            results['workshop_number'] = workshop_number
-            self.logger.info(f"✅ Compilation Phase complete: Workshop {workshop_number} created at {module_path}")
+    def _run_compile_phase(self, topic: str, research_data_paths: list) -> str:
+        """Phase 2: compile the workshop module from the research data."""
+        with self._compile_slots:
+            self.logger.info(f"⚙️ Phase 2: Compiling workshop content for '{topic}' using OpenAI Codex CLI")
+            module_path = self._get_compiler_agent().compile_workshop(topic, research_data_paths)
+        
+        if not module_path or not os.path.exists(module_path):
+            raise CompilerAgentError(f"Workshop compilation failed - module not created at {module_path}")
+        
+        self.logger.info(f"✅ Compilation Phase complete: Workshop created at {module_path}")
+        return module_path
 
-            # Phase 3: Professional PR Creation and Publishing
+    def _run_publish_phase(self, topic: str, module_path: str, workshop_number: str) -> str:
+        """Phase 3: publish the module and open a pull request."""
+        with self._publish_slots:
             self.logger.info(f"📤 Phase 3: Creating professional PR for workshop {workshop_number}")
-            git_agent = GitAgent(self.config)
-            pr_url = git_agent.publish_module(module_path, topic, workshop_number)
-            
-            if not pr_url:
-                raise GitAgentError("PR creation failed - no URL returned")
-            
-            results['pr_url'] = pr_url
-            results['success'] = True
-            results['generation_time'] = round(time.time() - start_time, 2)
-            
-            self.logger.info(f"✅ Publishing Phase complete: Professional PR created at {pr_url}")
-            self.logger.info(f"🎉 Workshop generation completed successfully in {results['generation_time']}s")
-            
-            # Print success summary
-            self._print_success_summary(results)
-            
-            return results
-
-        except (ResearchAgentError, CompilerAgentError, GitAgentError) as agent_error:
-            results['error'] = str(agent_error)
-            results['generation_time'] = round(time.time() - start_time, 2)
-            self.logger.error(f"❌ Agent error during workshop generation: {agent_error}", exc_info=True)
-            self._print_error_summary(results, agent_error)
-            raise
-            
-        except Exception as e:
-            results['error'] = str(e)
-            results['generation_time'] = round(time.time() - start_time, 2)
-            self.logger.error(f"❌ Unexpected error in orchestrator: {e}", exc_info=True)
-            self._print_error_summary(results, e)
-            raise OrchestratorError(f"Workshop generation failed: {e}") from e
-            
-        finally:
-            self._cleanup_temp_dir()
-            self.logger.info("🧹 Temporary workspace cleaned up")
+            pr_url = self._get_git_agent().publish_module(module_path, topic, workshop_number)
+        
+        if not pr_url:
+            raise GitAgentError("PR creation failed - no URL returned")
+        
+        self.logger.info(f"✅ Publishing Phase complete: Professional PR created at {pr_url}")
+        return pr_url
 
     def _extract_workshop_number(self, module_path: str) -> str:
         """Extract workshop number from module path following workshop-XX-slug format."""
@@ -217,17 +547,94 @@ This is the AI Workshop Builder orchestrator that coordinates multiple specializ
             self.logger.warning(f"Could not parse workshop number from '{module_dir_name}': {e}")
             return "XX"  # Fallback
 
+    def dry_run(self, topic: str) -> dict:
+        """
+        Plan a run for `topic` without calling any external service or creating files
+        in the workshops directory. Used by `cli.py --offline`.
+
+        Returns:
+            dict: The research queries (and whether each is already cached), compilation
+            settings, the workshop number the run would likely get, and the target repository
+        """
+        plan = {
+            'topic': topic,
+            'research_queries': [],
+            'compilation_mode': self.config.compilation_mode,
+            'research_backend': self.config.research_backend,
+            'compiler_backend': self.config.compiler_backend,
+            'compiler_model': backend_model_name(self.config.compiler_backend, self.config),
+            'workshop_number': None,
+            'module_path': None,
+            'similar_modules': [],
+            'repository': f"{self.config.github_repo_owner}/{self.config.github_repo_name}"
+        }
+
+        cache_config = self.config.get_research_cache_config()
+        cache = None
+        # Only looked up with contains(), which leaves the cache as it is; a missing cache
+        # directory is not created
+        if cache_config["enabled"] and not cache_config["refresh"] and os.path.isdir(cache_config["dir"]):
+            cache = ResearchCache(cache_config["dir"], cache_config["ttl_seconds"], cache_config["max_bytes"], logger=self.logger)
+        prompts = ResearchAgent._generate_research_prompts(topic)
+        research_model = backend_model_name(self.config.research_backend, self.config)
+        for focus_area, prompt in zip(ResearchAgent.FOCUS_AREAS, prompts):
+            cached = bool(cache and cache.contains(ResearchCache.make_key(research_model, topic, prompt)))
+            plan['research_queries'].append({'focus_area': focus_area, 'cached': cached})
+
+        try:
+            plan['workshop_number'], plan['module_path'] = self._get_compiler_agent().preview_module_directory(topic)
+        except CompilerAgentError as e:
+            self.logger.warning(f"Could not determine the next workshop number: {e}")
+        plan['similar_modules'] = self._find_duplicate_modules(topic)
+
+        self._print_dry_run_summary(plan)
+        return plan
+
+    def _print_dry_run_summary(self, plan: dict):
+        with self._print_lock:
+            cached = sum(1 for query in plan['research_queries'] if query['cached'])
+            print("\n" + "="*80)
+            print("🧪 OFFLINE DRY RUN (no API calls made)")
+            print("="*80)
+            print(f"📚 Topic: {plan['topic']}")
+            print(f"🔍 Research Queries: {len(plan['research_queries'])} ({cached} cached)")
+            for query in plan['research_queries']:
+                print(f"   - {query['focus_area']}{' (cached)' if query['cached'] else ''}")
+            print(f"🔍 Research Backend: {plan['research_backend']}")
+            print(f"🛠️  Compilation: {plan['compilation_mode']} mode with {plan['compiler_backend']} ({plan['compiler_model']})")
+            print(f"🔢 Next Workshop Number: {plan['workshop_number'] or 'unknown'}")
+            print(f"📁 Module Path: {plan['module_path'] or 'unknown'}")
+            for match in plan['similar_modules']:
+                missing = f", does not cover: {', '.join(match['missing_terms'])}" if match['missing_terms'] else ""
+                print(f"⚠️  Similar Module: {match['name']} (similarity {match['score']}{missing})")
+            print(f"🔗 Target Repository: {plan['repository']}")
+            print("="*80)
+
     def _print_success_summary(self, results: dict):
         """Print a comprehensive success summary."""
+        with self._print_lock:
+            self._print_success_lines(results)
+
+    def _print_success_lines(self, results: dict):
         print("\n" + "="*80)
         print("🎉 WORKSHOP GENERATION COMPLETED SUCCESSFULLY")
         print("="*80)
         print(f"📚 Topic: {results['topic']}")
+        print(f"🆔 Run ID: {results['run_id']}")
         print(f"🔢 Workshop Number: {results['workshop_number']}")
         print(f"📁 Module Path: {results['module_path']}")
         print(f"🔗 Pull Request: {results['pr_url']}")
         print(f"📊 Research Files: {results['research_files_count']}")
         print(f"⏱️  Generation Time: {results['generation_time']}s")
+        if results['phase_times']:
+            print(f"⏱️  Phase Times: {', '.join(f'{phase} {seconds}s' for phase, seconds in results['phase_times'].items())}")
+        if results['resumed_phases']:
+            print(f"⏭️  Resumed Phases: {', '.join(results['resumed_phases'])}")
+        if results['compilation_cache']:
+            cache_stats = results['compilation_cache']
+            print(f"🗃️  Compilation Cache: {cache_stats['hits']} hits / {cache_stats['misses']} misses")
+        if results['trace_id']:
+            print(f"🧭 Trace ID: {results['trace_id']}")
         print("\n🔧 Generated using:")
         print("  • Gemini Flash 2.5 for deep research")
         print("  • OpenAI Codex CLI for content compilation")
@@ -235,18 +642,60 @@ This is the AI Workshop Builder orchestrator that coordinates multiple specializ
         print("\n✅ Ready for review and integration!")
         print("="*80)
 
+    def _print_update_summary(self, results: dict):
+        """Print the outcome of a module update."""
+        with self._print_lock:
+            print("\n" + "="*80)
+            print("📝 WORKSHOP UPDATE COMPLETED" if results['success'] else "❌ WORKSHOP UPDATE FAILED")
+            print("="*80)
+            print(f"📁 Module: {results['module_path'] or results['module']}")
+            print(f"✏️  Updated Sections: {', '.join(results['updated']) or 'none'}")
+            if results['unchanged']:
+                print(f"➖ Unchanged Sections: {', '.join(results['unchanged'])}")
+            if results['failed']:
+                print(f"⚠️  Failed Sections: {', '.join(results['failed'])}")
+            print(f"📄 manifest.json: {'rewritten' if results['manifest_updated'] else 'unchanged'}, "
+                  f"README.md: {'rewritten' if results['readme_updated'] else 'unchanged'}")
+            if results['pr_url']:
+                print(f"🔗 Pull Request: {results['pr_url']}")
+            print(f"⏱️  Generation Time: {results['generation_time']}s")
+            if results['compilation_cache']:
+                cache_stats = results['compilation_cache']
+                print(f"🗃️  Compilation Cache: {cache_stats['hits']} hits / {cache_stats['misses']} misses")
+            if results['error']:
+                print(f"🚨 Error: {results['error']}")
+            print("="*80)
+
+    def _print_skipped_summary(self, results: dict):
+        """Print why a run was skipped as a duplicate."""
+        with self._print_lock:
+            print("\n" + "="*80)
+            print("⏭️  WORKSHOP GENERATION SKIPPED: DUPLICATE TOPIC")
+            print("="*80)
+            print(f"📚 Topic: {results['topic']}")
+            for match in results['duplicate_of']:
+                print(f"📁 Existing Module: {match['name']} (similarity {match['score']}): {match['description']}")
+            print(f"💡 {results['error']}")
+            print("="*80)
+
     def _print_error_summary(self, results: dict, error: Exception):
         """Print a comprehensive error summary."""
+        with self._print_lock:
+            self._print_error_lines(results, error)
+
+    def _print_error_lines(self, results: dict, error: Exception):
         print("\n" + "="*80)
         print("❌ WORKSHOP GENERATION FAILED")
         print("="*80)
         print(f"📚 Topic: {results['topic']}")
+        print(f"🆔 Run ID: {results['run_id']}")
         print(f"⏱️  Runtime: {results['generation_time']}s")
         print(f"📊 Research Files Generated: {results['research_files_count']}")
         if results['module_path']:
             print(f"📁 Partial Module: {results['module_path']}")
         print(f"🚨 Error: {error}")
         print("\n🔧 Check logs for detailed error information")
+        print(f"🔁 Resume with: python workshop-builder/cli.py --resume {results['run_id']}")
         print("="*80)
 
 if __name__ == '__main__':
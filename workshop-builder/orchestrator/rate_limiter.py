@@ -0,0 +1,158 @@
+import logging
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Callable, Optional
+
+from .config import AppConfig
+
+
+class TokenBucket:
+    """
+    A bucket refilled continuously at `rate_per_minute`, holding at most `capacity`.
+    A rate of 0 means unlimited. Not thread-safe on its own; RateLimiter serialises access.
+
+    A request is always charged its full amount. One larger than the bucket is let
+    through once the bucket is full and leaves the level negative; later requests
+    wait until that debt has been refilled, so the long-run rate never exceeds
+    `rate_per_minute` however large the individual requests are.
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: float, clock: Callable[[], float]):
+        self.rate_per_second = rate_per_minute / 60
+        self.capacity = capacity
+        self.level = capacity
+        self._clock = clock
+        self._updated = clock()
+
+    @property
+    def unlimited(self) -> bool:
+        return self.rate_per_second <= 0
+
+    def refill(self):
+        now = self._clock()
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.rate_per_second)
+        self._updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until `amount` may be taken (requests larger than the bucket wait for a full bucket)."""
+        if self.unlimited:
+            return 0.0
+        missing = min(amount, self.capacity) - self.level
+        return max(0.0, missing / self.rate_per_second)
+
+    def take(self, amount: float):
+        """Charge the full `amount`; the level goes negative for requests larger than what it held."""
+        if not self.unlimited:
+            self.level -= amount
+
+
+class RateLimiter:
+    """
+    Client-side rate limiter for one provider: a requests-per-minute bucket and a
+    tokens-per-minute bucket, each refilled continuously and holding at most
+    `burst_seconds` worth of quota, so a cold start cannot fire a minute's worth of
+    requests at once.
+
+    Callers block in `acquire` until both buckets can cover the request. Waiters are
+    served one at a time, round-robin across fairness keys (the workshop topic) and
+    first-come-first-served within a key, so a topic with many concurrent requests
+    cannot starve the others.
+    """
+
+    def __init__(self, provider: str, requests_per_minute: float = 0, tokens_per_minute: float = 0,
+                 burst_seconds: float = 10, logger: Optional[logging.Logger] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.provider = provider
+        burst_fraction = max(burst_seconds, 1) / 60
+        self.requests = TokenBucket(requests_per_minute, max(1.0, requests_per_minute * burst_fraction), clock)
+        self.tokens = TokenBucket(tokens_per_minute, max(1.0, tokens_per_minute * burst_fraction), clock)
+        self.logger = logger or logging.getLogger(__name__)
+        self._clock = clock
+        self._condition = threading.Condition()
+        self._waiters = OrderedDict()  # fairness key -> deque of waiting tickets
+        self._stats = {"acquired": 0, "waited": 0, "wait_seconds": 0.0}
+
+    @property
+    def enabled(self) -> bool:
+        return not (self.requests.unlimited and self.tokens.unlimited)
+
+    def _is_next(self, key, ticket) -> bool:
+        first_key = next(iter(self._waiters))
+        return first_key == key and self._waiters[key][0] is ticket
+
+    def _dequeue(self, key, ticket):
+        queue = self._waiters[key]
+        queue.remove(ticket)
+        if queue:
+            # Round-robin: this key goes to the back of the line behind the other topics
+            self._waiters.move_to_end(key)
+        else:
+            del self._waiters[key]
+
+    def acquire(self, tokens: int = 0, key: Optional[str] = None) -> float:
+        """Block until one request using `tokens` tokens may be sent; returns the seconds waited."""
+        if not self.enabled:
+            return 0.0
+
+        start = self._clock()
+        ticket = object()
+        with self._condition:
+            self._waiters.setdefault(key, deque()).append(ticket)
+            try:
+                while True:
+                    if not self._is_next(key, ticket):
+                        self._condition.wait()
+                        continue
+                    self.requests.refill()
+                    self.tokens.refill()
+                    delay = max(self.requests.wait_time(1), self.tokens.wait_time(tokens))
+                    if delay <= 0:
+                        self.requests.take(1)
+                        self.tokens.take(tokens)
+                        break
+                    self._condition.wait(delay)
+            finally:
+                self._dequeue(key, ticket)
+                self._condition.notify_all()
+
+            waited = self._clock() - start
+            self._stats["acquired"] += 1
+            if waited > 0.001:
+                self._stats["waited"] += 1
+                self._stats["wait_seconds"] += waited
+        if waited > 1:
+            self.logger.debug(f"Rate limiter ({self.provider}) delayed a request by {waited:.1f}s")
+        return waited
+
+    def stats(self) -> dict:
+        with self._condition:
+            return dict(self._stats, wait_seconds=round(self._stats["wait_seconds"], 3))
+
+
+# Process-wide limiters, one per provider, shared by every agent and run
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(provider: str, config: AppConfig, logger: Optional[logging.Logger] = None) -> RateLimiter:
+    """Return the shared rate limiter for `provider` ("openai", "gemini" or "stub")."""
+    with _limiters_lock:
+        limiter = _limiters.get(provider)
+        if limiter is None:
+            limits = config.get_rate_limit_config(provider)
+            limiter = RateLimiter(
+                provider,
+                requests_per_minute=limits["requests_per_minute"],
+                tokens_per_minute=limits["tokens_per_minute"],
+                burst_seconds=limits["burst_seconds"],
+                logger=logger
+            )
+            _limiters[provider] = limiter
+        return limiter
+
+
+def reset_rate_limiters():
+    """Drop the shared limiters, e.g. after changing the configured limits."""
+    with _limiters_lock:
+        _limiters.clear()
@@ -0,0 +1,123 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from typing import Optional
+
+
+class ResearchCache:
+    """
+    Persistent, content-addressed cache for research responses.
+
+    Entries are keyed by a hash of the model name, topic and prompt text and
+    stored as small JSON files under `cache_dir`. Entries older than the TTL
+    are treated as misses, and once the cache grows beyond `max_bytes` the
+    least recently used entries are evicted (reads refresh an entry's mtime).
+    """
+
+    def __init__(self, cache_dir: str, ttl_seconds: float, max_bytes: int, logger: Optional[logging.Logger] = None):
+        self.cache_dir = cache_dir
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.logger = logger or logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(model_name: str, topic: str, prompt: str) -> str:
+        """Build the cache key for a research prompt."""
+        payload = json.dumps([model_name, topic, prompt], ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response text for `key`, or None on a miss or expired entry."""
+        entry_path = self._entry_path(key)
+        try:
+            with open(entry_path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Discarding unreadable research cache entry {entry_path}: {e}")
+            self._remove(entry_path)
+            return None
+
+        if self.ttl_seconds and time.time() - entry.get("created_at", 0) > self.ttl_seconds:
+            self.logger.debug(f"Research cache entry expired: {key}")
+            self._remove(entry_path)
+            return None
+
+        # Touch the entry so eviction treats it as recently used
+        try:
+            os.utime(entry_path, None)
+        except OSError:
+            pass
+        return entry.get("response")
+
+    def contains(self, key: str) -> bool:
+        """
+        Whether `key` has an unexpired entry, without side effects: unlike `get`, the
+        entry's mtime is not refreshed and expired or unreadable entries are not removed.
+        """
+        try:
+            with open(self._entry_path(key), "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if self.ttl_seconds and time.time() - entry.get("created_at", 0) > self.ttl_seconds:
+            return False
+        return "response" in entry
+
+    def put(self, key: str, response: str, **metadata) -> None:
+        """Store a response and evict least recently used entries if the cache is over budget."""
+        entry = dict(metadata, response=response, created_at=time.time())
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp_path, self._entry_path(key))
+        except OSError as e:
+            self.logger.warning(f"Could not write research cache entry {key}: {e}")
+            self._remove(tmp_path)
+            return
+        self._evict()
+
+    def _evict(self) -> None:
+        """Remove the least recently used entries until the cache fits in max_bytes."""
+        if not self.max_bytes:
+            return
+        with self._lock:
+            entries = []
+            total_size = 0
+            for name in os.listdir(self.cache_dir):
+                if not name.endswith(".json"):
+                    continue
+                path = os.path.join(self.cache_dir, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+                total_size += stat.st_size
+
+            if total_size <= self.max_bytes:
+                return
+
+            for _, size, path in sorted(entries):
+                self._remove(path)
+                total_size -= size
+                self.logger.debug(f"Evicted research cache entry: {path}")
+                if total_size <= self.max_bytes:
+                    break
+
+    def _remove(self, path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
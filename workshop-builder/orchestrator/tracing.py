@@ -0,0 +1,264 @@
+import contextvars
+import functools
+import json
+import logging
+import os
+import secrets
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional
+
+# Numeric span attributes that are summed into the per-run metrics record
+METRIC_ATTRIBUTES = ("bytes_in", "bytes_out", "tokens_in", "tokens_out", "retries", "github_api_calls")
+# Rough bytes-per-token ratio used when a provider does not report token usage
+BYTES_PER_TOKEN = 4
+
+
+def text_bytes(text: Optional[str]) -> int:
+    """UTF-8 size of `text` (0 for None)."""
+    return len(text.encode("utf-8")) if text else 0
+
+
+class Span:
+    """One timed operation. Attributes are plain JSON values; numeric ones can be accumulated with `add`."""
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], attributes: dict):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.attributes = dict(attributes)
+        self.start_unix_nano = time.time_ns()
+        self.end_unix_nano = None
+        self._start = time.perf_counter()
+        self.duration_s = None
+        self.status = "ok"
+        self.error = None
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+    def add(self, key: str, amount=1):
+        self.attributes[key] = self.attributes.get(key, 0) + amount
+
+    def finish(self, error: Optional[BaseException] = None):
+        # LLM spans (those with a `provider`) that lack provider-reported usage get estimated token counts
+        for direction in ("in", "out"):
+            if "provider" in self.attributes and f"bytes_{direction}" in self.attributes and f"tokens_{direction}" not in self.attributes:
+                self.attributes[f"tokens_{direction}"] = self.attributes[f"bytes_{direction}"] // BYTES_PER_TOKEN
+                self.attributes["tokens_estimated"] = True
+        self.duration_s = round(time.perf_counter() - self._start, 6)
+        self.end_unix_nano = self.start_unix_nano + int(self.duration_s * 1e9)
+        if error is not None:
+            self.status = "error"
+            self.error = f"{type(error).__name__}: {error}"
+
+    def to_dict(self) -> dict:
+        return {
+            "type": "span",
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start_unix_nano": self.start_unix_nano,
+            "end_unix_nano": self.end_unix_nano,
+            "duration_s": self.duration_s,
+            "status": self.status,
+            "error": self.error,
+            "attributes": self.attributes
+        }
+
+
+class _NoopSpan:
+    """Stand-in yielded while tracing is disabled, so instrumented code needs no checks."""
+
+    attributes = {}
+    trace_id = None
+
+    def set(self, **attributes):
+        pass
+
+    def add(self, key: str, amount=1):
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+_current_span = contextvars.ContextVar("workshop_builder_current_span", default=None)
+
+
+def _otlp_value(value) -> dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    if isinstance(value, str):
+        return {"stringValue": value}
+    return {"stringValue": json.dumps(value, default=str)}
+
+
+def to_otlp_request(spans: List[Span], service_name: str) -> dict:
+    """Build an OTLP/JSON ExportTraceServiceRequest for the given spans."""
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": service_name}}]},
+            "scopeSpans": [{
+                "scope": {"name": "workshop_builder.tracing"},
+                "spans": [
+                    {
+                        "traceId": span.trace_id,
+                        "spanId": span.span_id,
+                        **({"parentSpanId": span.parent_id} if span.parent_id else {}),
+                        "name": span.name,
+                        "kind": 1,  # SPAN_KIND_INTERNAL
+                        "startTimeUnixNano": str(span.start_unix_nano),
+                        "endTimeUnixNano": str(span.end_unix_nano),
+                        "attributes": [{"key": key, "value": _otlp_value(value)} for key, value in span.attributes.items()],
+                        "status": {"code": 2, "message": span.error} if span.status == "error" else {"code": 1}
+                    }
+                    for span in spans
+                ]
+            }]
+        }]
+    }
+
+
+class Tracer:
+    """
+    Records spans for pipeline phases and external calls.
+
+    Spans nest through a context variable; use `bind` to carry the current span into
+    worker threads. Finished spans are appended to `<trace_dir>/spans.jsonl` as they
+    end. When a root span (one run) ends, the run's spans are also written as one
+    OTLP/JSON ExportTraceServiceRequest line to `<trace_dir>/otlp-traces.jsonl`
+    (readable by the OpenTelemetry Collector's `otlpjsonfile` receiver), and a
+    per-span-name metrics record is appended to the JSONL file.
+    """
+
+    SERVICE_NAME = "workshop-builder"
+
+    def __init__(self, trace_dir: Optional[str] = None, formats=("jsonl", "otlp"), logger: Optional[logging.Logger] = None):
+        self.trace_dir = trace_dir
+        self.formats = set(formats)
+        self.enabled = bool(trace_dir) and bool(self.formats)
+        self.logger = logger or logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._trace_spans: Dict[str, List[Span]] = {}
+        if self.enabled:
+            os.makedirs(trace_dir, exist_ok=True)
+
+    @property
+    def jsonl_path(self) -> str:
+        return os.path.join(self.trace_dir, "spans.jsonl")
+
+    @property
+    def otlp_path(self) -> str:
+        return os.path.join(self.trace_dir, "otlp-traces.jsonl")
+
+    def current_span(self):
+        """The innermost active span, or a no-op span."""
+        return _current_span.get() or _NOOP_SPAN
+
+    @contextmanager
+    def span(self, name: str, **attributes):
+        """Time the enclosed block as a child of the current span (a new trace if there is none)."""
+        if not self.enabled:
+            yield _NOOP_SPAN
+            return
+
+        parent = _current_span.get()
+        trace_id = parent.trace_id if parent else secrets.token_hex(16)
+        span = Span(name, trace_id, parent.span_id if parent else None, attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except GeneratorExit:
+            # A consumer stopped iterating a generator that holds this span open; not a failure
+            span.finish()
+            raise
+        except BaseException as e:
+            span.finish(error=e)
+            raise
+        else:
+            span.finish()
+        finally:
+            _current_span.reset(token)
+            self._export(span, is_root=parent is None)
+
+    def bind(self, fn: Callable) -> Callable:
+        """Wrap `fn` so spans it creates on another thread are children of the current span."""
+        parent = _current_span.get()
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            token = _current_span.set(parent)
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                _current_span.reset(token)
+        return wrapper
+
+    def _append_line(self, path: str, record: dict):
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, default=str) + "\n")
+
+    def _export(self, span: Span, is_root: bool):
+        try:
+            with self._lock:
+                spans = self._trace_spans.setdefault(span.trace_id, [])
+                spans.append(span)
+                if "jsonl" in self.formats:
+                    self._append_line(self.jsonl_path, span.to_dict())
+                if not is_root:
+                    return
+                del self._trace_spans[span.trace_id]
+                if "jsonl" in self.formats:
+                    self._append_line(self.jsonl_path, self._metrics_record(span, spans))
+                if "otlp" in self.formats:
+                    self._append_line(self.otlp_path, to_otlp_request(spans, self.SERVICE_NAME))
+        except OSError as e:
+            self.logger.warning(f"Could not write trace data: {e}")
+
+    @staticmethod
+    def _metrics_record(root: Span, spans: List[Span]) -> dict:
+        """Aggregate a run's spans by name: count, total and max duration, and summed byte/token/retry/API-call counts."""
+        by_name = {}
+        for span in spans:
+            entry = by_name.setdefault(span.name, {"count": 0, "errors": 0, "total_s": 0.0, "max_s": 0.0})
+            entry["count"] += 1
+            entry["errors"] += span.status == "error"
+            entry["total_s"] = round(entry["total_s"] + span.duration_s, 6)
+            entry["max_s"] = max(entry["max_s"], span.duration_s)
+            for key in METRIC_ATTRIBUTES:
+                value = span.attributes.get(key)
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    entry[key] = entry.get(key, 0) + value
+        return {
+            "type": "metrics",
+            "trace_id": root.trace_id,
+            "name": root.name,
+            "duration_s": root.duration_s,
+            "attributes": root.attributes,
+            "spans": by_name
+        }
+
+
+_tracer = Tracer()
+
+
+def get_tracer() -> Tracer:
+    """Return the process-wide tracer (disabled until `configure_tracing` enables it)."""
+    return _tracer
+
+
+def configure_tracing(config, logger: Optional[logging.Logger] = None) -> Tracer:
+    """Install the process-wide tracer from `config` (TRACING_ENABLED, TRACE_DIR, TRACE_FORMATS)."""
+    global _tracer
+    tracing_config = config.get_tracing_config()
+    if tracing_config["enabled"]:
+        _tracer = Tracer(tracing_config["dir"], formats=tracing_config["formats"], logger=logger)
+    else:
+        _tracer = Tracer()
+    return _tracer
@@ -0,0 +1,35 @@
+import pytest
+
+from harness import load_builder_module, make_config, work_directory
+
+orchestrator_module = load_builder_module("orchestrator.orchestrator")
+batch = load_builder_module("orchestrator.batch")
+
+
+def slots(semaphore) -> int:
+    """How many holders `semaphore` admits at once."""
+    count = 0
+    while semaphore.acquire(blocking=False):
+        count += 1
+    for _ in range(count):
+        semaphore.release()
+    return count
+
+
+@pytest.mark.parametrize("mode, publish_workers, expected", [
+    ("checkout", 4, 1),
+    ("worktree", 4, 4),
+    ("worktree", 1, 1),
+    ("api", 6, 6),
+])
+def test_publish_workers_are_only_capped_in_checkout_mode(mode, publish_workers, expected):
+    with work_directory() as work_dir:
+        # BATCH_PUBLISH_WORKERS is only the default for --publish-workers, not a cap on it
+        config = make_config(work_dir, git_publish_mode=mode, batch_publish_workers=2)
+        orchestrator = orchestrator_module.Orchestrator(config)
+
+        batch.BatchRunner(orchestrator, research_workers=2, compile_workers=3, publish_workers=publish_workers)
+
+        assert slots(orchestrator._publish_slots) == expected
+        assert slots(orchestrator._research_slots) == 2
+        assert slots(orchestrator._compile_slots) == 3
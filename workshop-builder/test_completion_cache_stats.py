@@ -0,0 +1,31 @@
+import os
+
+from harness import load_builder_module, make_config, work_directory
+
+orchestrator_module = load_builder_module("orchestrator.orchestrator")
+
+
+def test_runs_report_their_own_cache_hits_and_misses():
+    with work_directory() as work_dir:
+        config = make_config(work_dir, completion_cache_enabled=True)
+        orchestrator = orchestrator_module.Orchestrator(config)
+
+        reported = [orchestrator.run(topic, publish=False)['compilation_cache']
+                    for topic in ("Cache Topic A", "Cache Topic B", "Cache Topic A")]
+
+        assert reported == [{"hits": 0, "misses": 1}, {"hits": 0, "misses": 1}, {"hits": 1, "misses": 0}]
+        assert orchestrator._compiler_agent.cache_stats() == {"hits": 1, "misses": 2}
+
+
+def test_update_reports_its_own_cache_hits_and_misses():
+    with work_directory() as work_dir:
+        config = make_config(work_dir, completion_cache_enabled=True)
+        orchestrator = orchestrator_module.Orchestrator(config)
+        module_path = orchestrator.run("Cache Topic A", publish=False)['module_path']
+        sections = sorted(name for name in os.listdir(module_path) if name[:2].isdigit())[:2]
+        assert sections
+
+        results = orchestrator.update(module_path, sections, publish=False)
+
+        assert results['success']
+        assert results['compilation_cache'] == {"hits": 0, "misses": len(sections)}
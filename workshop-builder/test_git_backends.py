@@ -0,0 +1,129 @@
+import os
+import subprocess
+
+import pytest
+
+from harness import git, init_git_repo, load_builder_module
+
+git_backends = load_builder_module("agents.git_backends")
+
+BACKENDS = ["subprocess"] + (["gitpython"] if git_backends.GITPYTHON_AVAILABLE else [])
+
+
+@pytest.fixture(params=BACKENDS)
+def repo(request, tmp_path):
+    """A repository with one committed module and a bare `origin`, and a backend of each kind for it."""
+    repo_dir = str(tmp_path / "repo")
+    write(repo_dir, "workshop-1-intro/01_intro.md", "# Intro\n")
+    init_git_repo(repo_dir, str(tmp_path / "origin.git"))
+    return git_backends.create_git_backend(request.param, repo_dir)
+
+
+def write(repo_dir: str, relative_path: str, content: str):
+    path = os.path.join(repo_dir, relative_path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(content)
+
+
+def test_status_reports_changes(repo):
+    assert repo.status() == ""
+    write(repo.repo_dir, "workshop-2-new/01_new.md", "# New\n")
+    assert "workshop-2-new" in repo.status()
+
+
+def test_add_and_commit_a_new_module(repo):
+    write(repo.repo_dir, "workshop-2-new/01_new.md", "# New\n")
+    write(repo.repo_dir, "workshop-2-new/manifest.json", "{}\n")
+    repo.switch_branch("feature")
+    repo.add("workshop-2-new")
+
+    assert repo.commit("Add workshop 2")
+    assert git(repo.repo_dir, "log", "-1", "--format=%s") == "Add workshop 2"
+    assert git(repo.repo_dir, "show", "--name-only", "--format=", "HEAD").splitlines() == [
+        "workshop-2-new/01_new.md", "workshop-2-new/manifest.json"
+    ]
+    assert git(repo.repo_dir, "rev-parse", "--abbrev-ref", "HEAD") == "feature"
+    assert repo.status() == ""
+
+
+def test_commit_without_changes_returns_false(repo):
+    repo.add("workshop-1-intro")
+    assert not repo.commit("Nothing changed")
+    assert git(repo.repo_dir, "rev-list", "--count", "HEAD") == "1"
+
+
+def test_add_stages_modified_and_removed_files(repo):
+    write(repo.repo_dir, "workshop-1-intro/02_next.md", "# Next\n")
+    repo.add("workshop-1-intro")
+    repo.commit("Add a section")
+
+    write(repo.repo_dir, "workshop-1-intro/01_intro.md", "# Intro, revised\n")
+    os.remove(os.path.join(repo.repo_dir, "workshop-1-intro", "02_next.md"))
+    repo.add("workshop-1-intro")
+
+    assert repo.commit("Update workshop 1")
+    assert git(repo.repo_dir, "show", "HEAD:workshop-1-intro/01_intro.md") == "# Intro, revised"
+    assert git(repo.repo_dir, "ls-files") == "workshop-1-intro/01_intro.md"
+    assert repo.status() == ""
+
+
+def test_add_of_a_missing_path_fails(repo):
+    with pytest.raises(git_backends.GitBackendError):
+        repo.add("workshop-9-missing")
+
+
+def test_push_branch_and_detached_head(repo, tmp_path):
+    origin = str(tmp_path / "origin.git")
+    write(repo.repo_dir, "workshop-2-new/01_new.md", "# New\n")
+    repo.switch_branch("feature")
+    repo.add("workshop-2-new")
+    repo.commit("Add workshop 2")
+
+    repo.push("origin", "feature", set_upstream=True)
+    assert git(origin, "rev-parse", "feature") == git(repo.repo_dir, "rev-parse", "HEAD")
+    assert git(repo.repo_dir, "rev-parse", "--abbrev-ref", "feature@{upstream}") == "origin/feature"
+
+    repo.push("origin", "published", force_with_lease=True, source="HEAD")
+    assert git(origin, "rev-parse", "published") == git(repo.repo_dir, "rev-parse", "HEAD")
+
+
+def test_rejected_push_raises(repo, tmp_path):
+    # Someone else moves origin/main ahead of the local main
+    other = str(tmp_path / "other")
+    subprocess.run(["git", "clone", "-q", "-b", "main", str(tmp_path / "origin.git"), other], check=True)
+    git(other, "-c", "user.email=o@example.com", "-c", "user.name=Other", "commit", "-q", "--allow-empty", "-m", "Elsewhere")
+    git(other, "push", "-q", "origin", "main")
+
+    write(repo.repo_dir, "workshop-2-new/01_new.md", "# New\n")
+    repo.add("workshop-2-new")
+    repo.commit("Add workshop 2")
+    with pytest.raises(git_backends.GitBackendError):
+        repo.push("origin", "main")
+
+    git(repo.repo_dir, "config", "pull.rebase", "false")
+    repo.pull("origin", "main")
+    repo.push("origin", "main")
+    assert git(str(tmp_path / "origin.git"), "rev-parse", "main") == git(repo.repo_dir, "rev-parse", "HEAD")
+
+
+@pytest.mark.skipif(not git_backends.GITPYTHON_AVAILABLE, reason="gitpython is not installed")
+def test_gitpython_switches_branches_without_running_git(tmp_path, monkeypatch):
+    repo_dir = str(tmp_path / "repo")
+    write(repo_dir, "workshop-1-intro/01_intro.md", "# Intro\n")
+    init_git_repo(repo_dir)
+    backend = git_backends.GitPythonBackend(repo_dir)
+
+    def no_process(*args, **kwargs):
+        raise AssertionError(f"git process started: {args}")
+
+    monkeypatch.setattr(subprocess, "Popen", no_process)
+    monkeypatch.setattr(subprocess, "run", no_process)
+    monkeypatch.setattr(backend._git.cmd, "Popen", no_process)
+    backend.switch_branch("feature")
+    backend.checkout("feature")
+    backend.switch_branch("feature", reset=True)
+    monkeypatch.undo()
+
+    assert git(repo_dir, "rev-parse", "--abbrev-ref", "HEAD") == "feature"
+    assert git(repo_dir, "rev-parse", "feature") == git(repo_dir, "rev-parse", "main")
@@ -0,0 +1,34 @@
+import pytest
+from harness import load_builder_module
+
+llm_backends = load_builder_module("agents.llm_backends")
+
+
+class ChatOnlyBackend(llm_backends.LLMBackend):
+    def chat_completion(self, messages, max_tokens, temperature, json_mode=False):
+        return "reply"
+
+
+class EchoBackend(ChatOnlyBackend):
+    def generate_text(self, prompt):
+        return prompt
+
+
+def test_incomplete_backend_fails_when_instantiated():
+    with pytest.raises(TypeError, match="generate_text"):
+        ChatOnlyBackend()
+    with pytest.raises(TypeError):
+        llm_backends.LLMBackend()
+
+
+def test_default_stream_delivers_whole_response():
+    backend = EchoBackend()
+
+    assert backend.generate_text("prompt") == "prompt"
+    assert list(backend.stream_chat_completion([{"role": "user", "content": "x"}], 10, 0.0)) == ["reply", (None, "stop")]
+
+
+def test_stub_backend_implements_interface():
+    backend = llm_backends.StubBackend(latency_seconds=0, tokens_per_second=0)
+
+    assert backend.generate_text('Research "Topic"')
@@ -0,0 +1,113 @@
+import os
+
+import pytest
+
+from harness import load_builder_module, make_config, work_directory
+
+module_writer = load_builder_module("agents.module_writer")
+compiler_agent = load_builder_module("agents.compiler_agent")
+StagedModule = module_writer.StagedModule
+
+
+def read_files(directory: str) -> dict:
+    files = {}
+    for name in sorted(os.listdir(directory)):
+        with open(os.path.join(directory, name), "r", encoding="utf-8") as f:
+            files[name] = f.read()
+    return files
+
+
+def staging_entries(workshops_dir: str) -> list:
+    staging_root = os.path.join(workshops_dir, module_writer.STAGING_DIR_NAME)
+    return os.listdir(staging_root) if os.path.isdir(staging_root) else []
+
+
+@pytest.mark.parametrize("fsync", [True, False])
+def test_new_module_is_moved_into_place(tmp_path, fsync):
+    module_path = str(tmp_path / "workshop-1-topic")
+    staged = StagedModule(module_path, fsync=fsync)
+    staged.write("00_introduction.md", "# Intro\n")
+    staged.write("README.md", "# Topic\n")
+    assert not os.path.exists(module_path)
+
+    assert staged.publish() == ["00_introduction.md", "README.md"]
+    assert read_files(module_path) == {"00_introduction.md": "# Intro\n", "README.md": "# Topic\n"}
+    assert staging_entries(str(tmp_path)) == []
+    assert staged.publish() == []
+
+
+def test_new_module_replaces_an_empty_directory(tmp_path):
+    module_path = tmp_path / "workshop-1-topic"
+    module_path.mkdir()
+    staged = StagedModule(str(module_path))
+    staged.write("README.md", "# Topic\n")
+
+    assert staged.publish() == ["README.md"]
+    assert read_files(str(module_path)) == {"README.md": "# Topic\n"}
+
+
+def test_new_module_is_never_merged_into_an_existing_one(tmp_path):
+    module_path = tmp_path / "workshop-1-topic"
+    module_path.mkdir()
+    (module_path / "00_introduction.md").write_text("# Someone else's module\n", encoding="utf-8")
+    staged = StagedModule(str(module_path))
+    staged.write("00_introduction.md", "# Intro\n")
+    staged.write("README.md", "# Topic\n")
+
+    with pytest.raises(module_writer.ModuleWriterError, match="not empty"):
+        staged.publish()
+
+    assert not staged.published
+    assert read_files(str(module_path)) == {"00_introduction.md": "# Someone else's module\n"}
+    staged.discard()
+    assert staging_entries(str(tmp_path)) == []
+
+
+def test_update_replaces_only_changed_files(tmp_path):
+    module_path = tmp_path / "workshop-1-topic"
+    module_path.mkdir()
+    for name, content in {"01_concepts.md": "# Concepts\n", "02_hands_on.md": "# Old\n", "README.md": "# Topic\n"}.items():
+        (module_path / name).write_text(content, encoding="utf-8")
+    unchanged_inode = os.stat(module_path / "01_concepts.md").st_ino
+
+    staged = StagedModule(str(module_path), update=True)
+    staged.write("01_concepts.md", "# Concepts\n")
+    staged.write("02_hands_on.md", "# New\n")
+
+    assert staged.publish() == ["02_hands_on.md"]
+    assert read_files(str(module_path)) == {"01_concepts.md": "# Concepts\n", "02_hands_on.md": "# New\n", "README.md": "# Topic\n"}
+    assert os.stat(module_path / "01_concepts.md").st_ino == unchanged_inode
+    assert staging_entries(str(tmp_path)) == []
+
+
+def test_failed_compilation_leaves_no_module_or_staging():
+    with work_directory() as work_dir:
+        config = make_config(work_dir)
+        agent = compiler_agent.CompilerAgent(config)
+        module_path = os.path.join(config.workshops_base_dir, "workshop-1-topic")
+
+        with pytest.raises(RuntimeError):
+            with agent._staged_module(module_path) as staged:
+                staged.write("00_introduction.md", "# Intro\n")
+                raise RuntimeError("compilation failed")
+
+        assert not os.path.exists(module_path)
+        assert staging_entries(config.workshops_base_dir) == []
+
+
+def test_compiler_refuses_to_publish_over_an_existing_module():
+    with work_directory() as work_dir:
+        config = make_config(work_dir)
+        agent = compiler_agent.CompilerAgent(config)
+        module_path = os.path.join(config.workshops_base_dir, "workshop-1-topic")
+        os.makedirs(module_path)
+        with open(os.path.join(module_path, "README.md"), "w", encoding="utf-8") as f:
+            f.write("# Existing\n")
+
+        with pytest.raises(compiler_agent.CompilerAgentError):
+            with agent._staged_module(module_path) as staged:
+                staged.write("README.md", "# New\n")
+                agent._publish_staged_module(staged)
+
+        assert read_files(module_path) == {"README.md": "# Existing\n"}
+        assert staging_entries(config.workshops_base_dir) == []
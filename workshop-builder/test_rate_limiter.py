@@ -0,0 +1,111 @@
+import threading
+
+import pytest
+from harness import load_builder_module
+
+rate_limiter = load_builder_module("orchestrator.rate_limiter")
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeCondition(type(threading.Condition())):
+    """A condition whose timed waits advance the fake clock instead of blocking."""
+
+    def __init__(self, clock):
+        super().__init__()
+        self.clock = clock
+
+    def wait(self, timeout=None):
+        assert timeout is not None, "a single caller is always next in line"
+        # A floating-point remainder can leave a vanishing timeout; real time always moves on
+        self.clock.now += max(timeout, 1e-6)
+        return False
+
+
+def admit(limiter, clock, requests):
+    """Acquire each token amount in turn from one caller; returns the (time, tokens) admissions."""
+    limiter._condition = FakeCondition(clock)
+    admitted = []
+    for tokens in requests:
+        limiter.acquire(tokens)
+        admitted.append((clock.now, tokens))
+    return admitted
+
+
+def max_overdraft(admitted, tokens_per_minute):
+    """
+    The most a provider that enforces `tokens_per_minute` as a bucket holding one
+    minute of tokens (how OpenAI applies TPM) would be overdrawn by these admissions;
+    0 means no request would be rejected with a 429.
+    """
+    level, last, overdraft = tokens_per_minute, 0.0, 0.0
+    for at, tokens in admitted:
+        level = min(tokens_per_minute, level + (at - last) * tokens_per_minute / 60) - tokens
+        last = at
+        overdraft = max(overdraft, -level)
+    return overdraft
+
+
+def tokens_in_window(admitted, start, seconds):
+    return sum(tokens for at, tokens in admitted if start <= at < start + seconds)
+
+
+@pytest.mark.parametrize("request_tokens", [1_000, 5_000, 12_000, 18_000, 30_000])
+def test_requests_are_charged_in_full(request_tokens):
+    clock = FakeClock()
+    limiter = rate_limiter.RateLimiter("test", tokens_per_minute=30_000, burst_seconds=10, clock=clock)
+
+    admitted = admit(limiter, clock, [request_tokens] * 20)
+
+    duration = admitted[-1][0]
+    # Long-run rate: beyond the initial burst (the 5000-token bucket, or one larger request)
+    # everything is paid for at 30000 tokens per minute
+    burst = max(limiter.tokens.capacity, request_tokens)
+    assert sum(tokens for _, tokens in admitted) - burst <= 30_000 * duration / 60 + 1e-6
+    assert max_overdraft(admitted, 30_000) <= 1e-6
+    for at, _ in admitted:
+        assert tokens_in_window(admitted, at, 60) <= 30_000 + request_tokens
+
+
+def test_oversized_requests_do_not_burst_through():
+    # 12k prompt + 4k max_tokens against a 5k bucket at 30000 TPM: previously 7 of these were let through in 60s
+    clock = FakeClock()
+    limiter = rate_limiter.RateLimiter("test", tokens_per_minute=30_000, burst_seconds=10, clock=clock)
+
+    admitted = admit(limiter, clock, [18_000] * 7)
+
+    assert tokens_in_window(admitted, 0, 60) <= 2 * 18_000
+    assert [round(at) for at, _ in admitted] == [0, 36, 72, 108, 144, 180, 216]
+    assert max_overdraft(admitted, 30_000) <= 1e-6
+
+
+def test_mixed_sizes_never_overdraw_the_provider():
+    clock = FakeClock()
+    limiter = rate_limiter.RateLimiter("test", requests_per_minute=500, tokens_per_minute=40_000, burst_seconds=10, clock=clock)
+
+    admitted = admit(limiter, clock, [300, 25_000, 800, 16_000, 40_000, 100, 100, 9_000] * 5)
+
+    assert max_overdraft(admitted, 40_000) <= 1e-6
+
+
+def test_small_requests_use_the_burst_without_waiting():
+    clock = FakeClock()
+    limiter = rate_limiter.RateLimiter("test", tokens_per_minute=60_000, burst_seconds=10, clock=clock)
+
+    admitted = admit(limiter, clock, [1_000] * 10)
+
+    assert all(at == 0 for at, _ in admitted)
+    assert admit(limiter, clock, [1_000])[0][0] == pytest.approx(1.0)
+
+
+def test_unlimited_bucket_never_waits():
+    bucket = rate_limiter.TokenBucket(0, 1, FakeClock())
+    bucket.take(10 ** 9)
+
+    assert bucket.wait_time(10 ** 9) == 0.0
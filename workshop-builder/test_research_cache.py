@@ -0,0 +1,106 @@
+import os
+import time
+
+import pytest
+
+from harness import create_workshop_modules, load_builder_module, make_config, work_directory
+
+ResearchCache = load_builder_module("orchestrator.research_cache").ResearchCache
+
+
+def snapshot(cache_dir: str) -> dict:
+    return {name: os.stat(os.path.join(cache_dir, name)).st_mtime_ns for name in os.listdir(cache_dir)}
+
+
+def backdate(path: str, seconds: float):
+    past = time.time() - seconds
+    os.utime(path, (past, past))
+
+
+def test_contains_is_read_only(tmp_path):
+    cache = ResearchCache(str(tmp_path), ttl_seconds=60, max_bytes=0)
+    cache.put("fresh", "response")
+    backdate(os.path.join(tmp_path, "fresh.json"), 30)
+    with open(os.path.join(tmp_path, "expired.json"), "w", encoding="utf-8") as f:
+        f.write('{"response": "old response", "created_at": 0}')
+    before = snapshot(str(tmp_path))
+
+    assert cache.contains("fresh")
+    assert not cache.contains("expired")
+    assert not cache.contains("missing")
+
+    assert snapshot(str(tmp_path)) == before
+
+
+def test_get_refreshes_and_evicts_expired(tmp_path):
+    cache = ResearchCache(str(tmp_path), ttl_seconds=60, max_bytes=0)
+    cache.put("fresh", "response")
+    entry_path = os.path.join(tmp_path, "fresh.json")
+    backdate(entry_path, 30)
+    before = os.stat(entry_path).st_mtime
+
+    assert cache.get("fresh") == "response"
+    assert os.stat(entry_path).st_mtime > before
+
+    with open(os.path.join(tmp_path, "expired.json"), "w", encoding="utf-8") as f:
+        f.write('{"response": "old", "created_at": 0}')
+    assert cache.get("expired") is None
+    assert not os.path.exists(os.path.join(tmp_path, "expired.json"))
+
+
+def test_dry_run_leaves_research_cache_untouched():
+    orchestrator_module = load_builder_module("orchestrator.orchestrator")
+    research_agent = load_builder_module("agents.research_agent")
+    llm_backends = load_builder_module("agents.llm_backends")
+    with work_directory() as work_dir:
+        config = make_config(work_dir, research_cache_enabled=True, offline=True)
+        cache_config = config.get_research_cache_config()
+        cache = ResearchCache(cache_config["dir"], cache_config["ttl_seconds"], cache_config["max_bytes"])
+        topic = "Cache Topic"
+        prompts = research_agent.ResearchAgent._generate_research_prompts(topic)
+        model = llm_backends.backend_model_name(config.research_backend, config)
+        cache.put(ResearchCache.make_key(model, topic, prompts[0]), "cached")
+        backdate(os.path.join(cache_config["dir"], os.listdir(cache_config["dir"])[0]), 30)
+        with open(os.path.join(cache_config["dir"], "expired.json"), "w", encoding="utf-8") as f:
+            f.write('{"response": "old", "created_at": 0}')
+        before = snapshot(cache_config["dir"])
+
+        plan = orchestrator_module.Orchestrator(config).dry_run(topic)
+
+        assert [query["cached"] for query in plan["research_queries"]] == [True] + [False] * (len(prompts) - 1)
+        assert snapshot(cache_config["dir"]) == before
+
+
+def tree_snapshot(directory: str) -> dict:
+    """Every file and directory under `directory` with its size and modification time."""
+    snapshot = {}
+    for root, dirs, files in os.walk(directory):
+        for name in dirs + files:
+            path = os.path.join(root, name)
+            stat = os.stat(path)
+            snapshot[os.path.relpath(path, directory)] = (stat.st_size, stat.st_mtime_ns)
+    return snapshot
+
+
+@pytest.mark.parametrize("index_state", ["missing", "current", "out_of_date"])
+def test_dry_run_leaves_workshops_directory_untouched(index_state):
+    orchestrator_module = load_builder_module("orchestrator.orchestrator")
+    compiler_agent = load_builder_module("agents.compiler_agent")
+    with work_directory() as work_dir:
+        config = make_config(work_dir)
+        create_workshop_modules(config.workshops_base_dir, 3)
+        if index_state != "missing":
+            # A previous online run built the index and has finished
+            agent = compiler_agent.CompilerAgent(config)
+            agent.find_existing_modules("Warm Up")
+            agent._workshop_index().close()
+        if index_state == "out_of_date":
+            create_workshop_modules(config.workshops_base_dir, 5)
+        before = tree_snapshot(config.workshops_base_dir)
+
+        config.offline = True
+        plan = orchestrator_module.Orchestrator(config).dry_run("Benchmark Topic 2")
+
+        assert tree_snapshot(config.workshops_base_dir) == before
+        assert plan["workshop_number"] == (6 if index_state == "out_of_date" else 4)
+        assert [match["name"] for match in plan["similar_modules"]][:1] == ["workshop-2-benchmark-topic-2"]
@@ -0,0 +1,129 @@
+import email.utils
+import types
+
+import pytest
+from harness import load_builder_module
+
+retry_policy = load_builder_module("agents.retry_policy")
+RetryPolicy = retry_policy.RetryPolicy
+
+NOW = 1_700_000_000.0
+
+
+class APIError(Exception):
+    def __init__(self, status_code=None, headers=None):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+        self.response = types.SimpleNamespace(headers=headers or {})
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Fake time: `sleep` advances `now` instead of blocking."""
+    state = types.SimpleNamespace(now=NOW, sleeps=[])
+
+    def sleep(seconds):
+        state.sleeps.append(seconds)
+        state.now += seconds
+
+    state.sleep = sleep
+    monkeypatch.setattr(retry_policy.time, "time", lambda: state.now)
+    return state
+
+
+def failing(errors, result="ok"):
+    calls = []
+
+    def fn():
+        calls.append(1)
+        if len(calls) <= len(errors):
+            raise errors[len(calls) - 1]
+        return result
+
+    return fn, calls
+
+
+@pytest.mark.parametrize("headers, expected", [
+    ({"retry-after": "7"}, 7.0),
+    ({"retry-after": "1.5"}, 1.5),
+    ({"retry-after-ms": "250"}, 0.25),
+    ({"retry-after-ms": "250", "retry-after": "9"}, 0.25),
+    ({"retry-after": "-3"}, 0.0),
+    ({"retry-after": email.utils.formatdate(NOW + 30, usegmt=True)}, 30.0),
+    ({"retry-after": email.utils.formatdate(NOW - 30, usegmt=True)}, 0.0),
+    ({"retry-after": "not a date"}, None),
+    ({}, None),
+])
+def test_retry_after_seconds(clock, headers, expected):
+    assert retry_policy.retry_after_seconds(APIError(429, headers)) == expected
+
+
+def test_retries_transient_errors_honouring_retry_after(clock):
+    policy = RetryPolicy(max_retries=3, base_delay=1.0, max_delay=60.0, sleep=clock.sleep)
+    fn, calls = failing([APIError(429, {"retry-after": "12"}), APIError(503, {"retry-after-ms": "500"})])
+
+    assert policy.call(fn) == "ok"
+    assert len(calls) == 3
+    assert clock.sleeps == [12.0, 0.5]
+
+
+def test_retry_after_is_capped_at_max_delay(clock):
+    policy = RetryPolicy(max_retries=1, base_delay=1.0, max_delay=5.0, sleep=clock.sleep)
+    fn, _ = failing([APIError(429, {"retry-after": email.utils.formatdate(NOW + 3600, usegmt=True)})])
+
+    assert policy.call(fn) == "ok"
+    assert clock.sleeps == [5.0]
+
+
+@pytest.mark.parametrize("status", [400, 401, 403, 404, 422])
+def test_non_retryable_4xx_raises_immediately(clock, status):
+    policy = RetryPolicy(max_retries=5, sleep=clock.sleep)
+    error = APIError(status, {"retry-after": "1"})
+    fn, calls = failing([error])
+
+    with pytest.raises(APIError) as raised:
+        policy.call(fn)
+    assert raised.value is error
+    assert len(calls) == 1
+    assert clock.sleeps == []
+
+
+def test_backoff_grows_exponentially_up_to_the_cap(clock, monkeypatch):
+    # Full jitter draws from [0, ceiling]; take the ceiling to observe it
+    monkeypatch.setattr(retry_policy.random, "uniform", lambda low, high: high)
+    policy = RetryPolicy(max_retries=6, base_delay=1.0, max_delay=10.0, sleep=clock.sleep)
+    fn, calls = failing([TimeoutError("timed out")] * 6)
+
+    assert policy.call(fn) == "ok"
+    assert clock.sleeps == [1.0, 2.0, 4.0, 8.0, 10.0, 10.0]
+    assert len(calls) == 7
+
+
+def test_jitter_stays_within_the_ceiling(clock):
+    policy = RetryPolicy(base_delay=2.0, max_delay=5.0, sleep=clock.sleep)
+
+    delays = [policy.backoff_delay(retry) for retry in range(8) for _ in range(50)]
+
+    assert all(0 <= delay <= 5.0 for delay in delays)
+    assert all(0 <= policy.backoff_delay(0) <= 2.0 for _ in range(50))
+
+
+def test_last_error_is_raised_when_retries_run_out(clock):
+    policy = RetryPolicy(max_retries=2, base_delay=0.0, sleep=clock.sleep)
+    errors = [ConnectionError("reset") for _ in range(3)]
+    fn, calls = failing(errors)
+
+    with pytest.raises(ConnectionError) as raised:
+        policy.call(fn)
+    assert raised.value is errors[-1]
+    assert len(calls) == 3
+    assert len(clock.sleeps) == 2
+
+
+def test_no_retries_when_recovery_disabled(clock):
+    policy = RetryPolicy(max_retries=0, sleep=clock.sleep)
+    fn, calls = failing([APIError(503)])
+
+    with pytest.raises(APIError):
+        policy.call(fn)
+    assert len(calls) == 1
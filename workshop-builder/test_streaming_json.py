@@ -0,0 +1,58 @@
+import json
+
+import pytest
+from harness import load_builder_module
+
+StreamingFilesParser = load_builder_module("agents.streaming_json").StreamingFilesParser
+
+DOCUMENTS = [
+    {"files": {"00_intro.md": "# Intro\n\nSay \"hi\" \\ bye\t", "manifest.json": "{\"a\": [1, 2]}"}},
+    {"files": {"unicode.md": "café — \U0001F600 \u0000 </script>", "empty.md": ""}},
+    {"meta": {"files": {"nested.md": "not a file"}, "list": ["a", {"b": "c"}]}, "files": {"real.md": "{[,]}:"}, "tail": "files"},
+    {"files": {"a.md": "x", "skipped": ["in", "an", "array"], "obj": {"k": "v"}, "b.md": "y"}},
+]
+
+
+def feed_in_chunks(text: str, size: int):
+    parser = StreamingFilesParser()
+    emitted = []
+    for start in range(0, len(text), size):
+        emitted.extend(parser.feed(text[start:start + size]))
+    return parser, emitted
+
+
+def expected_files(document: dict) -> list:
+    return [(name, value) for name, value in document.get("files", {}).items() if isinstance(value, str)]
+
+
+@pytest.mark.parametrize("document", DOCUMENTS)
+@pytest.mark.parametrize("ensure_ascii", [True, False])
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 10_000])
+def test_matches_json_loads_for_any_chunking(document, ensure_ascii, chunk_size):
+    text = json.dumps(document, ensure_ascii=ensure_ascii, indent=1)
+
+    parser, emitted = feed_in_chunks(text, chunk_size)
+
+    assert emitted == expected_files(json.loads(text))
+    assert parser.complete
+    assert parser.files_emitted == len(emitted)
+
+
+def test_escape_split_across_chunks():
+    parser = StreamingFilesParser()
+    assert parser.feed('{"files": {"a.md": "line\\') == []
+    assert parser.feed('nnext \\u00') == []
+    assert parser.feed('e9 \\ud83d') == []
+    assert parser.feed('\\ude00"}}') == [("a.md", "line\nnext é \U0001F600")]
+    assert parser.complete
+
+
+def test_truncated_stream_keeps_completed_files():
+    text = json.dumps({"files": {"00_intro.md": "# Intro", "01_next.md": "# Next", "02_cut.md": "# Cut short"}})
+    truncated = text[:text.index("# Cut") + 3]
+
+    parser, emitted = feed_in_chunks(truncated, 1)
+
+    assert emitted == [("00_intro.md", "# Intro"), ("01_next.md", "# Next")]
+    assert not parser.complete
+    assert parser.files_emitted == 2
@@ -0,0 +1,117 @@
+import contextlib
+import io
+import json
+import os
+
+import pytest
+
+from harness import load_builder_module, make_config, work_directory
+
+topic_similarity = load_builder_module("agents.topic_similarity")
+orchestrator_module = load_builder_module("orchestrator.orchestrator")
+
+# Module directory -> manifest title, after the modules in public/data/workshops
+MODULES = {
+    "workshop-01-morning-vscode-setup": "Module 05: VS Code as AI Command Centre",
+    "workshop-02-morning-ai-api-access": "Module 07: Direct AI API Access",
+    "workshop-03-afternoon-rag-system": "Module 10: RAG System Implementation",
+    "workshop-03-morning-local-ai": "Module 09: Local AI Models",
+    "workshop-04-morning-ai-agents": "Workshop 04 - Morning Session: AI Agents",
+    "workshop-04-afternoon-orchestration": "Module 12: Agent Orchestration & Safety",
+    "workshop-05-morning-qa-automation": "Module 13: Quality Assurance & Automation",
+    "workshop-07-python-for-data-analysis": "Python for Data Analysis",
+}
+
+# Topics an existing module already covers
+TRUE_PAIRS = [
+    ("RAG systems", "workshop-03-afternoon-rag-system"),
+    ("VS Code setup for AI", "workshop-01-morning-vscode-setup"),
+    ("Local AI models", "workshop-03-morning-local-ai"),
+    ("Building AI Agents", "workshop-04-morning-ai-agents"),
+    ("Agent orchestration", "workshop-04-afternoon-orchestration"),
+    ("Python for data analysis", "workshop-07-python-for-data-analysis"),
+]
+
+# New topics that share most of their words with an existing module
+FALSE_PAIRS = [
+    ("Data Analysis with R", "workshop-07-python-for-data-analysis"),
+    ("Local AI on Raspberry Pi", "workshop-03-morning-local-ai"),
+    ("AI agents for customer support", "workshop-04-morning-ai-agents"),
+    ("RAG evaluation", "workshop-03-afternoon-rag-system"),
+]
+
+
+def create_modules(workshops_dir: str):
+    for name, title in MODULES.items():
+        module_path = os.path.join(workshops_dir, name)
+        os.makedirs(module_path)
+        with open(os.path.join(module_path, "manifest.json"), "w", encoding="utf-8") as f:
+            json.dump({"id": name, "title": title, "files": ["00_introduction.md"]}, f)
+        with open(os.path.join(module_path, "00_introduction.md"), "w", encoding="utf-8") as f:
+            f.write(f"# {title}\n")
+
+
+@pytest.fixture
+def orchestrator():
+    with work_directory() as work_dir:
+        config = make_config(work_dir, duplicate_topic_action="skip")
+        create_modules(config.workshops_base_dir)
+        with contextlib.redirect_stdout(io.StringIO()):
+            yield orchestrator_module.Orchestrator(config)
+
+
+def test_missing_terms():
+    assert topic_similarity.missing_terms("Data Analysis with R", "Python for Data Analysis") == ["r"]
+    assert topic_similarity.missing_terms("RAG systems", "RAG System Implementation | rag system") == []
+    assert topic_similarity.missing_terms("VSCode setup", "VS Code as AI Command Centre | setup") == []
+    assert topic_similarity.missing_terms("VS Code setup", "Command Centre | vscode setup") == []
+    assert topic_similarity.missing_terms("Local AI on Raspberry Pi", "Local AI Models") == ["raspberry", "pi"]
+
+
+@pytest.mark.parametrize("topic, module", TRUE_PAIRS)
+def test_covered_topics_are_skipped(orchestrator, topic, module):
+    threshold = orchestrator.config.duplicate_topic_threshold
+    matches = orchestrator._get_compiler_agent().find_similar_modules(topic, threshold)
+    assert matches[0]["name"] == module
+    assert matches[0]["missing_terms"] == []
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        results = orchestrator.run(topic, publish=False)
+
+    assert results["skipped"]
+    assert [match["name"] for match in results["duplicate_of"]] == [module]
+    assert f"--update {module}" in results["error"]
+
+
+@pytest.mark.parametrize("topic, module", FALSE_PAIRS)
+def test_new_topics_are_not_skipped(orchestrator, topic, module):
+    matches = orchestrator._get_compiler_agent().find_similar_modules(topic, 0)
+    assert matches[0]["name"] == module
+    assert matches[0]["missing_terms"]
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        results = orchestrator.run(topic, publish=False)
+
+    assert not results.get("skipped")
+    assert results["success"]
+
+
+def test_data_analysis_with_r_scores_above_the_threshold(orchestrator):
+    # The score alone cannot tell these apart: "R" is too short to be a TF-IDF feature
+    matches = orchestrator._get_compiler_agent().find_similar_modules("Data Analysis with R", orchestrator.config.duplicate_topic_threshold)
+    assert [(match["name"], match["missing_terms"]) for match in matches] == [("workshop-07-python-for-data-analysis", ["r"])]
+    assert matches[0]["score"] >= 0.8
+
+
+def test_duplicate_topics_are_only_reported_by_default(monkeypatch):
+    monkeypatch.delenv("DUPLICATE_TOPIC_ACTION", raising=False)
+    with work_directory() as work_dir:
+        config = make_config(work_dir)
+        assert config.duplicate_topic_action == "warn"
+        create_modules(config.workshops_base_dir)
+        with contextlib.redirect_stdout(io.StringIO()):
+            results = orchestrator_module.Orchestrator(config).run("RAG systems", publish=False)
+
+    assert not results.get("skipped")
+    assert results["success"]
+    assert [match["name"] for match in results["duplicate_of"]] == ["workshop-03-afternoon-rag-system"]
@@ -0,0 +1,140 @@
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+from harness import create_workshop_modules, load_builder_module, make_config, work_directory
+
+WorkshopNumberAllocator = load_builder_module("agents.workshop_allocator").WorkshopNumberAllocator
+WorkshopIndex = load_builder_module("agents.workshop_index").WorkshopIndex
+
+
+def _no_modules() -> int:
+    return 0
+
+
+def _allocate_in_process(base_dir: str, slug: str) -> int:
+    return WorkshopNumberAllocator(base_dir, _no_modules).allocate(slug)[0]
+
+
+def test_allocate_creates_directory_and_advances(tmp_path):
+    allocator = WorkshopNumberAllocator(str(tmp_path), _no_modules)
+
+    first = allocator.allocate("alpha")
+    second = allocator.allocate("beta", create_directory=False)
+
+    assert first == (1, str(tmp_path / "workshop-1-alpha"))
+    assert os.path.isdir(first[1])
+    assert second == (2, str(tmp_path / "workshop-2-beta"))
+    assert not os.path.exists(second[1])
+    assert allocator.peek() == 3
+
+
+def test_concurrent_threads_get_unique_gap_free_numbers(tmp_path):
+    workers = 16
+    barrier = threading.Barrier(workers)
+    numbers = []
+    lock = threading.Lock()
+
+    def allocate(i):
+        allocator = WorkshopNumberAllocator(str(tmp_path), _no_modules)
+        barrier.wait()
+        number, _ = allocator.allocate(f"topic-{i}")
+        with lock:
+            numbers.append(number)
+
+    threads = [threading.Thread(target=allocate, args=(i,)) for i in range(workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(numbers) == list(range(1, workers + 1))
+    assert len([name for name in os.listdir(tmp_path) if name.startswith("workshop-")]) == workers
+
+
+def test_concurrent_processes_get_unique_gap_free_numbers(tmp_path):
+    workers = 8
+    with ProcessPoolExecutor(max_workers=4) as executor:
+        numbers = list(executor.map(_allocate_in_process, [str(tmp_path)] * workers, [f"topic-{i}" for i in range(workers)]))
+
+    assert sorted(numbers) == list(range(1, workers + 1))
+
+
+def make_allocator(base_dir: str, with_index: bool) -> WorkshopNumberAllocator:
+    index = WorkshopIndex(base_dir, os.path.join(base_dir, WorkshopNumberAllocator.LEDGER_DIR_NAME, "index.sqlite3")) if with_index else None
+    return WorkshopNumberAllocator(base_dir, _no_modules, index=index)
+
+
+def count_listings(monkeypatch, base_dir: str) -> list:
+    """Record every os.listdir of `base_dir`."""
+    listings = []
+    listdir = os.listdir
+
+    def counting_listdir(path="."):
+        if os.path.abspath(path) == os.path.abspath(base_dir):
+            listings.append(path)
+        return listdir(path)
+
+    monkeypatch.setattr(os, "listdir", counting_listdir)
+    return listings
+
+
+@pytest.mark.parametrize("with_index", [False, True])
+@pytest.mark.parametrize("existing", ["workshop-2-manual", "workshop-02-manual", "workshop-2"])
+def test_skips_numbers_of_pre_existing_modules(tmp_path, existing, with_index):
+    allocator = make_allocator(str(tmp_path), with_index)
+    assert allocator.allocate("first")[0] == 1
+
+    # Added by hand after the allocator has a hint: its number must not be handed out again
+    os.mkdir(tmp_path / existing)
+    assert allocator.peek() == 3
+    number, module_path = allocator.allocate("second")
+
+    assert number == 3
+    assert module_path == str(tmp_path / "workshop-3-second")
+    assert os.listdir(tmp_path / existing) == []
+
+
+def test_seeds_from_existing_modules(tmp_path):
+    for name in ("workshop-01-a", "workshop-07-b"):
+        os.mkdir(tmp_path / name)
+    allocator = WorkshopNumberAllocator(str(tmp_path), lambda: 7)
+
+    assert allocator.allocate("c")[0] == 8
+
+
+@pytest.mark.parametrize("with_index", [False, True])
+@pytest.mark.parametrize("create_directory", [True, False])
+def test_allocation_does_not_list_an_unchanged_directory(tmp_path, monkeypatch, with_index, create_directory):
+    for number in range(1, 51):
+        os.mkdir(tmp_path / f"workshop-{number}-existing")
+    allocator = make_allocator(str(tmp_path), with_index)
+    assert allocator.allocate("first", create_directory=create_directory)[0] == 51
+    listings = count_listings(monkeypatch, str(tmp_path))
+
+    numbers = [allocator.allocate(f"topic-{i}", create_directory=create_directory)[0] for i in range(5)]
+
+    assert numbers == list(range(52, 57))
+    assert allocator.peek() == 57
+    assert listings == []
+
+    # A module added by hand changes the directory's modification time and is noticed
+    os.mkdir(tmp_path / "workshop-57-manual")
+    assert allocator.allocate("after-manual", create_directory=create_directory)[0] == 58
+
+
+def test_compiler_reserves_modules_through_the_index(monkeypatch):
+    compiler_agent = load_builder_module("agents.compiler_agent")
+    with work_directory() as work_dir:
+        config = make_config(work_dir)
+        create_workshop_modules(config.workshops_base_dir, 50)
+        agent = compiler_agent.CompilerAgent(config)
+        agent._reserve_module_directory("Warm Up")
+        listings = count_listings(monkeypatch, config.workshops_base_dir)
+
+        paths = [agent._reserve_module_directory(f"Topic {i}") for i in range(5)]
+
+        assert [os.path.basename(path) for path in paths] == [f"workshop-{52 + i}-topic-{i}" for i in range(5)]
+        assert agent._workshop_allocator().index is agent._workshop_index()
+        assert listings == []